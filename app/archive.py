@@ -0,0 +1,256 @@
+# app/archive.py
+"""수집한 원본 페이지 보관소(압축, 추가 전용)와 오프라인 재생.
+
+ARCHIVE_DIR/YYYYMMDD/ (KST 수집일) 아래에 프로세스마다 세그먼트 파일 하나를 만들어
+응답을 한 건씩 독립 압축 프레임(zstd, 없으면 gzip)으로 이어 붙인다. 프레임 하나는
+`헤더 JSON 한 줄 + 본문 bytes`이고, 세그먼트 전체도 그대로 `zcat`/`zstdcat`으로 읽힌다.
+수집 상태(app.crawl_state)가 답해 상세 페이지를 받지 않은 URL은 그때 재사용한 필드를
+`crawl-state:URL` 키로 대신 보관해 재생이 같은 기사를 만든다.
+옆의 .idx 파일은 32바이트 고정 길이 레코드(URL 해시 16 + 오프셋 8 + 길이 4 + CRC32 4)라
+mmap으로 바로 훑어 URL → 위치 사전을 만든다. 같은 날 같은 URL은 마지막 응답이 이긴다.
+
+    python -m app.main --replay 2025-10-20     # 그날 보관한 페이지로 전체 실행(네트워크 없음)
+    python -m app.archive ls                   # 날짜별 건수/용량
+    python -m app.archive cat 20251020 URL     # 보관된 본문 출력
+"""
+import argparse, gzip, hashlib, json, mmap, os, struct, sys, threading, zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.dates import KST
+from app.metrics import metrics
+
+ARCHIVE_ENABLED = os.getenv("ARCHIVE", "1") != "0"
+ARCHIVE_DIR = os.getenv("ARCHIVE_DIR", "archive")
+ARCHIVE_CODEC = os.getenv("ARCHIVE_CODEC", "auto")        # auto(zstandard 설치 시 zstd) | zstd | gzip
+ARCHIVE_SEGMENT_MB = int(os.getenv("ARCHIVE_SEGMENT_MB", "256"))   # 이보다 커지면 새 세그먼트
+ARCHIVE_LEVEL = int(os.getenv("ARCHIVE_LEVEL", "6"))
+
+_INDEX = struct.Struct("<16sQII")   # url 해시, 오프셋, 압축 길이, CRC32(압축 프레임)
+_EXT = {"zstd": ".zst", "gzip": ".gz"}
+_KEEP_HEADERS = ("content-type", "etag", "last-modified")
+
+class ArchiveMiss(LookupError):
+    """재생 중 보관소에 없는 URL."""
+
+def _zstd():
+    try:
+        import zstandard
+        return zstandard
+    except ImportError:
+        return None
+
+def url_key(url: str) -> bytes:
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+
+def state_url(url: str) -> str:
+    """수집 상태(app.crawl_state)에서 재사용한 상세 필드를 보관할 때 쓰는 키. 상세 페이지를 받지 않은 URL용."""
+    return "crawl-state:" + url
+
+def day_dir(day, root: str = ARCHIVE_DIR) -> Path:
+    """date/datetime 또는 'YYYY-MM-DD'/'YYYYMMDD' 문자열 → 그날 디렉터리."""
+    if isinstance(day, str):
+        day = datetime.strptime(day.replace("-", ""), "%Y%m%d").date()
+    if isinstance(day, datetime):
+        day = day.date()
+    return Path(root) / day.strftime("%Y%m%d")
+
+def _decompress(frame: bytes, suffix: str) -> bytes:
+    if suffix == ".zst":
+        zstd = _zstd()
+        if zstd is None:
+            raise RuntimeError("zstd 세그먼트를 읽으려면 zstandard 패키지가 필요합니다. (pip install zstandard)")
+        return zstd.ZstdDecompressor().decompress(frame)
+    return gzip.decompress(frame)
+
+class ArchiveWriter:
+    """프로세스 하나가 쓰는 추가 전용 세그먼트(여러 프로세스가 같은 날 동시에 써도 파일이 겹치지 않음)."""
+
+    def __init__(self, root: str = ARCHIVE_DIR, codec: str = ARCHIVE_CODEC,
+                 segment_bytes: int = ARCHIVE_SEGMENT_MB * 1024 * 1024, level: int = ARCHIVE_LEVEL):
+        self.root = root
+        zstd = _zstd() if codec in ("auto", "zstd") else None
+        if codec == "zstd" and zstd is None:
+            print("[WARN] zstandard 패키지가 없어 gzip으로 보관합니다. (pip install zstandard)")
+        self.codec = "zstd" if zstd is not None else "gzip"
+        self._zstd = zstd.ZstdCompressor(level=level) if zstd is not None else None
+        self.level = level
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._day: Optional[str] = None
+        self._seq = 0
+        self._data = self._index = None
+        self._size = 0
+
+    def _compress(self, raw: bytes) -> bytes:
+        if self._zstd is not None:
+            return self._zstd.compress(raw)
+        return gzip.compress(raw, compresslevel=self.level, mtime=0)
+
+    def _open(self, day: str):
+        self.close()
+        d = Path(self.root) / day
+        d.mkdir(parents=True, exist_ok=True)
+        self._seq += 1
+        name = f"seg-{datetime.now(KST):%H%M%S}-{os.getpid()}-{self._seq:03d}"
+        self._data = open(d / (name + _EXT[self.codec]), "ab")
+        self._index = open(d / (name + ".idx"), "ab")
+        self._day, self._size = day, 0
+
+    def append(self, url: str, status: int, body: bytes, encoding: Optional[str], headers=None):
+        """응답 하나를 오늘(KST) 세그먼트에 추가."""
+        now = datetime.now(KST)
+        head = {"url": url, "status": status, "encoding": encoding, "fetched_at": now.isoformat(timespec="seconds"),
+                "headers": {k: headers[k] for k in _KEEP_HEADERS if headers and k in headers}}
+        frame = self._compress(json.dumps(head, ensure_ascii=False).encode("utf-8") + b"\n" + body)
+        day = now.strftime("%Y%m%d")
+        with self._lock:
+            if self._day != day or self._size >= self.segment_bytes:
+                self._open(day)
+            offset = self._data.tell()
+            self._data.write(frame)
+            self._data.flush()   # 본문이 디스크에 간 뒤에 인덱스를 써야 중간에 죽어도 인덱스가 어긋나지 않음
+            self._index.write(_INDEX.pack(url_key(url), offset, len(frame), zlib.crc32(frame)))
+            self._index.flush()
+            self._size = offset + len(frame)
+        metrics.inc("archive_bytes_total", len(frame))
+        metrics.inc("archive_pages_total")
+
+    def close(self):
+        for f in (self._data, self._index):
+            if f is not None:
+                f.close()
+        self._data = self._index = None
+
+class ArchiveReader:
+    """하루치 보관소 읽기. 인덱스를 mmap으로 읽어 URL → (세그먼트, 오프셋, 길이) 사전을 만든다."""
+
+    def __init__(self, day, root: str = ARCHIVE_DIR):
+        self.dir = day_dir(day, root)
+        if not self.dir.is_dir():
+            raise FileNotFoundError(f"보관된 페이지가 없습니다: {self.dir}")
+        self._segments: List[Path] = []
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._lock = threading.Lock()
+        self._entries: Dict[bytes, Tuple[int, int, int, int]] = {}
+        for idx in sorted(self.dir.glob("seg-*.idx")):   # 이름이 시각순이라 나중 응답이 덮어씀
+            seg = next((p for p in (idx.with_suffix(e) for e in _EXT.values()) if p.exists()), None)
+            if seg is None or idx.stat().st_size < _INDEX.size:
+                continue
+            n = len(self._segments)
+            self._segments.append(seg)
+            with open(idx, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                usable = len(m) - len(m) % _INDEX.size   # 쓰다 만 마지막 레코드는 무시
+                for key, offset, length, crc in _INDEX.iter_unpack(m[:usable]):
+                    self._entries[key] = (n, offset, length, crc)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, url: str) -> bool:
+        return url_key(url) in self._entries
+
+    def _map(self, n: int) -> mmap.mmap:
+        with self._lock:
+            m = self._maps.get(n)
+            if m is None:
+                with open(self._segments[n], "rb") as f:
+                    m = self._maps[n] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return m
+
+    def _read(self, n: int, offset: int, length: int, crc: int) -> Tuple[Dict, bytes]:
+        frame = self._map(n)[offset:offset + length]
+        if zlib.crc32(frame) != crc:
+            raise ValueError(f"{self._segments[n].name}@{offset}: 보관 레코드 손상")
+        raw = _decompress(frame, self._segments[n].suffix)
+        head, _, body = raw.partition(b"\n")
+        return json.loads(head), body
+
+    def get(self, url: str) -> Tuple[Dict, bytes]:
+        """(헤더 dict, 본문 bytes). 없으면 ArchiveMiss."""
+        loc = self._entries.get(url_key(url))
+        if loc is None:
+            raise ArchiveMiss(f"보관소에 없음: {url}")
+        return self._read(*loc)
+
+    def fetch(self, url: str) -> Tuple[bytes, str]:
+        """AsyncCrawler.fetch와 같은 (본문 bytes, 인코딩)."""
+        try:
+            head, body = self.get(url)
+        except ArchiveMiss:
+            metrics.inc("archive_replay_total", result="miss")
+            raise
+        metrics.inc("archive_replay_total", result="hit")
+        return body, head.get("encoding") or "utf-8"
+
+    def __iter__(self) -> Iterator[Tuple[Dict, bytes]]:
+        for loc in self._entries.values():
+            yield self._read(*loc)
+
+    def last_fetched_at(self) -> Optional[datetime]:
+        """그날 마지막 수집 시각(재생 시 정렬 기준 시각)."""
+        latest = None
+        for head, _ in self:
+            at = datetime.fromisoformat(head["fetched_at"])
+            if latest is None or at > latest:
+                latest = at
+        return latest
+
+    def size_bytes(self) -> int:
+        return sum(p.stat().st_size for p in self._segments)
+
+    def close(self):
+        with self._lock:
+            for m in self._maps.values():
+                m.close()
+            self._maps.clear()
+
+_writer: Optional[ArchiveWriter] = None
+_replay: Optional[ArchiveReader] = None
+
+def get_archive() -> Optional[ArchiveWriter]:
+    """공용 보관소 기록기(ARCHIVE=0이거나 재생 중이면 None)."""
+    global _writer
+    if not ARCHIVE_ENABLED or _replay is not None:
+        return None
+    if _writer is None:
+        _writer = ArchiveWriter()
+    return _writer
+
+def start_replay(day, root: str = ARCHIVE_DIR) -> ArchiveReader:
+    """이후 모든 수집 요청을 그날 보관소에서 읽도록 전환."""
+    global _replay
+    _replay = ArchiveReader(day, root)
+    return _replay
+
+def stop_replay():
+    global _replay
+    if _replay is not None:
+        _replay.close()
+    _replay = None
+
+def get_replay() -> Optional[ArchiveReader]:
+    return _replay
+
+def main():
+    parser = argparse.ArgumentParser(description="원본 페이지 보관소")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("ls", help="날짜별 보관 건수/용량")
+    p_cat = sub.add_parser("cat", help="보관된 본문 출력")
+    p_cat.add_argument("day")
+    p_cat.add_argument("url")
+    args = parser.parse_args()
+
+    if args.cmd == "ls":
+        root = Path(ARCHIVE_DIR)
+        for d in sorted(p for p in root.glob("*") if p.is_dir()) if root.exists() else []:
+            r = ArchiveReader(d.name)
+            print(f"{d.name}  pages={len(r)}  size={r.size_bytes() / 1024 / 1024:.1f}MB  segments={len(r._segments)}")
+    elif args.cmd == "cat":
+        head, body = ArchiveReader(args.day).get(args.url)
+        print(json.dumps(head, ensure_ascii=False), file=sys.stderr)
+        sys.stdout.buffer.write(body)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# app/article.py
+"""기사 레코드.
+
+수집 → 중복 제거 → 요약 → 정렬 → 렌더까지 기사 한 건은 Article 하나로 다닌다. 키를 계속 덧붙이던 dict 대신
+정해진 필드만 __slots__로 두어 기사당 메모리가 작고 일정하며(여러 날치 재수집처럼 수만 건을 다룰 때),
+출처/섹션 이름은 sys.intern으로 모든 기사가 같은 문자열 객체를 공유한다.
+본문(content)은 요약/저장이 끝나면 release_content()로 놓아준다.
+
+기존 코드와 템플릿이 dict처럼 쓰던 방식(it["url"], it.get("section", "기타"), "content" in it, it["summary"] = ...)도
+그대로 된다. 값이 None인 필드는 없는 키로 취급하고, 정해진 필드 밖의 키는 KeyError.
+"""
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+FIELDS = (
+    "title", "url", "source_name", "published_at", "published_at_ts", "view_count", "rank_hint",
+    "thumbnail_url", "teaser", "content", "summary", "section", "keywords",
+)
+_FIELD_SET = frozenset(FIELDS)
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if type(value) is str else value
+
+class Article:
+    __slots__ = (
+        "title", "url", "_source_name", "published_at", "published_at_ts", "view_count", "rank_hint",
+        "thumbnail_url", "teaser", "content", "summary", "_section", "keywords",
+    )
+
+    def __init__(self, title: str = "", url: str = "", source_name: Optional[str] = None,
+                 published_at: Optional[datetime] = None, published_at_ts: Optional[int] = None,
+                 view_count: Optional[int] = None, rank_hint: Optional[int] = None,
+                 thumbnail_url: Optional[str] = None, teaser: Optional[str] = None, content: Optional[str] = None,
+                 summary: Optional[str] = None, section: Optional[str] = None, keywords: Optional[List[str]] = None):
+        self.title = title
+        self.url = url
+        self._source_name = _intern(source_name)
+        self.published_at = published_at
+        self.published_at_ts = published_at_ts
+        self.view_count = view_count
+        self.rank_hint = rank_hint
+        self.thumbnail_url = thumbnail_url
+        self.teaser = teaser
+        self.content = content
+        self.summary = summary
+        self._section = _intern(section)
+        self.keywords = keywords
+
+    # 소스/섹션 이름은 종류가 몇 개뿐이라 기사마다 사본을 두지 않음
+    @property
+    def source_name(self) -> Optional[str]:
+        return self._source_name
+
+    @source_name.setter
+    def source_name(self, value: Optional[str]):
+        self._source_name = _intern(value)
+
+    @property
+    def section(self) -> Optional[str]:
+        return self._section
+
+    @section.setter
+    def section(self, value: Optional[str]):
+        self._section = _intern(value)
+
+    def release_content(self) -> Optional[str]:
+        """본문을 떼어내고 돌려줌(요약/저장이 끝난 뒤에는 제목/요약만 남김)."""
+        content, self.content = self.content, None
+        return content
+
+    # --- dict 호환 ------------------------------------------------------------------
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key) if key in _FIELD_SET else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in _FIELD_SET:
+            raise KeyError(f"Article에 없는 필드: {key}")
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in _FIELD_SET and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key) if key in _FIELD_SET else None
+        return default if value is None else value
+
+    def pop(self, key: str, default: Any = None) -> Any:
+        value = self.get(key, default)
+        if key in _FIELD_SET:
+            setattr(self, key, None)
+        return value
+
+    def update(self, fields: Dict[str, Any]):
+        for k, v in fields.items():
+            self[k] = v
+
+    def to_dict(self) -> Dict[str, Any]:
+        """값이 있는 필드만 담은 dict."""
+        return {k: v for k in FIELDS if (v := getattr(self, k)) is not None}
+
+    def __repr__(self) -> str:
+        return f"Article({self.title!r}, {self.url!r}, source_name={self.source_name!r}, section={self.section!r})"
@@ -0,0 +1,127 @@
+# app/async_crawler.py
+"""asyncio 기반 동시 수집 엔진.
+
+하나의 httpx.AsyncClient(keep-alive 커넥션 풀)를 공유하면서
+목록/상세/RSS 요청을 동시에 처리한다. 전체 동시 요청 수와 호스트별
+동시 요청 수를 각각 제한한다. 수집한 페이지의 파싱/중복 제거/요약은 app.pipeline이 맡는다.
+"""
+import asyncio, os, time
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.archive import get_replay
+from app.crawler import (
+    HEADERS, tls_verify, get_http_cache, conditional_headers, handle_cached_response, source_label,
+    BodyReader, FETCH_CHUNK_BYTES,
+)
+from app.metrics import metrics
+from app.politeness import PolitenessScheduler, THROTTLE_STATUSES, retry_after_seconds
+
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "16"))  # 전체 동시 요청 수
+CRAWL_PER_HOST = int(os.getenv("CRAWL_PER_HOST", "4"))         # 호스트별 최대 동시 요청 수(실제 값은 AIMD로 조절)
+CRAWL_HTTP2 = os.getenv("CRAWL_HTTP2", "0") == "1"             # h2 패키지 설치 시 HTTP/2 사용
+CRAWL_TIMEOUT = float(os.getenv("CRAWL_TIMEOUT", "30"))
+CRAWL_RETRIES = int(os.getenv("CRAWL_RETRIES", "2"))           # 429/503 재시도 횟수
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+class AsyncCrawler:
+    """공유 커넥션 풀 + 전역 동시성 제한 + 호스트별 예의 스케줄러(app.politeness)를 갖는 크롤러."""
+
+    def __init__(self, concurrency: int = CRAWL_CONCURRENCY, per_host: int = CRAWL_PER_HOST,
+                 http2: bool = CRAWL_HTTP2, timeout: float = CRAWL_TIMEOUT):
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.http2 = http2 and _http2_available()
+        if http2 and not self.http2:
+            print("[WARN] h2 패키지가 없어 HTTP/1.1로 수집합니다. (pip install h2)")
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self.scheduler = PolitenessScheduler(self.per_host)
+
+    async def __aenter__(self):
+        limits = httpx.Limits(
+            max_connections=self.concurrency,
+            max_keepalive_connections=self.concurrency,
+            keepalive_expiry=30,
+        )
+        self._client = httpx.AsyncClient(
+            headers=HEADERS, timeout=self.timeout, verify=tls_verify(),
+            http2=self.http2, limits=limits, follow_redirects=True,
+        )
+        self._global = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._client.aclose()
+        self._client = None
+
+    async def fetch(self, url: str, source: Optional[str] = None, selectors: Optional[List[str]] = None,
+                    max_bytes: Optional[int] = None) -> Tuple[bytes, str]:
+        """조건부 GET(HTTP 캐시 사용)으로 (본문 bytes, 인코딩) 반환.
+
+        robots.txt가 막은 URL은 RobotsDisallowed. 429/503은 Retry-After만큼 기다렸다가 재시도.
+        본문은 스트리밍으로 읽으며 max_bytes에서 자르고, selectors가 채워지면 나머지를 받지 않는다(crawler.BodyReader).
+        캐시 본문이 없는데 304가 오면 검증자 없이 한 번 더 받는다.
+        재생 중(app.archive.start_replay)이면 네트워크 없이 보관소에서 읽는다.
+        """
+        if (replay := get_replay()) is not None:
+            return replay.fetch(url)
+        await self.scheduler.check(self._client, url)
+        cache = get_http_cache()
+        entry = cache.get(url) if cache else None
+        r, reader = await self._get(url, conditional_headers(entry), source, selectors, max_bytes)
+        if r.status_code == 304 and entry is None:
+            # 재사용할 캐시 본문이 없는데 304(검증자 없이 보낸 요청에 중간 캐시가 답한 경우 등):
+            # 검증자 없이 캐시를 거치지 않는 GET으로 다시 받는다
+            metrics.inc("http_cache_total", result="orphan_304")
+            r, reader = await self._get(url, {"Cache-Control": "no-cache"}, source, selectors, max_bytes)
+        return handle_cached_response(url, r, entry, cache, source, reader)
+
+    async def _get(self, url: str, headers: Dict[str, str], source: Optional[str],
+                   selectors: Optional[List[str]], max_bytes: Optional[int]) -> Tuple[httpx.Response, Optional[BodyReader]]:
+        """GET 한 번(429/503이면 재시도). (응답, 스트리밍으로 읽은 본문 또는 None) 반환."""
+        label = source_label(url, source)
+        host = self.scheduler.host(url)
+        for attempt in range(CRAWL_RETRIES + 1):
+            await host.acquire()
+            status = latency = retry_after = None
+            try:
+                async with self._global:
+                    # 대기 시간은 빼고 요청 자체의 지연만 잰다
+                    t0 = time.perf_counter()
+                    try:
+                        async with self._client.stream("GET", url, headers=headers) as r:
+                            reader = None
+                            if r.is_success:
+                                reader = BodyReader(max_bytes, selectors, r.charset_encoding)
+                                async for chunk in r.aiter_bytes(FETCH_CHUNK_BYTES):
+                                    if reader.feed(chunk):
+                                        break
+                            else:
+                                await r.aread()
+                    except Exception:
+                        metrics.inc("fetch_errors_total", source=label)
+                        raise
+                    latency = time.perf_counter() - t0
+                metrics.observe("fetch_seconds", latency, source=label)
+                status = r.status_code
+                if status in THROTTLE_STATUSES:
+                    retry_after = retry_after_seconds(r.headers.get("retry-after"))
+            finally:
+                await host.release(status, latency, retry_after)
+            if status not in THROTTLE_STATUSES:
+                break
+        return r, reader
+
+    async def fetch_html(self, url: str, source: Optional[str] = None, selectors: Optional[List[str]] = None,
+                         max_bytes: Optional[int] = None) -> str:
+        body, encoding = await self.fetch(url, source, selectors, max_bytes)
+        return body.decode(encoding, errors="replace")
@@ -0,0 +1,129 @@
+# app/classifier.py
+"""키워드 규칙 기반 섹션 분류 엔진.
+
+config/sections.yaml의 섹션별 가중치 규칙을 하나의 정규식(트라이 형태)으로
+컴파일해 한 번의 스캔으로 모든 섹션 점수를 계산한다. 여러 기사를 한꺼번에
+분류할 때는 텍스트를 이어 붙여 한 번만 스캔한다.
+"""
+import bisect, os, re
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+SECTIONS_PATH = os.getenv("SECTIONS_PATH", "config/sections.yaml")
+
+_HANGUL = "가-힣"
+_ASCII_WORD = "a-z0-9"
+# 한글 word 매칭 시 뒤에 붙어도 되는 조사
+_PARTICLES = "(?:은|는|이|가|을|를|의|에|에서|과|와|도|으로|로|만)?"
+
+def _is_hangul(ch: str) -> bool:
+    return "가" <= ch <= "힣"
+
+def _boundaries(term: str, match: Optional[str]) -> Tuple[str, str]:
+    """term의 첫/마지막 글자 종류와 match 옵션으로 (앞 경계, 뒤 경계) 정규식 결정."""
+    if match == "any":
+        return "", ""
+    first, last = term[0], term[-1]
+    if _is_hangul(first):
+        left = f"(?<![{_HANGUL}])"
+    elif first.isalnum():
+        left = f"(?<![{_ASCII_WORD}])"
+    else:
+        left = ""
+    if _is_hangul(last):
+        # 한글은 기본이 prefix(뒤 경계 없음). word면 조사까지만 허용
+        right = f"(?={_PARTICLES}(?![{_HANGUL}]))" if match == "word" else ""
+    elif last.isalnum():
+        right = f"(?![{_ASCII_WORD}])" if match != "prefix" else ""
+    else:
+        right = ""
+    return left, right
+
+def _trie_pattern(terms: List[str]) -> str:
+    """여러 단어를 공통 접두사를 공유하는 정규식으로 변환(긴 단어 우선)."""
+    trie: Dict = {}
+    for t in terms:
+        node = trie
+        for ch in t:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        end = "" in node
+        alts = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 and not end else "(?:" + "|".join(alts) + ")"
+        return body + ("?" if end else "")
+
+    return build(trie)
+
+class SectionClassifier:
+    def __init__(self, sections: List[Dict], default: str):
+        self.names = [s["name"] for s in sections]
+        self.default = default
+        # term → [(섹션 인덱스, 가중치)]
+        self.weights: Dict[str, List[Tuple[int, float]]] = {}
+        groups: Dict[Tuple[str, str], List[str]] = {}
+        for idx, sec in enumerate(sections):
+            for rule in sec.get("terms", []):
+                if isinstance(rule, str):
+                    rule = {"term": rule}
+                term = str(rule["term"]).strip().lower()
+                if not term:
+                    continue
+                self.weights.setdefault(term, []).append((idx, float(rule.get("weight", 1))))
+                groups.setdefault(_boundaries(term, rule.get("match")), []).append(term)
+        parts = [left + _trie_pattern(terms) + right for (left, right), terms in groups.items()]
+        self.pattern = re.compile("|".join(parts)) if parts else None
+
+    @classmethod
+    def from_yaml(cls, path: str = SECTIONS_PATH) -> "SectionClassifier":
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        return cls(data.get("sections", []), data.get("default", "글로벌 동향"))
+
+    def _pick(self, scores: List[float]) -> str:
+        best = max(range(len(scores)), key=lambda i: (scores[i], -i), default=None)
+        if best is None or scores[best] <= 0:
+            return self.default
+        return self.names[best]
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """섹션별 점수(한 번의 스캔)."""
+        scores = [0.0] * len(self.names)
+        if self.pattern is not None:
+            for m in self.pattern.finditer(text.lower()):
+                for idx, w in self.weights.get(m.group(), ()):
+                    scores[idx] += w
+        return dict(zip(self.names, scores))
+
+    def classify(self, text: str) -> str:
+        return self._pick(list(self.scores(text).values()))
+
+    def classify_batch(self, texts: List[str]) -> List[str]:
+        """여러 텍스트를 줄바꿈으로 이어 붙여 한 번에 스캔한 뒤 텍스트별로 점수 집계."""
+        if self.pattern is None:
+            return [self.default] * len(texts)
+        lowered = [t.lower() for t in texts]
+        starts, pos = [], 0
+        for t in lowered:
+            starts.append(pos)
+            pos += len(t) + 1
+        joined = "\n".join(lowered)
+        scores = [[0.0] * len(self.names) for _ in texts]
+        for m in self.pattern.finditer(joined):
+            doc = bisect.bisect_right(starts, m.start()) - 1
+            for idx, w in self.weights.get(m.group(), ()):
+                scores[doc][idx] += w
+        return [self._pick(s) for s in scores]
+
+_classifier: Optional[SectionClassifier] = None
+
+def get_classifier() -> SectionClassifier:
+    """config/sections.yaml로 만든 공용 분류기(처음 호출 시 컴파일)."""
+    global _classifier
+    if _classifier is None:
+        _classifier = SectionClassifier.from_yaml()
+    return _classifier
@@ -0,0 +1,120 @@
+# app/crawl_state.py
+"""실행 간 유지되는 증분 수집 상태(SQLite).
+
+URL → 본문 해시, 상세 페이지에서 추출한 필드, 마지막 확인 시각을 저장한다.
+최근에 처리한 URL은 상세 페이지를 다시 받지 않고 저장된 필드를 재사용하고,
+CRAWL_STATE_MAX_AGE_HOURS가 지난(stale) 항목만 다시 확인한다.
+재사용한 필드는 그날 보관소에도 남겨, 재생(--replay) 때 받지 않은 상세 페이지 대신 쓴다.
+"""
+import hashlib, json, os, sqlite3, threading, time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from app.archive import ArchiveReader, get_archive, get_replay, state_url
+from app.dates import to_kst
+from app.metrics import metrics
+
+CRAWL_STATE_ENABLED = os.getenv("CRAWL_STATE", "1") != "0"
+CRAWL_STATE_PATH = os.getenv("CRAWL_STATE_PATH", ".cache/crawl_state.sqlite")
+CRAWL_STATE_MAX_AGE_HOURS = float(os.getenv("CRAWL_STATE_MAX_AGE_HOURS", "48"))
+
+def content_hash(content: str) -> str:
+    return hashlib.sha256((content or "").encode("utf-8")).hexdigest()
+
+def _load_fields(data: str) -> Dict[str, Any]:
+    fields = json.loads(data)
+    if fields.get("published_at"):
+        fields["published_at"] = to_kst(datetime.fromisoformat(fields["published_at"]))
+    return fields
+
+class CrawlState:
+    def __init__(self, path: str = CRAWL_STATE_PATH, max_age_hours: float = CRAWL_STATE_MAX_AGE_HOURS):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_age = max_age_hours * 3600
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            create table if not exists crawl_state (
+              url text primary key,
+              content_hash text not null,
+              fields text not null,
+              fetched_at real not null,
+              last_seen real not null
+            )""")
+        self._db.commit()
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """신선한 항목이면 저장된 상세 필드를, 없거나 오래됐으면 None 반환."""
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("select fields, fetched_at from crawl_state where url = ?", (url,)).fetchone()
+            if not row or now - row[1] > self.max_age:
+                metrics.inc("crawl_state_total", result="miss")
+                return None
+            self._db.execute("update crawl_state set last_seen = ? where url = ?", (now, url))
+            self._db.commit()
+        metrics.inc("crawl_state_total", result="hit")
+        if archive := get_archive():
+            # 상세 페이지를 받지 않으므로 재생할 수 있게 재사용한 필드를 대신 보관
+            archive.append(state_url(url), 200, row[0].encode("utf-8"), "utf-8")
+        return _load_fields(row[0])
+
+    def record(self, url: str, fields: Dict[str, Any]) -> bool:
+        """상세 필드 저장. 이전 실행과 본문이 달라졌으면 True."""
+        h = content_hash(fields.get("content", ""))
+        data = dict(fields)
+        if isinstance(data.get("published_at"), datetime):
+            data["published_at"] = data["published_at"].isoformat()
+        now = time.time()
+        with self._lock:
+            row = self._db.execute("select content_hash from crawl_state where url = ?", (url,)).fetchone()
+            self._db.execute(
+                "insert or replace into crawl_state values (?, ?, ?, ?, ?)",
+                (url, h, json.dumps(data, ensure_ascii=False), now, now),
+            )
+            self._db.commit()
+        return row is None or row[0] != h
+
+    def prune(self, older_than_days: float = 90) -> int:
+        """오래 보이지 않은 URL 정리."""
+        cutoff = time.time() - older_than_days * 86400
+        with self._lock:
+            cur = self._db.execute("delete from crawl_state where last_seen < ?", (cutoff,))
+            self._db.commit()
+        return cur.rowcount
+
+class ReplayCrawlState:
+    """재생 중 수집 상태: 그날 실행이 수집 상태에서 재사용한 필드를 보관소에서 돌려준다.
+
+    상세 페이지가 보관된 URL은 None을 돌려 보관된 페이지를 다시 파싱하게 한다(바뀐 셀렉터 반영).
+    """
+
+    def __init__(self, reader: ArchiveReader):
+        self.reader = reader
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        if url in self.reader or state_url(url) not in self.reader:
+            return None
+        body, encoding = self.reader.fetch(state_url(url))
+        return _load_fields(body.decode(encoding))
+
+    def record(self, url: str, fields: Dict[str, Any]) -> bool:
+        return True   # 재생은 상태를 바꾸지 않음
+
+    def prune(self, older_than_days: float = 90) -> int:
+        return 0
+
+_state: Optional[CrawlState] = None
+_replay_state: Optional[ReplayCrawlState] = None
+
+def get_crawl_state() -> Optional[Union[CrawlState, ReplayCrawlState]]:
+    """공용 수집 상태(CRAWL_STATE=0이면 None). 재생 중이면 그날 보관소를 읽는 ReplayCrawlState."""
+    global _state, _replay_state
+    if (replay := get_replay()) is not None:
+        if _replay_state is None or _replay_state.reader is not replay:
+            _replay_state = ReplayCrawlState(replay)
+        return _replay_state
+    if CRAWL_STATE_ENABLED and _state is None:
+        _state = CrawlState()
+    return _state
@@ -1,52 +1,443 @@
 # app/crawler.py
-import httpx
-import feedparser
-import httpx, certifi, os
-from bs4 import BeautifulSoup
-from typing import List, Dict, Any, Optional, Tuple
+import httpx, certifi, os, hashlib, re, sqlite3, threading, time
+import lxml.html
+from lxml import etree
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass
 from datetime import datetime
-from dateutil import parser as dateparser
-
-HEADERS = {"User-Agent": "LogiNewsBot/1.0 (+https://example.com/bot)"}
-
-def fetch_rss(rss_url: str) -> List[Dict[str, Any]]:
-    """RSS 피드를 읽어 간단한 기사 리스트로 변환."""
-    d = feedparser.parse(rss_url)
-    items = []
-    for e in d.entries:
-        items.append({
-            "title": getattr(e, "title", "").strip(),
-            "url": getattr(e, "link", "").strip(),
-            "published_at": _parse_date(getattr(e, "published", None) or getattr(e, "updated", None)),
-            "view_count": None,   # RSS에는 보통 조회수가 없음
-            "content": getattr(e, "summary", ""),
-        })
-    return items
+from pathlib import Path
+
+from app.article import Article
+from app.archive import get_archive
+from app.dates import parse_date, from_struct_time
+from app.metrics import metrics
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+def _accept_encoding() -> str:
+    """httpx가 풀 수 있는 압축만 광고(brotli/brotlicffi 설치 시 br 추가)."""
+    for mod in ("brotli", "brotlicffi"):
+        try:
+            __import__(mod)
+            return "gzip, deflate, br"
+        except ImportError:
+            pass
+    return "gzip, deflate"
+
+HEADERS = {"User-Agent": "LogiNewsBot/1.0 (+https://www.klnews.co.kr)", "Accept-Encoding": _accept_encoding()}
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE", "1") != "0"
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR", ".cache/http")
+HTTP_CACHE_MAX_MB = int(os.getenv("HTTP_CACHE_MAX_MB", "256"))         # 디스크 용량 상한(LRU 제거)
+HTTP_CACHE_TTL = int(os.getenv("HTTP_CACHE_TTL", str(14 * 24 * 3600)))  # 이 기간 동안 재검증 없으면 폐기
+
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(4 * 1024 * 1024)))  # 응답 하나에서 읽을 최대 바이트(압축 해제 후, 소스별 max_bytes)
+FETCH_EARLY_STOP = os.getenv("FETCH_EARLY_STOP", "1") != "0"                # 셀렉터가 채워지면 나머지를 받지 않음
+FETCH_CHUNK_BYTES = 64 * 1024  # 압축 해제한 본문을 이 크기로 나눠 파서에 넣음(한 조각이 통째로 풀려도 중간에 멈출 수 있게)
+FETCH_DRAIN_BYTES = 64 * 1024   # 다 채운 뒤에도 이만큼은 더 읽음(응답이 곧 끝나면 keep-alive 연결을 살림)
+PARSE_MAX_CHARS = int(os.getenv("PARSE_MAX_CHARS", "2000000"))  # 파싱할 HTML 최대 길이
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))  # 1 이하면 프로세스 풀 미사용
+
+def tls_verify():
+    """TLS 검증 설정: LOGINEWS_CA_BUNDLE 환경변수 우선, 없으면 certifi 번들 사용."""
+    # 개발용 임시 우회를 사용하려면 False 반환 (권장 안함)
+    return os.getenv("LOGINEWS_CA_BUNDLE") or certifi.where()
+
+@dataclass
+class CacheEntry:
+    url: str
+    body: bytes
+    encoding: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+class HttpCache:
+    """ETag/Last-Modified 검증자를 보관하는 디스크 HTTP 캐시.
+
+    본문은 `<dir>/<sha1>.body` 파일에, 메타데이터는 SQLite 인덱스에 저장한다.
+    용량 상한을 넘으면 가장 오래 쓰지 않은 항목부터 지우고(LRU),
+    TTL 동안 한 번도 재검증되지 않은 항목은 조회 시 폐기한다.
+    """
+
+    def __init__(self, path: str = HTTP_CACHE_DIR, max_bytes: int = HTTP_CACHE_MAX_MB * 1024 * 1024,
+                 ttl: int = HTTP_CACHE_TTL):
+        self.dir = Path(path)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.dir / "index.sqlite"), check_same_thread=False)
+        self._db.execute("""
+            create table if not exists entries (
+              url text primary key,
+              etag text,
+              last_modified text,
+              encoding text,
+              size int not null,
+              validated_at real not null,
+              accessed_at real not null
+            )""")
+        self._db.commit()
+
+    def _body_path(self, url: str) -> Path:
+        return self.dir / (hashlib.sha1(url.encode("utf-8")).hexdigest() + ".body")
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._db.execute(
+                "select etag, last_modified, encoding, validated_at from entries where url = ?", (url,)
+            ).fetchone()
+            if not row:
+                return None
+            etag, last_modified, encoding, validated_at = row
+            path = self._body_path(url)
+            if time.time() - validated_at > self.ttl or not path.exists():
+                self._delete(url)
+                return None
+            self._db.execute("update entries set accessed_at = ? where url = ?", (time.time(), url))
+            self._db.commit()
+        return CacheEntry(url, path.read_bytes(), encoding or "utf-8", etag, last_modified)
+
+    def store(self, url: str, body: bytes, encoding: Optional[str], etag: Optional[str], last_modified: Optional[str]):
+        if not (etag or last_modified):
+            return  # 검증자가 없으면 조건부 요청을 할 수 없으므로 저장하지 않음
+        now = time.time()
+        with self._lock:
+            self._body_path(url).write_bytes(body)
+            self._db.execute(
+                "insert or replace into entries values (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, encoding, len(body), now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def revalidated(self, url: str):
+        """304 응답을 받은 항목의 검증 시각 갱신."""
+        now = time.time()
+        with self._lock:
+            self._db.execute("update entries set validated_at = ?, accessed_at = ? where url = ?", (now, now, url))
+            self._db.commit()
 
-def fetch_html(url: str) -> str:
-    r = httpx.get(url, headers=HEADERS, timeout=30)
+    def _delete(self, url: str):
+        self._body_path(url).unlink(missing_ok=True)
+        self._db.execute("delete from entries where url = ?", (url,))
+        self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("select coalesce(sum(size), 0) from entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._db.execute("select url, size from entries order by accessed_at").fetchall():
+            self._body_path(url).unlink(missing_ok=True)
+            self._db.execute("delete from entries where url = ?", (url,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+_http_cache: Optional[HttpCache] = None
+
+def get_http_cache() -> Optional[HttpCache]:
+    """공용 HTTP 캐시(HTTP_CACHE=0이면 None)."""
+    global _http_cache
+    if HTTP_CACHE_ENABLED and _http_cache is None:
+        _http_cache = HttpCache()
+    return _http_cache
+
+def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+    """캐시 항목의 검증자로 If-None-Match/If-Modified-Since 헤더 구성."""
+    headers = {}
+    if entry and entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry and entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+    return headers
+
+def source_label(url: str, source: Optional[str] = None) -> str:
+    """지표 label: 소스 이름, 없으면 호스트."""
+    return source or httpx.URL(url).host
+
+def handle_cached_response(url: str, r: httpx.Response, entry: Optional[CacheEntry],
+                           cache: Optional[HttpCache], source: Optional[str] = None,
+                           reader: Optional["BodyReader"] = None) -> Tuple[bytes, str]:
+    """응답을 캐시/보관소에 반영하고 (본문 bytes, 인코딩)을 반환. 304면 캐시 본문 사용.
+
+    reader(스트리밍으로 읽은 본문)를 주면 r.content 대신 사용한다. 중간에 끊은 본문은
+    다음 실행에서 304로 재사용되지 않도록 HTTP 캐시에 넣지 않는다.
+    """
+    archive = get_archive()
+    if r.status_code == 304 and entry is not None:
+        cache.revalidated(url)
+        metrics.inc("http_cache_total", result="revalidated")
+        if archive:
+            archive.append(url, 304, entry.body, entry.encoding, r.headers)
+        return entry.body, entry.encoding
     r.raise_for_status()
-    return r.text
-
-def parse_list_page(html: str, base_url: str, item_sel: str, title_sel: str, link_sel: str) -> List[Dict[str, Any]]:
-    """목록 페이지에서 기사 타이틀/링크를 추출."""
-    soup = BeautifulSoup(html, "html.parser")
-    results = []
-    for card in soup.select(item_sel):
-        title_el = card.select_one(title_sel)
-        link_el = card.select_one(link_sel)
-        if not (title_el and link_el and link_el.get("href")):
-            continue
-        title = title_el.get_text(" ", strip=True)
-        href = link_el.get("href")
-        if not href.startswith("http"):
-            href = base_url.rstrip("/") + "/" + href.lstrip("/")
-        results.append({"title": title, "url": href})
+    body = reader.body if reader is not None else r.content
+    label = source_label(url, source)
+    if archive:
+        archive.append(url, r.status_code, body, r.encoding, r.headers)
+    metrics.inc("fetch_bytes_total", len(body), source=label)
+    metrics.inc("fetch_wire_bytes_total", r.num_bytes_downloaded, source=label)
+    if reader is not None and reader.stopped:
+        metrics.inc("fetch_early_stop_total", source=label, reason=reader.stopped)
+    if cache is not None:
+        metrics.inc("http_cache_total", result="miss")
+    if (cache is not None and "no-store" not in r.headers.get("cache-control", "")
+            and not (reader is not None and reader.stopped)):
+        cache.store(url, body, r.encoding, r.headers.get("etag"), r.headers.get("last-modified"))
+    return body, r.encoding or "utf-8"
+
+def parse_rss(content, source: Optional[str] = None) -> List[Article]:
+    """RSS 본문(bytes/str)을 간단한 기사 리스트로 변환."""
+    import feedparser   # 처음 쓸 때 불러옴(import 비용이 큼)
+    with metrics.timer("parse_seconds", kind="rss"):
+        d = feedparser.parse(content)
+        items = []
+        for e in d.entries:
+            # feedparser가 이미 파싱한 struct_time 우선, 없으면 문자열 파싱
+            published_at = from_struct_time(getattr(e, "published_parsed", None) or getattr(e, "updated_parsed", None))
+            if published_at is None:
+                published_at = _parse_date(getattr(e, "published", None) or getattr(e, "updated", None), source)
+            items.append(Article(
+                title=getattr(e, "title", "").strip(),
+                url=getattr(e, "link", "").strip(),
+                source_name=source,
+                published_at=published_at,
+                view_count=None,   # RSS에는 보통 조회수가 없음
+                content=getattr(e, "summary", ""),
+            ))
+    return items
+
+_SIMPLE_COMPOUND = re.compile(r"^([a-zA-Z][\w-]*)?((?:[.#][\w-]+)*)$")
+
+def _compound_xpath(compound: str) -> Optional[str]:
+    """'div.a#b' 같은 단순 선택자를 XPath로 변환. 지원하지 않는 형태면 None."""
+    m = _SIMPLE_COMPOUND.match(compound)
+    if not compound or not m:
+        return None
+    xp = "//" + (m.group(1) or "*").lower()
+    for kind, name in re.findall(r"([.#])([\w-]+)", m.group(2)):
+        if kind == ".":
+            xp += f"[contains(concat(' ', normalize-space(@class), ' '), ' {name} ')]"
+        else:
+            xp += f"[@id='{name}']"
+    return xp
+
+def selector_roots(selectors: List[str]) -> Optional[str]:
+    """각 CSS 선택자의 맨 앞 단순 선택자(하위 트리의 뿌리)를 모은 XPath.
+
+    결과 요소들의 하위 트리만 있으면 원래 선택자로 고른 결과가 같다.
+    형제 결합자(+, ~)나 속성/가상 클래스처럼 판단할 수 없는 선택자가 있으면 None.
+    """
+    parts = []
+    for sel in selectors:
+        for part in sel.split(","):
+            part = part.strip()
+            if not part or "+" in part or "~" in part:
+                return None
+            xp = _compound_xpath(part.replace(">", " > ").split()[0])
+            if xp is None:
+                return None
+            parts.append(xp)
+    return " | ".join(parts) if parts else None
+
+def _compound_matcher(compound: str) -> Optional[Tuple[Optional[str], frozenset, Optional[str]]]:
+    """'div.a#b' → (태그, 클래스 집합, id). 지원하지 않는 형태면 None."""
+    m = _SIMPLE_COMPOUND.match(compound)
+    if not compound or not m:
+        return None
+    classes, ident = set(), None
+    for kind, name in re.findall(r"([.#])([\w-]+)", m.group(2)):
+        if kind == ".":
+            classes.add(name)
+        else:
+            ident = name
+    return (m.group(1) or "").lower() or None, frozenset(classes), ident
+
+def _root_matchers(selector: str) -> Optional[list]:
+    """선택자 하나(쉼표 대안 포함)의 뿌리 단순 선택자 매처 목록. 분석할 수 없으면 None."""
+    out = []
+    for part in selector.split(","):
+        part = part.strip()
+        if not part or "+" in part or "~" in part:
+            return None
+        m = _compound_matcher(part.replace(">", " > ").split()[0])
+        if m is None:
+            return None
+        out.append(m)
+    return out
+
+def _matches(el, matcher) -> bool:
+    tag, classes, ident = matcher
+    if tag and el.tag != tag:
+        return False
+    if ident and el.get("id") != ident:
+        return False
+    return not classes or classes <= set((el.get("class") or "").split())
+
+class BodyReader:
+    """스트리밍 응답 본문을 모으면서 언제 그만 읽을지 판단.
+
+    - max_bytes(압축 해제 후)를 넘으면 거기서 자름(stopped="max_bytes")
+    - selectors를 주면 받은 조각을 lxml 증분 파서에 바로 넣어, 선택자마다 처음 맞은 뿌리 요소의
+      부모가 닫히는 시점(= 그 뿌리와 형제로 반복되는 카드/문단까지 모두 도착)을 기다린다.
+      모든 선택자가 채워지면 FETCH_DRAIN_BYTES만 더 읽고 멈춤(stopped="selectors")
+    분석할 수 없는 선택자가 있거나 파서가 실패하면 끝(또는 max_bytes)까지 읽는다.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None, selectors: Optional[List[str]] = None,
+                 encoding: Optional[str] = None):
+        self.max_bytes = max_bytes or FETCH_MAX_BYTES
+        self.chunks: List[bytes] = []
+        self.size = 0
+        self.stopped: Optional[str] = None
+        self._drain: Optional[int] = None   # 선택자를 다 채운 뒤 남은 추가 읽기 허용량
+        self._pending: List[list] = []
+        self._parser = None
+        self._waiting: Dict[Any, List[int]] = {}   # 닫히길 기다리는 부모 요소 → 선택자 번호들
+        selectors = [s for s in selectors or [] if s]
+        if FETCH_EARLY_STOP and selectors:
+            matchers = [_root_matchers(s) for s in selectors]
+            if all(matchers):
+                self._pending = matchers
+                self._parser = etree.HTMLPullParser(events=("end",), encoding=encoding)
+
+    @property
+    def body(self) -> bytes:
+        return b"".join(self.chunks)
+
+    def feed(self, chunk: bytes) -> bool:
+        """조각 하나를 추가. 그만 읽어야 하면 True."""
+        if self.size + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.size]
+            self.stopped = "max_bytes"
+        self.chunks.append(chunk)
+        self.size += len(chunk)
+        if self.stopped:
+            return True
+        if self._drain is not None:
+            self._drain -= len(chunk)
+            if self._drain <= 0:
+                self.stopped = "selectors"
+                return True
+        elif self._parser is not None:
+            try:
+                self._parser.feed(chunk)
+                done = self._watch()
+            except (etree.LxmlError, ValueError):
+                self._parser = None   # 증분 파싱이 안 되는 문서는 끝까지 받음
+                return False
+            if done:
+                self._parser = None
+                self._drain = FETCH_DRAIN_BYTES
+        return False
+
+    def _watch(self) -> bool:
+        for _, el in self._parser.read_events():
+            if not isinstance(el.tag, str):
+                continue
+            for i in self._waiting.pop(el, ()):
+                self._pending[i] = None
+            for i, matchers in enumerate(self._pending):
+                if matchers and any(_matches(el, m) for m in matchers):
+                    parent = el.getparent()
+                    if parent is None:
+                        self._pending[i] = None
+                    else:
+                        self._waiting.setdefault(parent, []).append(i)
+                        self._pending[i] = []   # 뿌리를 찾음(부모가 닫히길 기다리는 중)
+        return all(p is None for p in self._pending)
+
+def detail_selectors(detail: Dict[str, Any]) -> List[str]:
+    """상세 페이지에서 쓰는 셀렉터(partial_soup/BodyReader 공용)."""
+    return [s for s in (detail.get("content_selector"), detail.get("date_selector"), detail.get("view_selector")) if s]
+
+def partial_soup(html: str, selectors: List[str]) -> "BeautifulSoup":
+    """선택자들이 가리키는 하위 트리만 담은 BeautifulSoup.
+
+    lxml로 전체 문서를 빠르게 파싱한 뒤 필요한 하위 트리만 BeautifulSoup 트리로 만든다.
+    선택자를 분석할 수 없으면 전체 문서를 그대로 파싱한다.
+    """
+    from bs4 import BeautifulSoup
+    html = html[:PARSE_MAX_CHARS]
+    xp = selector_roots([s for s in selectors if s])
+    if xp is None:
+        return BeautifulSoup(html, "lxml")
+    try:
+        root = lxml.html.document_fromstring(html)
+    except (etree.ParserError, ValueError):
+        return BeautifulSoup(html, "lxml")
+    nodes = root.xpath(xp)  # 문서 순서
+    picked = set(nodes)
+    keep = [n for n in nodes if not any(a in picked for a in n.iterancestors())]
+    fragment = "".join(lxml.html.tostring(n, encoding="unicode", with_tail=False) for n in keep)
+    return BeautifulSoup(fragment, "lxml")
+
+LIST_FIELD_KEYS = ("view_selector", "date_selector", "date_attr", "teaser_selector")
+
+def list_fields(src: Dict[str, Any]) -> Dict[str, Any]:
+    """소스 설정에서 목록 단계 필드 셀렉터만 추림(parse_list_page의 fields 인자)."""
+    return {k: src[k] for k in LIST_FIELD_KEYS if src.get(k)}
+
+def _view_count(el) -> Optional[int]:
+    digits = "".join(ch for ch in el.get_text() if ch.isdigit()) if el else ""
+    return int(digits) if digits else None
+
+def parse_list_page(html: str, base_url: str, item_sel: str, title_sel: str, link_sel: str,
+                    fields: Optional[Dict[str, Any]] = None, source: Optional[str] = None) -> List[Article]:
+    """목록 페이지에서 기사 타이틀/링크를 추출.
+
+    fields(list_fields)에 셀렉터가 있으면 카드 안에서 조회수(view_count)/날짜(published_at)/
+    요약문(teaser)도 함께 뽑는다. rank_hint는 목록 안 순서(1부터).
+    """
+    fields = fields or {}
+    with metrics.timer("parse_seconds", kind="list"):
+        soup = partial_soup(html, [item_sel])
+        results = []
+        for card in soup.select(item_sel):
+            title_el = card.select_one(title_sel)
+            link_el = card.select_one(link_sel)
+            if not (title_el and link_el and link_el.get("href")):
+                continue
+            title = title_el.get_text(" ", strip=True)
+            href = link_el.get("href")
+            if not href.startswith("http"):
+                href = base_url.rstrip("/") + "/" + href.lstrip("/")
+            it = Article(title=title, url=href, source_name=source, rank_hint=len(results) + 1)
+            if vsel := fields.get("view_selector"):
+                it["view_count"] = _view_count(card.select_one(vsel))
+            if dsel := fields.get("date_selector"):
+                el = card.select_one(dsel)
+                value = None
+                if el is not None:
+                    attr = fields.get("date_attr")
+                    value = el.get(attr) if attr and el.has_attr(attr) else el.get_text(" ", strip=True)
+                it["published_at"] = _parse_date(value, source)
+            if tsel := fields.get("teaser_selector"):
+                el = card.select_one(tsel)
+                it["teaser"] = el.get_text(" ", strip=True) if el else ""
+            results.append(it)
     return results
 
-def parse_article_detail(html: str, detail: Dict[str, Any]) -> Dict[str, Any]:
+LIST_PREFERRED = ("view_count",)   # 목록 값이 상세/증분 상태 값보다 최신
+
+def merge_detail(it: Article, d: Dict[str, Any]) -> Article:
+    """상세 페이지 필드를 목록 항목에 합침. 빈 값은 목록 값을 덮지 않고, 본문이 없으면 요약문(teaser) 사용."""
+    for k, v in d.items():
+        if v is None or v == "":
+            continue
+        if k in LIST_PREFERRED and it.get(k) is not None:
+            continue
+        it[k] = v
+    if not it.get("content") and it.get("teaser"):
+        it["content"] = it["teaser"]
+    return it
+
+def parse_article_detail(html: str, detail: Dict[str, Any], source: Optional[str] = None) -> Dict[str, Any]:
     """상세 페이지에서 본문/날짜/조회수 등을 추출. 셀렉터는 config 기반."""
-    soup = BeautifulSoup(html, "lxml")
+    soup = partial_soup(html, detail_selectors(detail))
     content = ""
     if sel := detail.get("content_selector"):
         content = " ".join(p.get_text(" ", strip=True) for p in soup.select(sel))
@@ -55,32 +446,29 @@ def parse_article_detail(html: str, detail: Dict[str, Any]) -> Dict[str, Any]:
         el = soup.select_one(dsel)
         if el:
             if (attr := detail.get("date_attr")) and el.has_attr(attr):
-                published_at = _parse_date(el.get(attr))
+                published_at = _parse_date(el.get(attr), source)
             else:
-                published_at = _parse_date(el.get_text(strip=True))
+                published_at = _parse_date(el.get_text(strip=True), source)
     view_count = None
     if vsel := detail.get("view_selector") or None:
-        el = soup.select_one(vsel)
-        if el:
-            digits = "".join(ch for ch in el.get_text() if ch.isdigit())
-            view_count = int(digits) if digits else None
+        view_count = _view_count(soup.select_one(vsel))
     return {"content": content, "published_at": published_at, "view_count": view_count}
 
-def _parse_date(s: Optional[str]) -> Optional[datetime]:
-    if not s:
-        return None
-    try:
-        return dateparser.parse(s)
-    except Exception:
-        return None
-HEADERS = {"User-Agent": "LogiNewsBot/1.0 (+https://www.klnews.co.kr)"}
-
-def fetch_html(url: str, timeout=30):
-    # 우선 LOGINEWS_CA_BUNDLE 환경변수 우선, 없으면 certifi 번들 사용
-    ca_bundle = os.getenv("LOGINEWS_CA_BUNDLE") or certifi.where()
-    # 개발용 임시 우회를 사용하려면 아래 주석 해제 (권장 안함)
-    # verify = False
-    verify = ca_bundle
-    r = httpx.get(url, headers=HEADERS, timeout=timeout, verify=verify)
-    r.raise_for_status()
-    return r.text
\ No newline at end of file
+def parse_article_detail_timed(html: str, detail: Dict[str, Any], source: Optional[str] = None) -> Tuple[Dict[str, Any], float]:
+    """프로세스 풀용: (파싱 결과, 소요 초). 지표는 자식 프로세스에 남지 않으므로 호출 측에서 기록."""
+    t0 = time.perf_counter()
+    d = parse_article_detail(html, detail, source)
+    return d, time.perf_counter() - t0
+
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+def get_parse_pool() -> Optional[ProcessPoolExecutor]:
+    """상세 페이지 파싱용 공용 프로세스 풀(PARSE_WORKERS <= 1이면 None)."""
+    global _parse_pool
+    if PARSE_WORKERS > 1 and _parse_pool is None:
+        _parse_pool = ProcessPoolExecutor(max_workers=PARSE_WORKERS)
+    return _parse_pool
+
+def _parse_date(s: Optional[str], source: Optional[str] = None) -> Optional[datetime]:
+    """날짜 문자열 → KST 기준 timezone-aware datetime(app.dates 참고)."""
+    return parse_date(s, source)
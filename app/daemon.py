@@ -0,0 +1,216 @@
+# app/daemon.py
+"""상주 실행(데몬) 모드.
+
+cron으로 매번 `python app/main.py`를 새로 띄우면 실행마다 모듈 import, 템플릿 컴파일,
+분류 정규식 컴파일, 캐시/DB 연결, TLS 컨텍스트와 커넥션 풀 생성을 처음부터 다시 한다.
+데몬은 한 프로세스에서 이것들을 유지한 채로
+- DAEMON_CRON(5필드 cron 식, KST 기준, 기본 매일 07:00)마다 전체 실행(main.execute)
+- 그 사이 DAEMON_REFRESH_MINUTES분마다 RSS 소스만 가볍게 다시 수집(HTTP 캐시/수집 상태/요약 캐시/저장소를 미리 채움)
+을 반복한다. 비동기 작업은 전용 스레드의 이벤트 루프 하나에서 돌고, 열린 AsyncCrawler
+(커넥션 풀, 호스트별 robots/AIMD 상태)를 모든 실행이 공유한다.
+
+    python -m app.daemon [--send] [--cron "0 7 * * 1-5"] [--refresh-minutes 30] [--once]
+
+SIGTERM/SIGINT를 받으면 진행 중인 실행을 마치고 종료한다. 한 번의 실행이 실패해도 데몬은 계속 돈다.
+"""
+import argparse, asyncio, os, signal, threading, time
+from datetime import datetime, timedelta
+from typing import Any, Coroutine, List, Set
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from app.dates import KST
+from app.main import execute, load_sources
+from app.metrics import metrics
+
+DAEMON_CRON = os.getenv("DAEMON_CRON", "0 7 * * *")
+DAEMON_REFRESH_MINUTES = float(os.getenv("DAEMON_REFRESH_MINUTES", "60"))  # 0이면 중간 수집 안 함
+
+# --- cron 식 -------------------------------------------------------------------
+
+_CRON_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]   # 분 시 일 월 요일(0과 7은 일요일)
+
+def _cron_field(expr: str, lo: int, hi: int) -> Set[int]:
+    out: Set[int] = set()
+    for part in expr.split(","):
+        rng, _, step = part.partition("/")
+        if rng == "*":
+            a, b = lo, hi
+        elif "-" in rng:
+            a, b = (int(x) for x in rng.split("-", 1))
+        else:
+            a = b = int(rng)
+            if step:
+                b = hi   # "5/10" = 5부터 10 간격
+        if not (lo <= a <= b <= hi):
+            raise ValueError(f"cron 범위 밖: {part} ({lo}-{hi})")
+        out.update(range(a, b + 1, int(step) if step else 1))
+    return out
+
+class CronSchedule:
+    """5필드 cron 식(분 시 일 월 요일). *, a-b, a,b, */n 지원. 일/요일이 둘 다 지정되면 어느 쪽이든 맞으면 실행."""
+
+    def __init__(self, expr: str, tz=KST):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"cron 식은 5필드여야 합니다: {expr!r}")
+        self.expr = expr
+        self.tz = tz
+        self.minutes, self.hours, self.days, self.months, dows = (
+            _cron_field(f, lo, hi) for f, (lo, hi) in zip(fields, _CRON_RANGES))
+        self.dows = {d % 7 for d in dows}
+        self._any_day = fields[2] == "*"
+        self._any_dow = fields[4] == "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        if dt.month not in self.months:
+            return False
+        dom = dt.day in self.days
+        dow = (dt.weekday() + 1) % 7 in self.dows   # cron은 일요일=0
+        if self._any_day or self._any_dow:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, now: datetime) -> datetime:
+        """now 이후(같은 분 제외) 처음 맞는 시각."""
+        dt = now.astimezone(self.tz).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 4)
+        while dt < limit:
+            if not self._day_matches(dt):
+                dt = (dt + timedelta(days=1)).replace(hour=0, minute=0)
+            elif dt.hour not in self.hours:
+                dt = (dt + timedelta(hours=1)).replace(minute=0)
+            elif dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+            else:
+                return dt
+        raise ValueError(f"cron 식에 맞는 시각이 없습니다: {self.expr!r}")
+
+# --- 상주 런타임 ------------------------------------------------------------------
+
+class Runtime:
+    """전용 스레드에서 도는 이벤트 루프 + 열어 둔 AsyncCrawler. 실행 사이에 커넥션 풀/호스트 상태를 유지."""
+
+    def __init__(self):
+        from app.async_crawler import AsyncCrawler
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="loginews-loop", daemon=True)
+        self._thread.start()
+        self.crawler = self.submit(AsyncCrawler().__aenter__())
+
+    def submit(self, coro: Coroutine) -> Any:
+        """코루틴을 데몬 루프에서 실행하고 결과를 기다림(동기 코드에서 호출)."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    def close(self):
+        try:
+            self.submit(self.crawler.__aexit__(None, None, None))
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+
+def warm_up():
+    """무거운 모듈 import와 싱글턴(템플릿, 분류기, 캐시, 저장소) 초기화를 기동 시 한 번에."""
+    from app import summarizer  # noqa: F401  (numpy)
+    from app.classifier import get_classifier
+    from app.crawl_state import get_crawl_state
+    from app.crawler import get_http_cache
+    from app.render_email import get_renderer
+    from app.storage import get_storage
+    from app.summary_cache import get_summary_cache
+    get_renderer()
+    get_classifier()
+    get_http_cache()
+    get_crawl_state()
+    get_summary_cache()
+    get_storage()
+
+def refresh(runtime: Runtime, sources: List[dict]):
+    """RSS 소스만 수집 → 요약 → 저장. 결과 뉴스레터는 만들지 않고 캐시만 채움."""
+    from app.pipeline import run_pipeline
+    metrics.reset()
+    t0 = time.perf_counter()
+    sections = run_pipeline(sources, runtime=runtime)
+    n = sum(len(s["items"]) for s in sections)
+    print(f"[OK] 중간 수집: RSS {len(sources)}곳, 상위 {n}건 ({time.perf_counter() - t0:.1f}s)")
+
+class Daemon:
+    def __init__(self, args: argparse.Namespace, schedule: CronSchedule, refresh_minutes: float):
+        self.args = args
+        self.schedule = schedule
+        self.refresh_every = refresh_minutes * 60
+        self.stop = threading.Event()
+
+    def _run_full(self, runtime: Runtime):
+        print(f"[OK] 예약 실행 시작: {datetime.now(KST):%Y-%m-%d %H:%M}")
+        execute(self.args, runtime)
+
+    def _run_refresh(self, runtime: Runtime):
+        rss = [s for s in load_sources() if s.get("method") == "rss" and s.get("rss_url")]
+        if rss:
+            refresh(runtime, rss)
+
+    def _guarded(self, fn, runtime: Runtime):
+        try:
+            fn(runtime)
+        except Exception as e:
+            # 한 번 실패해도 다음 예약 시각에 다시 시도
+            print(f"[ERROR] {fn.__name__.lstrip('_')} 실패: {e!r}")
+
+    def serve(self, once: bool = False):
+        runtime = Runtime()
+        try:
+            warm_up()
+            print(f"[OK] 데몬 시작: cron={self.schedule.expr!r}, 중간 수집 "
+                  f"{f'{self.refresh_every / 60:g}분마다' if self.refresh_every > 0 else '끔'}")
+            if once:
+                self._guarded(self._run_full, runtime)
+                return
+            next_run = self.schedule.next_after(datetime.now(KST))
+            next_refresh = time.time() + self.refresh_every if self.refresh_every > 0 else float("inf")
+            print(f"[OK] 다음 실행: {next_run:%Y-%m-%d %H:%M} KST")
+            while not self.stop.is_set():
+                now = time.time()
+                if now >= next_run.timestamp():
+                    self._guarded(self._run_full, runtime)
+                    next_run = self.schedule.next_after(datetime.now(KST))
+                    print(f"[OK] 다음 실행: {next_run:%Y-%m-%d %H:%M} KST")
+                    if self.refresh_every > 0:
+                        next_refresh = time.time() + self.refresh_every   # 방금 전체 수집했으므로 미룸
+                elif now >= next_refresh:
+                    self._guarded(self._run_refresh, runtime)
+                    next_refresh = time.time() + self.refresh_every
+                self.stop.wait(max(0.0, min(next_run.timestamp(), next_refresh) - time.time()))
+        finally:
+            runtime.close()
+            print("[OK] 데몬 종료")
+
+def main():
+    parser = argparse.ArgumentParser(description="예약 실행 데몬(모듈/커넥션/캐시를 유지)")
+    parser.add_argument("--send", action="store_true", help="예약 실행마다 이메일 발송(없으면 미리보기만)")
+    parser.add_argument("--cron", default=DAEMON_CRON, help=f"전체 실행 시각(5필드 cron, KST, 기본 {DAEMON_CRON!r})")
+    parser.add_argument("--refresh-minutes", type=float, default=DAEMON_REFRESH_MINUTES,
+                        help="RSS 중간 수집 간격(분, 0이면 끔)")
+    parser.add_argument("--once", action="store_true", help="기동 직후 한 번만 실행하고 종료(점검용)")
+    args = parser.parse_args()
+    try:
+        schedule = CronSchedule(args.cron)
+    except ValueError as e:
+        parser.error(str(e))
+
+    run_args = argparse.Namespace(preview=True, send=args.send, replay=None, replay_llm=False)
+    daemon = Daemon(run_args, schedule, args.refresh_minutes)
+
+    def _stop(signum, frame):
+        print(f"[OK] 종료 신호({signal.Signals(signum).name}) — 진행 중인 실행을 마치고 종료")
+        daemon.stop.set()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+    daemon.serve(once=args.once)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# app/dates.py
+"""날짜 파싱 계층.
+
+- feedparser가 이미 계산한 struct_time(published_parsed/updated_parsed)을 우선 사용
+- 자주 쓰는 형식(RFC 822, ISO 8601, 'YYYY.MM.DD HH:MM', 'YYYY년 MM월 DD일')은
+  미리 컴파일한 파서로 처리하고, 소스별로 맞았던 형식을 기억해 먼저 시도
+- 그래도 안 되면 마지막으로 dateutil 사용
+- 결과는 모두 KST(+09:00) 기준 timezone-aware datetime, 문자열 단위로 메모이즈
+"""
+import re, time
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+KST = timezone(timedelta(hours=9), "KST")
+
+# 사이트에서 날짜 앞에 붙이는 라벨
+_LABEL = re.compile(r"^\s*(?:입력|승인|수정|등록|작성|기사입력|최종수정|발행)\s*[:：]?\s*")
+_KR_NUMERIC = re.compile(
+    r"^(\d{4})\s*[.\-/]\s*(\d{1,2})\s*[.\-/]\s*(\d{1,2})\.?"
+    r"(?:\s+(?:(오전|오후)\s*)?(\d{1,2}):(\d{2})(?::(\d{2}))?)?$"
+)
+_KR_TEXT = re.compile(
+    r"^(\d{4})년\s*(\d{1,2})월\s*(\d{1,2})일"
+    r"(?:\s*(?:(오전|오후)\s*)?(\d{1,2})(?:시|:)\s*(\d{1,2})분?(?::(\d{2}))?)?$"
+)
+
+def to_kst(dt: Optional[datetime]) -> Optional[datetime]:
+    """naive는 KST로 간주, aware는 KST로 변환."""
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=KST)
+    return dt.astimezone(KST)
+
+def from_struct_time(st: Optional[time.struct_time]) -> Optional[datetime]:
+    """feedparser의 *_parsed(UTC 기준 struct_time)를 KST datetime으로."""
+    if not st:
+        return None
+    try:
+        return datetime(*st[:6], tzinfo=timezone.utc).astimezone(KST)
+    except (TypeError, ValueError):
+        return None
+
+def _from_groups(m: re.Match) -> datetime:
+    y, mo, d, ampm, hh, mm, ss = m.groups()
+    hour = int(hh or 0)
+    if ampm == "오후" and hour < 12:
+        hour += 12
+    elif ampm == "오전" and hour == 12:
+        hour = 0
+    return datetime(int(y), int(mo), int(d), hour, int(mm or 0), int(ss or 0))
+
+def _rfc822(s: str) -> Optional[datetime]:
+    if "," not in s and not s[:1].isalpha():
+        return None  # 'Mon, 20 Oct 2025 ...' 또는 '20 Oct 2025 ...' 형태만
+    try:
+        return parsedate_to_datetime(s)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+def _iso8601(s: str) -> Optional[datetime]:
+    try:
+        return datetime.fromisoformat(s)
+    except ValueError:
+        return None
+
+def _kr_numeric(s: str) -> Optional[datetime]:
+    m = _KR_NUMERIC.match(s)
+    return _from_groups(m) if m else None
+
+def _kr_text(s: str) -> Optional[datetime]:
+    m = _KR_TEXT.match(s)
+    return _from_groups(m) if m else None
+
+FORMATS: List[Tuple[str, Callable[[str], Optional[datetime]]]] = [
+    ("iso8601", _iso8601),
+    ("rfc822", _rfc822),
+    ("kr_numeric", _kr_numeric),
+    ("kr_text", _kr_text),
+]
+_PARSERS = dict(FORMATS)
+
+# 소스 이름 → 마지막으로 맞았던 형식
+_learned: Dict[str, str] = {}
+
+@lru_cache(maxsize=8192)
+def _parse_cached(s: str, first: Optional[str]) -> Tuple[Optional[datetime], Optional[str]]:
+    order = [first] + [n for n, _ in FORMATS if n != first] if first else [n for n, _ in FORMATS]
+    for name in order:
+        try:
+            dt = _PARSERS[name](s)
+        except (ValueError, OverflowError):
+            dt = None
+        if dt is not None:
+            return to_kst(dt), name
+    try:
+        from dateutil import parser as dateparser   # 최후 수단이라 처음 쓸 때 불러옴
+        return to_kst(dateparser.parse(s)), None
+    except Exception:
+        return None, None
+
+def parse_date(s: Optional[str], source: Optional[str] = None) -> Optional[datetime]:
+    """날짜 문자열 → KST datetime. source를 주면 그 소스에서 맞았던 형식을 먼저 시도."""
+    if not s:
+        return None
+    s = _LABEL.sub("", s.strip())
+    if not s:
+        return None
+    dt, name = _parse_cached(s, _learned.get(source) if source else None)
+    if source and name:
+        _learned[source] = name
+    return dt
@@ -0,0 +1,167 @@
+# app/dedup.py
+"""URL 정규화 + SimHash 기반 유사 기사(중복 게재) 제거.
+
+1) URL 정규화: 추적용 파라미터 제거, scheme/host/끝 슬래시 통일
+2) 제목+본문 글자 3-gram의 64비트 SimHash를 구하고, 해밍 거리가
+   DEDUP_MAX_DISTANCE 이하인 기사를 같은 묶음으로 본다.
+   64비트를 (거리+1)개 구간으로 나눠 구간 값이 하나라도 같은 것만 비교하므로
+   (비둘기집 원리) 전체 쌍을 비교하지 않고도 후보를 빠짐없이 찾는다.
+3) 묶음마다 대표 기사 하나만 남긴다(조회수 → 본문 길이 순). 더 나은 기사가 나중에 오면 대표를 바꾼다.
+"""
+import hashlib, os, re
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from app.metrics import metrics
+
+DEDUP_MAX_DISTANCE = int(os.getenv("DEDUP_MAX_DISTANCE", "3"))
+DEDUP_TEXT_CHARS = 2000   # 지문 계산에 쓰는 앞부분 길이(재전송 기사는 앞부분이 같음)
+DEDUP_MIN_CHARS = 30   # 이보다 짧은 텍스트는 SimHash가 불안정하므로 URL로만 비교
+
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "referer", "from", "share", "output", "spm",
+}
+TRACKING_PREFIXES = ("utm_", "ga_", "hmb_")
+
+def canonicalize_url(url: Optional[str]) -> str:
+    """같은 기사를 가리키는 URL이 같은 문자열이 되도록 정규화."""
+    if not url:
+        return ""
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PREFIXES)
+    )
+    # http/https는 같은 기사로 취급
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+_WS = re.compile(r"\s+")
+
+def _shingles(text: str, k: int = 3) -> Counter:
+    t = _WS.sub(" ", text.lower()).strip()
+    return Counter(t[i:i + k] for i in range(max(1, len(t) - k + 1)))
+
+# SimHash 비트별 합계를 큰 정수 하나에 32비트 칸(lane) 64개로 모아 계산하기 위한 표:
+# _SPREAD[k][byte]는 해시의 k번째 바이트가 byte일 때 켜진 비트 칸마다 1을 더한 값
+_LANE = 32
+_SPREAD = [
+    [sum(1 << (_LANE * (8 * k + i)) for i in range(8) if (byte >> i) & 1) for byte in range(256)]
+    for k in range(8)
+]
+
+def simhash(text: str) -> int:
+    """글자 3-gram(빈도 가중) 기반 64비트 SimHash."""
+    lanes, total = 0, 0
+    for sh, w in _shingles(text[:DEDUP_TEXT_CHARS]).items():
+        h = hashlib.blake2b(sh.encode("utf-8"), digest_size=8).digest()
+        spread = 0
+        for k in range(8):
+            spread += _SPREAD[k][h[7 - k]]
+        lanes += spread * w
+        total += w
+    mask = (1 << _LANE) - 1
+    fp = 0
+    for b in range(64):
+        # 켜진 쪽 가중치가 절반을 넘으면 1
+        if 2 * ((lanes >> (_LANE * b)) & mask) > total:
+            fp |= 1 << b
+    return fp
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+class NearDupIndex:
+    """SimHash 후보 검색용 밴드 인덱스."""
+
+    def __init__(self, max_distance: int = DEDUP_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self.width = 64 // self.bands
+        self._tables: List[Dict[int, List[Tuple[int, int]]]] = [{} for _ in range(self.bands)]
+
+    def _keys(self, fp: int):
+        mask = (1 << self.width) - 1
+        for i in range(self.bands):
+            shift = i * self.width
+            # 마지막 구간은 남는 비트를 모두 포함
+            m = mask if i < self.bands - 1 else (1 << (64 - shift)) - 1
+            yield i, (fp >> shift) & m
+
+    def find(self, fp: int) -> Optional[int]:
+        """거리 이내의 기존 항목 id(가장 가까운 것) 또는 None."""
+        best, best_d = None, self.max_distance + 1
+        for i, key in self._keys(fp):
+            for other, doc in self._tables[i].get(key, ()):
+                d = hamming(fp, other)
+                if d < best_d:
+                    best, best_d = doc, d
+        return best
+
+    def add(self, doc: int, fp: int):
+        """지문 등록(같은 id로 여러 지문을 등록할 수 있음)."""
+        for i, key in self._keys(fp):
+            self._tables[i].setdefault(key, []).append((fp, doc))
+
+def dedup_text(it: Dict[str, Any]) -> str:
+    return (it.get("title") or "") + " " + (it.get("content") or "")
+
+def _rep_key(it: Dict[str, Any]) -> Tuple[int, int]:
+    """대표 기사 비교 키(조회수 → 본문 길이, 클수록 적합)."""
+    return (it.get("view_count") or -1, len(it.get("content") or ""))
+
+class StreamingDedup:
+    """스트리밍 파이프라인용 중복 판정. 묶음마다 지금까지 본 기사 중 가장 적합한 것(_rep_key)이 대표.
+
+    offer()는 기사가 새 묶음이거나 묶음의 현재 대표보다 나으면 표식(묶음 번호, 차례)을, 아니면 None을 준다.
+    먼저 보낸 대표가 나중에 밀려날 수 있으므로 정렬 단계는 is_current()로 아직 대표인지 확인하고
+    RankEngine.add(group=묶음 번호)로 이전 대표를 교체한다(요약 작업자가 여럿이면 도착 순서가 바뀔 수 있음).
+    기사 본문은 보관하지 않고 정규화 URL, SimHash 지문, 대표의 비교 키만 기억하므로
+    처리량이 늘어도 메모리 사용이 작다.
+    """
+
+    def __init__(self, max_distance: int = DEDUP_MAX_DISTANCE):
+        self.index = NearDupIndex(max_distance)
+        self.urls: Dict[str, int] = {}
+        self.best: List[Tuple[Tuple[int, int], int]] = []   # 묶음 번호 → (대표 비교 키, 차례)
+        self._turn = 0
+
+    def offer(self, it: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+        url = canonicalize_url(it.get("url"))
+        if not url:
+            return None
+        cluster = self.urls.get(url)
+        fp = None
+        if cluster is None:
+            text = dedup_text(it)
+            if len(text.strip()) >= DEDUP_MIN_CHARS:
+                fp = simhash(text)
+                cluster = self.index.find(fp)
+        key = _rep_key(it)
+        self._turn += 1
+        tag: Optional[Tuple[int, int]] = None
+        if cluster is None:
+            cluster = len(self.best)
+            self.best.append((key, self._turn))
+            tag = (cluster, self._turn)
+        elif key > self.best[cluster][0]:
+            self.best[cluster] = (key, self._turn)
+            tag = (cluster, self._turn)
+            metrics.inc("dedup_replaced_total", source=it.get("source_name"))
+        if fp is not None:
+            self.index.add(cluster, fp)
+        self.urls[url] = cluster
+        return tag
+
+    def is_current(self, tag: Tuple[int, int]) -> bool:
+        """표식을 받은 기사가 아직 묶음의 대표인지."""
+        return self.best[tag[0]][1] == tag[1]
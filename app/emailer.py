@@ -1,7 +1,29 @@
 # app/emailer.py
-import os, smtplib
+"""SMTP 메일 발송.
+
+- send_email: 한 번에 한 통(간단 발송)
+- BulkSender: 대량 발송 엔진
+  * 인증까지 마친 SMTP 연결을 워커(SMTP_CONNECTIONS)마다 하나씩 유지하며 재사용
+  * 수신자마다 개별 주소(To)로 보내고, 초당 발송 수(SMTP_RATE)를 넘지 않게 조절
+  * 연결이 끊기면 다시 연결해 한 번 더 시도
+  * 접속/로그인 자체가 실패하면(설정 문제) 그 실행의 발송을 멈추고 남은 수신자는 시도 없이 재시도 큐로
+    (수신자마다 로그인을 다시 시도해 계정이 잠기지 않도록)
+  * 4xx/연결 오류 같은 일시적 실패는 SQLite 재시도 큐(SMTP_RETRY_PATH)에 넣고
+    다음 실행(또는 `python -m app.emailer retry`)에서 백오프 후 다시 보냄
+  * 수신자별 결과(Delivery)를 반환
+
+SMTP_STARTTLS=0, SMTP_USER 미설정이면 암호화/로그인 없이 접속하므로
+로컬 aiosmtpd(`python -m aiosmtpd -n -l localhost:8025`)로 시험할 수 있다.
+"""
+import argparse, hashlib, os, queue, smtplib, socket, sqlite3, threading, time
+from email import policy
+from dataclasses import dataclass
 from email.mime.text import MIMEText
-from email.utils import formataddr
+from email.utils import formataddr, formatdate, make_msgid
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+from app.metrics import metrics
 
 SMTP_HOST = os.getenv("SMTP_HOST")
 SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
@@ -9,15 +31,339 @@ SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASS = os.getenv("SMTP_PASS")
 FROM_EMAIL = os.getenv("FROM_EMAIL", SMTP_USER or "no-reply@example.com")
 TO_EMAILS = [e.strip() for e in os.getenv("TO_EMAILS","").split(",") if e.strip()]
+SMTP_MAX_RCPT = int(os.getenv("SMTP_MAX_RCPT", "100"))  # 한 번의 SMTP 트랜잭션에 넣을 최대 수신자 수
 
-def send_email(subject: str, html: str):
-    if not (SMTP_HOST and SMTP_USER and SMTP_PASS and TO_EMAILS):
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") != "0"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "30"))
+SMTP_CONNECTIONS = int(os.getenv("SMTP_CONNECTIONS", "4"))
+SMTP_RATE = float(os.getenv("SMTP_RATE", "10"))                     # 초당 최대 발송 수(0이면 제한 없음)
+SMTP_MSGS_PER_CONN = int(os.getenv("SMTP_MSGS_PER_CONN", "100"))    # 연결 하나로 보낼 최대 메일 수
+SMTP_MAX_ATTEMPTS = int(os.getenv("SMTP_MAX_ATTEMPTS", "5"))
+SMTP_RETRY_BASE = float(os.getenv("SMTP_RETRY_BASE", "300"))        # 재시도 간격(초), 시도마다 2배
+SMTP_RETRY_PATH = os.getenv("SMTP_RETRY_PATH", ".cache/smtp_retry.sqlite")
+SMTP_RETRY_LEASE = float(os.getenv("SMTP_RETRY_LEASE", "900"))     # 꺼낸 항목을 결과 없이 다시 꺼내기까지(초)
+
+def send_email(subject: str, html: str, to: Optional[List[str]] = None):
+    """뉴스레터 발송. to를 주면 그 수신자들에게 숨은 참조 형태로 보낸다(수신자끼리 주소 비공개)."""
+    recipients = to if to is not None else TO_EMAILS
+    if not (SMTP_HOST and SMTP_USER and SMTP_PASS and recipients):
         raise RuntimeError("SMTP 설정이 없습니다(.env 확인).")
     msg = MIMEText(html, "html", "utf-8")
     msg["Subject"] = subject
     msg["From"] = formataddr(("LogiNews", FROM_EMAIL))
-    msg["To"] = ", ".join(TO_EMAILS)
+    msg["To"] = ", ".join(TO_EMAILS) if to is None else "undisclosed-recipients:;"
+    body = msg.as_string()
     with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as s:
         s.starttls()
         s.login(SMTP_USER, SMTP_PASS)
-        s.sendmail(FROM_EMAIL, TO_EMAILS, msg.as_string())
+        for i in range(0, len(recipients), SMTP_MAX_RCPT):
+            s.sendmail(FROM_EMAIL, recipients[i:i + SMTP_MAX_RCPT], body)
+
+# --- 대량 발송 -----------------------------------------------------------------
+
+SENT, QUEUED, FAILED = "sent", "queued", "failed"
+
+@dataclass
+class Delivery:
+    """수신자별 발송 결과. status는 sent / queued(재시도 대기) / failed(영구 실패)."""
+    recipient: str
+    status: str
+    code: Optional[int] = None
+    error: str = ""
+    attempts: int = 1
+
+def build_body(subject: str, html: str, from_email: str = FROM_EMAIL) -> bytes:
+    """To/Message-ID를 뺀 메시지 바이트(CRLF 줄바꿈). 수신자마다 앞에 두 헤더만 붙여 재사용한다.
+
+    sendmail은 str 메시지만 줄바꿈을 CRLF로 고치므로 bytes는 처음부터 SMTP 정책으로 만든다.
+    """
+    msg = MIMEText(html, "html", "utf-8", policy=policy.SMTP)
+    msg["Subject"] = subject
+    msg["From"] = formataddr(("LogiNews", from_email))
+    msg["Date"] = formatdate(localtime=True)
+    return msg.as_bytes()
+
+def _address_message(recipient: str, body: bytes) -> bytes:
+    domain = recipient.rpartition("@")[2] or None
+    return f"To: {recipient}\r\nMessage-ID: {make_msgid(domain=domain)}\r\n".encode("ascii") + body
+
+class _Throttle:
+    """초당 rate건을 넘지 않도록 발송 시각을 배정(스레드 안전)."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            at = max(now, self.next_at)
+            self.next_at = at + self.interval
+        if at > now:
+            time.sleep(at - now)
+
+class RetryQueue:
+    """일시적으로 실패한 발송을 보관하는 SQLite 큐. 본문은 해시로 한 번만 저장한다."""
+
+    def __init__(self, path: str = SMTP_RETRY_PATH, base_delay: float = SMTP_RETRY_BASE):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.base_delay = base_delay
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            create table if not exists bodies (
+              body_key text primary key,
+              body blob not null
+            );
+            create table if not exists retry_queue (
+              recipient text not null,
+              body_key text not null,
+              attempts integer not null,
+              next_at real not null,
+              last_error text,
+              primary key (recipient, body_key)
+            );""")
+        self._db.commit()
+
+    def push(self, recipient: str, body: bytes, attempts: int, error: str):
+        key = hashlib.sha256(body).hexdigest()
+        next_at = time.time() + self.base_delay * (2 ** max(0, attempts - 1))
+        with self._lock:
+            self._db.execute("insert or ignore into bodies values (?, ?)", (key, body))
+            self._db.execute(
+                "insert or replace into retry_queue values (?, ?, ?, ?, ?)",
+                (recipient, key, attempts, next_at, error),
+            )
+            self._db.commit()
+
+    def due(self, now: Optional[float] = None, lease: float = SMTP_RETRY_LEASE) -> List[Tuple[str, bytes, int]]:
+        """재시도 시각이 된 항목을 (수신자, 본문, 지난 시도 횟수)로 반환.
+
+        행은 지우지 않고 lease초 뒤로 미뤄 둔다. 결과가 나오면 done(성공/영구 실패) 또는 push(다시 대기)로
+        정리하므로, 재시도 도중 프로세스가 죽어도 lease가 지나면 다시 꺼내진다.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            rows = self._db.execute(
+                "select q.recipient, q.body_key, b.body, q.attempts from retry_queue q "
+                "join bodies b on b.body_key = q.body_key where q.next_at <= ?", (now,)
+            ).fetchall()
+            self._db.executemany("update retry_queue set next_at = ? where recipient = ? and body_key = ?",
+                                 [(now + lease, r[0], r[1]) for r in rows])
+            self._db.commit()
+        return [(r[0], r[2], r[3]) for r in rows]
+
+    def done(self, recipient: str, body: bytes):
+        """결과가 확정된 항목(발송 성공/영구 실패)을 큐에서 지움. 더 참조하지 않는 본문도 함께."""
+        key = hashlib.sha256(body).hexdigest()
+        with self._lock:
+            self._db.execute("delete from retry_queue where recipient = ? and body_key = ?", (recipient, key))
+            self._db.execute("delete from bodies where body_key = ? and not exists "
+                             "(select 1 from retry_queue where body_key = ?)", (key, key))
+            self._db.commit()
+
+    def stats(self) -> Tuple[int, int]:
+        """(대기 중 항목 수, 지금 재시도 가능한 항목 수)."""
+        return self._db.execute(
+            "select count(*), coalesce(sum(next_at <= ?), 0) from retry_queue", (time.time(),)
+        ).fetchone()
+
+class SMTPSetupError(Exception):
+    """접속/STARTTLS/로그인 실패. 수신자와 무관한 설정·서버 문제라 그 실행의 발송을 멈춘다."""
+
+def _classify_error(e: Exception) -> Tuple[str, Optional[int], str]:
+    """예외 → (상태, SMTP 코드, 메시지). 5xx는 영구 실패, 그 밖에는 재시도 대상."""
+    if isinstance(e, UnicodeError):
+        return FAILED, None, "ASCII가 아닌 주소"   # SMTPUTF8 미지원
+    code, text = getattr(e, "smtp_code", None), str(e) or type(e).__name__
+    if isinstance(e, smtplib.SMTPRecipientsRefused):
+        code, raw = next(iter(e.recipients.values()))
+        text = raw.decode("utf-8", "replace")
+    if code is not None and 500 <= code < 600:
+        return FAILED, code, text
+    return QUEUED, code, text
+
+class BulkSender:
+    """인증된 SMTP 연결을 재사용하는 다중 스레드 대량 발송기."""
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 user: Optional[str] = None, password: Optional[str] = None,
+                 from_email: Optional[str] = None, starttls: bool = SMTP_STARTTLS,
+                 connections: int = SMTP_CONNECTIONS, rate: float = SMTP_RATE,
+                 msgs_per_conn: int = SMTP_MSGS_PER_CONN, max_attempts: int = SMTP_MAX_ATTEMPTS,
+                 timeout: float = SMTP_TIMEOUT, retry_queue: Optional[RetryQueue] = None):
+        # .env는 main에서 import 이후에 읽히므로 설정은 생성 시점의 환경변수 기준
+        self.host = host or os.getenv("SMTP_HOST")
+        self.port = port or int(os.getenv("SMTP_PORT", "587"))
+        self.user = user if user is not None else os.getenv("SMTP_USER")
+        self.password = password if password is not None else os.getenv("SMTP_PASS")
+        self.from_email = from_email or os.getenv("FROM_EMAIL", self.user or "no-reply@example.com")
+        if not self.host:
+            raise RuntimeError("SMTP 설정이 없습니다(.env 확인).")
+        self.starttls = starttls
+        self.connections = max(1, connections)
+        self.msgs_per_conn = max(1, msgs_per_conn)
+        self.max_attempts = max(1, max_attempts)
+        self.timeout = timeout
+        self.throttle = _Throttle(rate)
+        self.retry_queue = retry_queue or RetryQueue()
+
+    # --- 연결 -------------------------------------------------------------------
+    def _connect(self) -> smtplib.SMTP:
+        try:
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        except Exception as e:
+            raise SMTPSetupError(f"SMTP 접속 실패({self.host}:{self.port}): {e}") from e
+        try:
+            if self.starttls:
+                conn.starttls()
+            if self.user and self.password:
+                conn.login(self.user, self.password)
+        except Exception as e:
+            conn.close()
+            raise SMTPSetupError(f"SMTP 인증 실패: {e}") from e
+        return conn
+
+    @staticmethod
+    def _close(conn: Optional[smtplib.SMTP]):
+        if conn is None:
+            return
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    # --- 워커 -------------------------------------------------------------------
+    def _send_one(self, state: List, recipient: str, body: bytes) -> None:
+        """state = [연결, 이 연결로 보낸 수]. 끊겼으면 다시 연결해 한 번 더 보낸다."""
+        msg = _address_message(recipient, body)
+        for retry in (False, True):
+            if state[0] is None or state[1] >= self.msgs_per_conn:
+                self._close(state[0])
+                state[0] = None
+                state[0], state[1] = self._connect(), 0
+            try:
+                state[0].sendmail(self.from_email, [recipient], msg)
+                state[1] += 1
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError, socket.timeout):
+                self._close(state[0])
+                state[0] = None
+                if retry:
+                    raise
+
+    def _worker(self, jobs: "queue.Queue", results: List[Delivery], lock: threading.Lock, abort: List):
+        """abort = [SMTPSetupError 또는 None]. 한 워커가 접속/인증에 실패하면 모든 워커가 남은 작업을 시도 없이 큐로."""
+        state: List = [None, 0]
+        try:
+            while (job := jobs.get()) is not None:
+                recipient, body, attempts, from_queue = job
+                if abort[0] is not None:
+                    d = self._defer(recipient, body, attempts, abort[0])
+                    with lock:
+                        results.append(d)
+                    continue
+                self.throttle.wait()
+                t0 = time.perf_counter()
+                try:
+                    self._send_one(state, recipient, body)
+                    metrics.observe("send_seconds", time.perf_counter() - t0)
+                    d = Delivery(recipient, SENT, 250, attempts=attempts)
+                except SMTPSetupError as e:
+                    with lock:
+                        if abort[0] is None:
+                            abort[0] = e
+                            print(f"[ERROR] {e} — 이번 실행의 발송을 멈추고 남은 수신자는 재시도 큐에 넣습니다")
+                    d = self._defer(recipient, body, attempts, e)
+                except Exception as e:
+                    status, code, text = _classify_error(e)
+                    if status == QUEUED and attempts >= self.max_attempts:
+                        status = FAILED
+                    d = Delivery(recipient, status, code, text, attempts)
+                    if status == QUEUED:
+                        self.retry_queue.push(recipient, body, attempts, d.error)
+                if from_queue and d.status != QUEUED:
+                    self.retry_queue.done(recipient, body)
+                metrics.inc("send_total", status=d.status)
+                with lock:
+                    results.append(d)
+        finally:
+            self._close(state[0])
+
+    def _defer(self, recipient: str, body: bytes, attempts: int, e: Exception) -> Delivery:
+        """보내 보지 못한 작업을 재시도 큐로(시도 횟수는 늘리지 않음)."""
+        self.retry_queue.push(recipient, body, attempts - 1, str(e))
+        metrics.inc("send_total", status=QUEUED)
+        return Delivery(recipient, QUEUED, getattr(e.__cause__, "smtp_code", None), str(e), attempts - 1)
+
+    def _run(self, jobs: Iterable[Tuple[str, bytes, int, bool]]) -> List[Delivery]:
+        """jobs = (수신자, 본문, 이번 시도 차례, 재시도 큐에서 꺼낸 항목인지)."""
+        q: "queue.Queue" = queue.Queue(maxsize=self.connections * 64)
+        results: List[Delivery] = []
+        lock = threading.Lock()
+        abort: List = [None]
+        threads = [threading.Thread(target=self._worker, args=(q, results, lock, abort), daemon=True)
+                   for _ in range(self.connections)]
+        for t in threads:
+            t.start()
+        t0 = time.perf_counter()
+        for job in jobs:
+            q.put(job)
+        for _ in threads:
+            q.put(None)
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - t0
+        if results and elapsed > 0:
+            metrics.set("send_throughput_per_second", sum(d.status == SENT for d in results) / elapsed)
+        return results
+
+    # --- 공개 API ----------------------------------------------------------------
+    def send(self, subject: str, html: str, recipients: Iterable[str]) -> List[Delivery]:
+        """같은 본문을 수신자마다 개별 주소로 발송."""
+        body = build_body(subject, html, self.from_email)
+        return self._run((r, body, 1, False) for r in recipients)
+
+    def send_editions(self, editions) -> List[Delivery]:
+        """subscribers.Edition 목록 발송(모든 묶음이 같은 연결 풀을 공유)."""
+        def jobs():
+            for ed in editions:
+                body = build_body(ed.subject, ed.html, self.from_email)
+                for r in ed.recipients:
+                    yield r, body, 1, False
+        return self._run(jobs())
+
+    def retry_pending(self) -> List[Delivery]:
+        """재시도 큐에서 시각이 된 항목을 다시 발송."""
+        return self._run((r, body, attempts + 1, True) for r, body, attempts in self.retry_queue.due())
+
+def summarize_deliveries(deliveries: List[Delivery]) -> str:
+    counts = {SENT: 0, QUEUED: 0, FAILED: 0}
+    for d in deliveries:
+        counts[d.status] += 1
+    return f"발송 {counts[SENT]}건, 재시도 대기 {counts[QUEUED]}건, 실패 {counts[FAILED]}건"
+
+def main():
+    parser = argparse.ArgumentParser(description="메일 재시도 큐 관리")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("retry", help="재시도 시각이 된 항목 발송")
+    sub.add_parser("stats", help="재시도 큐 현황")
+    args = parser.parse_args()
+
+    if args.cmd == "retry":
+        from dotenv import load_dotenv
+        load_dotenv()
+        results = BulkSender().retry_pending()
+        print(f"[OK] {summarize_deliveries(results)}")
+        for d in results:
+            if d.status == FAILED:
+                print(f"[WARN] {d.recipient}: {d.code} {d.error}")
+    else:
+        pending, due = RetryQueue().stats()
+        print(f"대기 {pending}건(지금 재시도 가능 {due}건)")
+
+if __name__ == "__main__":
+    main()
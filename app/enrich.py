@@ -0,0 +1,252 @@
+# app/enrich.py
+"""동시/속도 제한 인지형 LLM 요약 단계.
+
+- 분당 요청 수(ENRICH_RPM)와 분당 토큰 수(ENRICH_TPM) 예산 안에서 동시에 요약
+- 429/5xx/연결 오류는 지터가 있는 지수 백오프로 재시도(Retry-After 우선)
+- 전체 마감 시간(ENRICH_DEADLINE)을 넘기면 남은 기사는 로컬 추출 요약으로 대체
+- ENRICH_PACK_CHARS > 0이면 그보다 짧은 기사들을 한 프롬프트로 묶어 요청
+- ENRICH_TOP_ONLY=1이면 파이프라인은 모든 기사를 로컬 요약으로 분류/정렬하고 뉴스레터에 실릴 기사만 LLM으로 다시 요약
+
+OPENAI_BASE_URL을 로컬 가짜 서버(OpenAI 호환)로 지정하면 오프라인으로 시험할 수 있다.
+"""
+import asyncio, json, os, random, time
+from typing import Dict, List, Optional, Tuple
+
+from app.nlp import (
+    SummaryResult, USE_OPENAI, OPENAI_MODEL, PROMPT_VERSION, SYSTEM_PROMPT,
+    build_prompt, classify_section, summarize_and_classify, summarize_local,
+)
+from app.keywords import extract_keywords
+from app.metrics import metrics
+from app.summary_cache import get_summary_cache, content_key
+
+ENRICH_RPM = int(os.getenv("ENRICH_RPM", "500"))
+ENRICH_TPM = int(os.getenv("ENRICH_TPM", "200000"))
+ENRICH_CONCURRENCY = int(os.getenv("ENRICH_CONCURRENCY", "8"))
+ENRICH_DEADLINE = float(os.getenv("ENRICH_DEADLINE", "300"))   # 초
+ENRICH_MAX_RETRIES = int(os.getenv("ENRICH_MAX_RETRIES", "5"))
+ENRICH_PACK_CHARS = int(os.getenv("ENRICH_PACK_CHARS", "0"))   # 0이면 묶음 요청 사용 안 함
+ENRICH_PACK_SIZE = int(os.getenv("ENRICH_PACK_SIZE", "5"))
+ENRICH_TOP_ONLY = os.getenv("ENRICH_TOP_ONLY", "0") == "1"
+MAX_OUTPUT_TOKENS = 400
+
+class DeadlineExceeded(Exception):
+    pass
+
+def estimate_tokens(text: str) -> int:
+    """대략적인 토큰 수(한국어는 글자 2개당 1토큰 정도로 잡음) + 출력 여유분."""
+    return len(text) // 2 + MAX_OUTPUT_TOKENS
+
+class _Bucket:
+    """초당 rate만큼 채워지는 토큰 버킷."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(max(1, per_minute))
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        self._refill()
+        amount = min(amount, self.capacity)  # 상한보다 큰 요청도 언젠가는 통과하도록
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        self.level -= min(amount, self.capacity)
+
+class RateLimiter:
+    """RPM/TPM 두 예산을 함께 지키는 비동기 리미터."""
+
+    def __init__(self, rpm: int = ENRICH_RPM, tpm: int = ENRICH_TPM):
+        self.requests = _Bucket(rpm)
+        self.tokens = _Bucket(tpm)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int, deadline: float):
+        async with self._lock:
+            while True:
+                wait = max(self.requests.wait_time(1), self.tokens.wait_time(tokens))
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(tokens)
+                    return
+                if time.monotonic() + wait > deadline:
+                    raise DeadlineExceeded()
+                await asyncio.sleep(wait)
+
+    def refund(self, tokens: int):
+        """추정치보다 실제 사용량이 적었으면 차이를 돌려줌."""
+        if tokens > 0:
+            self.tokens.level = min(self.tokens.capacity, self.tokens.level + tokens)
+
+def _retry_delay(attempt: int, retry_after: Optional[str]) -> float:
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return random.uniform(0, min(30.0, 0.5 * 2 ** attempt))  # full jitter
+
+class Enricher:
+    def __init__(self, rpm: int = ENRICH_RPM, tpm: int = ENRICH_TPM, concurrency: int = ENRICH_CONCURRENCY,
+                 deadline: float = ENRICH_DEADLINE, max_retries: int = ENRICH_MAX_RETRIES,
+                 pack_chars: int = ENRICH_PACK_CHARS, pack_size: int = ENRICH_PACK_SIZE,
+                 model: str = OPENAI_MODEL, client=None, use_openai: bool = USE_OPENAI):
+        self.use_openai = use_openai
+        self.limiter = RateLimiter(rpm, tpm)
+        self.concurrency = max(1, concurrency)
+        self.deadline_budget = deadline
+        self.max_retries = max_retries
+        self.pack_chars = pack_chars
+        self.pack_size = max(1, pack_size)
+        self.model = model
+        self._client = client
+        self.fallbacks = 0
+        self.deadline: Optional[float] = None   # 첫 enrich 호출 시점부터 마감 예산을 잰다
+        self._sem: Optional[asyncio.Semaphore] = None
+
+    def _get_client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(max_retries=0)  # 재시도는 여기서 직접 처리
+        return self._client
+
+    async def _complete(self, prompt: str, deadline: float) -> str:
+        import openai
+        est = estimate_tokens(SYSTEM_PROMPT + prompt)
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(est, deadline)
+            t0 = time.perf_counter()
+            try:
+                res = await asyncio.wait_for(
+                    self._get_client().chat.completions.create(
+                        model=self.model,
+                        messages=[{"role": "system", "content": SYSTEM_PROMPT},
+                                  {"role": "user", "content": prompt}],
+                        temperature=0.2,
+                        max_tokens=MAX_OUTPUT_TOKENS,
+                    ),
+                    timeout=max(0.1, deadline - time.monotonic()),
+                )
+            except asyncio.TimeoutError:
+                metrics.inc("llm_requests_total", model=self.model, result="deadline")
+                raise DeadlineExceeded()
+            except (openai.RateLimitError, openai.InternalServerError,
+                    openai.APIConnectionError) as e:
+                metrics.inc("llm_requests_total", model=self.model, result="retry")
+                response = getattr(e, "response", None)
+                retry_after = response.headers.get("retry-after") if response is not None else None
+                delay = _retry_delay(attempt, retry_after)
+                if attempt == self.max_retries:
+                    raise
+                if time.monotonic() + delay > deadline:
+                    raise DeadlineExceeded() from e
+                await asyncio.sleep(delay)
+                continue
+            metrics.observe("llm_seconds", time.perf_counter() - t0, model=self.model)
+            metrics.inc("llm_requests_total", model=self.model, result="ok")
+            if res.usage is not None:
+                self.limiter.refund(est - res.usage.total_tokens)
+                metrics.inc("llm_tokens_total", res.usage.prompt_tokens, model=self.model, kind="prompt")
+                metrics.inc("llm_tokens_total", res.usage.completion_tokens, model=self.model, kind="completion")
+            return res.choices[0].message.content.strip()
+        raise DeadlineExceeded()
+
+    async def _one(self, title: str, content: str, deadline: float) -> Optional[SummaryResult]:
+        """LLM 요약. 마감/실패로 요약하지 못하면 None(호출 측에서 로컬 요약으로 대체)."""
+        try:
+            summary = await self._complete(build_prompt(title, content), deadline)
+        except DeadlineExceeded:
+            return None
+        except Exception as e:
+            print(f"[WARN] 요약 실패, 로컬 요약으로 대체 - {title[:30]}: {e}")
+            return None
+        return SummaryResult(summary=summary, section=classify_section(title, summary))
+
+    async def _pack(self, batch: List[Tuple[str, str]], deadline: float) -> List[Optional[SummaryResult]]:
+        """짧은 기사 여러 개를 한 프롬프트로 요약. 응답 형식이 어긋나면 개별 요청으로 재시도."""
+        body = "\n\n".join(
+            f"[{i}] 기사 제목: {t}\n본문: {c[:1000]}" for i, (t, c) in enumerate(batch, 1)
+        )
+        prompt = (
+            "너는 물류 전문 에디터야. 아래 기사들을 각각 한국어로 간결하고 친근하게 핵심만 3문장으로 요약해.\n"
+            "조건: 1) 과장 금지 2) 숫자는 그대로 3) 마지막 문장은 '업무 인사이트' 1줄로 마무리\n"
+            '출력은 JSON 배열만: [{"id": 1, "summary": "..."}, ...]\n\n' + body
+        )
+        try:
+            raw = await self._complete(prompt, deadline)
+            raw = raw.strip().removeprefix("```json").removeprefix("```").removesuffix("```")
+            by_id = {int(o["id"]): str(o["summary"]).strip() for o in json.loads(raw)}
+            summaries = [by_id[i] for i in range(1, len(batch) + 1)]
+        except DeadlineExceeded:
+            return [None] * len(batch)
+        except Exception:
+            return list(await asyncio.gather(*(self._one(t, c, deadline) for t, c in batch)))
+        return [SummaryResult(summary=s, section=classify_section(t, s)) for (t, _), s in zip(batch, summaries)]
+
+    async def enrich(self, articles: List[Tuple[str, str]]) -> List[SummaryResult]:
+        """(제목, 본문) 리스트를 요약. 결과 순서는 입력 순서와 같다.
+
+        여러 번(동시에) 호출해도 마감 시간과 동시 요청 수는 Enricher 전체에서 공유한다.
+        """
+        if not self.use_openai:
+            return await asyncio.to_thread(summarize_local, articles)
+        if self.deadline is None:
+            self.deadline = time.monotonic() + self.deadline_budget
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.concurrency)
+        deadline, sem = self.deadline, self._sem
+        cache = get_summary_cache()
+        results: List[Optional[SummaryResult]] = [None] * len(articles)
+        keys: Dict[int, str] = {}
+        todo: List[int] = []
+        for i, (title, content) in enumerate(articles):
+            if cache:
+                keys[i] = content_key(title, content)
+                if hit := cache.get(keys[i], PROMPT_VERSION, self.model):
+                    results[i] = SummaryResult(summary=hit[0], section=hit[1])
+                    continue
+            todo.append(i)
+
+        # 작업 단위: 짧은 기사 묶음 또는 기사 하나
+        units: List[List[int]] = []
+        if self.pack_chars > 0:
+            short = [i for i in todo if len(articles[i][1]) < self.pack_chars]
+            units += [short[k:k + self.pack_size] for k in range(0, len(short), self.pack_size)]
+            units += [[i] for i in todo if len(articles[i][1]) >= self.pack_chars]
+        else:
+            units = [[i] for i in todo]
+
+        async def run(unit: List[int]):
+            async with sem:
+                if len(unit) == 1:
+                    out = [await self._one(*articles[unit[0]], deadline)]
+                else:
+                    out = await self._pack([articles[i] for i in unit], deadline)
+            for i, res in zip(unit, out):
+                if res is None:
+                    self.fallbacks += 1
+                    results[i] = summarize_and_classify(*articles[i], use_openai=False)
+                    continue
+                results[i] = res
+                if cache:
+                    cache.put(keys[i], PROMPT_VERSION, self.model, res.summary, res.section)
+
+        await asyncio.gather(*(run(u) for u in units))
+        # 키워드는 요약 방식/캐시와 관계없이 묶음 단위 로컬 추출
+        for res, kw in zip(results, extract_keywords(articles)):
+            res.keywords = kw
+        return results
+
+def enrich_articles(articles: List[Tuple[str, str]], **kwargs) -> List[SummaryResult]:
+    """동기 코드에서 호출하는 진입점. OpenAI 키가 없으면 로컬 요약을 순서대로 적용."""
+    enricher = Enricher(**kwargs)
+    results = asyncio.run(enricher.enrich(articles))
+    if enricher.fallbacks:
+        print(f"[WARN] 마감/오류로 로컬 요약으로 대체: {enricher.fallbacks}건")
+    return results
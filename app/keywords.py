@@ -0,0 +1,65 @@
+# app/keywords.py
+"""기사 키워드 추출(article_enrich.keywords, 검색 색인용).
+
+요약 단계의 묶음(같은 날 수집한 기사들) 안에서 TF-IDF로 기사마다 KEYWORDS_PER_ARTICLE개를 고른다.
+한국어는 형태소 분석 없이 어절 끝의 조사/어미를 떼어 명사에 가깝게 만들고,
+'~다'로 끝나는 서술어와 자주 쓰는 기사 상투어는 버린다. 제목에 나온 단어는 가중치를 더 준다.
+영문/숫자가 섞인 고유명사(CJ대한통운, AMR, 3PL)는 표기 그대로 둔다.
+"""
+import heapq, math, os, re
+from collections import Counter
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+KEYWORDS_PER_ARTICLE = int(os.getenv("KEYWORDS_PER_ARTICLE", "5"))
+TITLE_WEIGHT = 3
+MAX_TEXT_CHARS = 4000      # 본문은 앞부분만 봄(키워드는 보통 앞에 몰려 있음)
+
+_TOKEN = re.compile(r"[A-Za-z0-9]*[가-힣]+[A-Za-z0-9가-힣]*|[A-Za-z][A-Za-z0-9&+-]*[A-Za-z0-9]|\d+[A-Za-z]+")
+# 어절 끝 조사/어미(남는 부분이 2글자 이상일 때만, 긴 것부터 떼어냄)
+_SUFFIXES = frozenset((
+    "에서는", "에서도", "에게서", "으로는", "으로도", "으로서", "으로써", "이라는", "이라고", "이라며",
+    "에서", "에게", "으로", "까지", "부터", "처럼", "보다", "이나", "에는", "에도", "과의", "와의", "와는", "과는",
+    "이며", "라는", "라고", "라며", "들이", "들은", "들을", "들의", "하며", "하고", "해야", "하는", "되는", "했던",
+    "은", "는", "이", "가", "을", "를", "에", "의", "와", "과", "도", "만", "로", "들",
+))
+_STOPWORDS = frozenset("""
+기자 이번 지난 올해 오는 통해 위해 대한 관련 이날 현재 최근 대해 따라 함께 가장 또한 한편 그리고 하지만 이후 이전
+경우 정도 가운데 때문 사실 모든 각각 이상 이하 내년 지난해 당시 이어 특히 측은 것으로 설명 계획 예정 방침 전망
+이라고 우리 당사 제공 사진 자료 무단 전재 배포 금지 기사 뉴스 신문 오전 오후 가능 진행 실시 추진 확대 강화 마련
+the and for with from that this into are was has have its our new
+""".split())
+
+@lru_cache(maxsize=1 << 16)
+def _keyword(word: str) -> Optional[str]:
+    """어절 → 키워드 후보(조사/어미 제거). 후보가 아니면 None."""
+    if "가" <= word[-1] <= "힣":
+        for n in (3, 2, 1):
+            if len(word) - n >= 2 and word[-n:] in _SUFFIXES:
+                word = word[:-n]
+                break
+    if len(word) < 2 or word.endswith("다") or word.isdigit() or word.lower() in _STOPWORDS:
+        return None
+    return word
+
+def candidates(text: str) -> List[str]:
+    """키워드 후보 단어 목록(등장 순서, 중복 포함)."""
+    return [w for w in map(_keyword, _TOKEN.findall(text)) if w]
+
+def extract_keywords(docs: Sequence[Tuple[str, str]], k: int = KEYWORDS_PER_ARTICLE) -> List[List[str]]:
+    """(제목, 본문) 여러 건의 키워드. 결과 순서는 입력 순서와 같다."""
+    counts: List[Counter] = []
+    df: Counter = Counter()
+    for title, text in docs:
+        c = Counter(candidates((text or "")[:MAX_TEXT_CHARS]))
+        for w in candidates(title or ""):
+            c[w] += TITLE_WEIGHT
+        counts.append(c)
+        df.update(c.keys())
+    n = len(docs)
+    idf = {w: math.log((1 + n) / (1 + d) + 1) for w, d in df.items()}
+    if k <= 0:
+        return [[] for _ in counts]
+    # 점수가 같으면 먼저 나온 단어 우선
+    return [[w for w, _ in heapq.nlargest(k, c.items(), key=lambda e: (1 + math.log(e[1])) * idf[e[0]])]
+            for c in counts]
@@ -1,6 +1,5 @@
 # app/main.py
-import argparse, os, json, time
-from dataclasses import dataclass
+import argparse, os
 from typing import List, Dict, Any
 from datetime import datetime
 from pathlib import Path
@@ -8,120 +7,110 @@ from pathlib import Path
 from dotenv import load_dotenv
 import yaml
 
-from app.crawler import fetch_rss, fetch_html, parse_list_page, parse_article_detail
-from app.nlp import summarize_and_classify
-from app.rank import sort_articles
-from app.render_email import render_newsletter
+load_dotenv()  # app 모듈은 import 시점에 환경변수를 읽으므로 가장 먼저
 
-try:
-    from app.emailer import send_email
-except Exception:
-    send_email = None
+from app.metrics import metrics, METRICS_DIR
+from app.rank import RankEngine
+
+# 수집/요약/렌더/발송 모듈(httpx, bs4, feedparser, numpy, jinja2, openai 등)은 실제로 쓰는 함수 안에서
+# 불러온다. --help나 데몬 기동처럼 가벼운 명령은 이 비용 없이 바로 시작한다.
 
 def load_sources(cfg_path="config/sources.yaml") -> List[Dict[str, Any]]:
     with open(cfg_path, "r", encoding="utf-8") as f:
         data = yaml.safe_load(f)
         return data.get("sources", [])
 
-def dedup_by_url(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    seen, out = set(), []
-    for it in items:
-        u = it.get("url")
-        if not u or u in seen: 
-            continue
-        seen.add(u)
-        out.append(it)
-    return out
-
-def group_by_section(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    groups: Dict[str, List[Dict[str, Any]]] = {}
-    for it in items:
-        sec = it.get("section", "기타")
-        groups.setdefault(sec, []).append(it)
-    # 섹션 순서
-    order = ["국내 물류","글로벌 동향","테크·자동화","정책·규제","라스트마일·이커머스"]
-    ordered_sections = []
-    for name in order:
-        if name in groups:
-            ordered_sections.append({"name": name, "items": groups[name]})
-    # 기타 섹션 뒤에
-    for name, arr in groups.items():
-        if name not in order:
-            ordered_sections.append({"name": name, "items": arr})
-    return ordered_sections
-
-def collect_articles(src: Dict[str, Any]) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    if src.get("method") == "rss" and src.get("rss_url"):
-        items = fetch_rss(src["rss_url"])
-        for it in items:
-            it["source_name"] = src["name"]
-    elif src.get("method") == "html" and src.get("list_url"):
-        html = fetch_html(src["list_url"])
-        lst = parse_list_page(html, src["base_url"], src["item_selector"], src["title_selector"], src["link_selector"])
-        for it in lst:
-            it["source_name"] = src["name"]
-            # 상세 페이지에서 내용/조회수/발행일 추출(가능 시)
-            detail_cfg = src.get("detail", {})
-            detail_html = fetch_html(it["url"])
-            d = parse_article_detail(detail_html, detail_cfg)
-            it.update(d)
-    return items
-
-def main():
-    load_dotenv()
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--preview", action="store_true", help="HTML 파일로 미리보기만 생성")
-    parser.add_argument("--send", action="store_true", help="이메일 발송")
-    args = parser.parse_args()
-
-    app_name = os.getenv("APP_NAME", "LogiNews")
-    today = datetime.now()
+def run(args, app_name: str, today: datetime, runtime=None):
+    """수집부터 발송까지 한 번 실행. runtime(app.daemon.Runtime)을 주면 데몬의 이벤트 루프/커넥션 풀을 재사용."""
+    from app.pipeline import run_pipeline
+    from app.render_email import get_renderer, render_newsletter
+    from app.storage import get_storage
 
+    get_renderer()  # 템플릿은 수집 전에 미리 컴파일(바이트코드 캐시 사용)
     sources = load_sources()
-    all_items: List[Dict[str, Any]] = []
-    for s in sources:
-        try:
-            all_items.extend(collect_articles(s))
-        except Exception as e:
-            print(f"[WARN] {s.get('name')}: 수집 실패 - {e}")
-
-    # 중복 제거
-    all_items = dedup_by_url(all_items)
-
-    # 요약/섹션
-    enriched: List[Dict[str, Any]] = []
-    for it in all_items:
-        title = it.get("title","").strip()
-        content = it.get("content","").strip()
-        res = summarize_and_classify(title, content)
-        it["summary"] = res.summary
-        it["section"] = res.section
-        # 정렬용 타임스탬프
-        it["published_at_ts"] = int(it.get("published_at").timestamp()) if it.get("published_at") else 0
-        enriched.append(it)
-
-    # 섹션별 정렬(조회수 우선)
-    sorted_items = sort_articles(enriched)
-    sections = group_by_section(sorted_items)
+    kwargs = {}
+    if args.replay:
+        from app.archive import start_replay
+        from app.enrich import Enricher
+        # 그날 보관한 페이지로 재실행: 정렬 기준 시각도 그날 마지막 수집 시각으로 고정
+        replay = start_replay(args.replay)
+        last = replay.last_fetched_at()
+        print(f"[OK] 재생 모드: {replay.dir} ({len(replay)}건)")
+        kwargs["ranker"] = RankEngine.from_config(now=last.timestamp() if last else None)
+        if not args.replay_llm:
+            kwargs["enricher"] = Enricher(use_openai=False)
+    # 수집 → 파싱 → 중복 제거 → 요약 → 정렬을 스트리밍으로 겹쳐 실행
+    with metrics.timer("stage_seconds", stage="pipeline"):
+        sections = run_pipeline(sources, runtime=runtime, **kwargs)
 
     # 렌더
-    html, subject = render_newsletter(app_name, sections, today)
+    with metrics.timer("stage_seconds", stage="render"):
+        html, subject = render_newsletter(app_name, sections, today)
 
-    out_dir = Path("out"); out_dir.mkdir(exist_ok=True)
+    # 재생 결과는 그날 실제 미리보기를 덮지 않도록 out/replay/에
+    out_dir = Path("out") / "replay" if args.replay else Path("out")
+    out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / f"newsletter_{today.strftime('%Y%m%d')}.html"
     out_path.write_text(html, encoding="utf-8")
     print(f"[OK] 미리보기 파일 생성: {out_path}")
 
     if args.send:
-        if send_email is None:
+        try:
+            from app.emailer import BulkSender, FAILED, summarize_deliveries
+            from app.subscribers import load_subscribers, build_editions
+        except Exception:
             print("[ERROR] 이메일 모듈 로드 실패. SMTP 설정 또는 의존성 확인.")
             return
+        # 구독 설정이 같은 구독자끼리 본문 하나를 공유(수집/요약은 위에서 한 번만)
+        with metrics.timer("stage_seconds", stage="editions"):
+            editions = build_editions(app_name, sections, today, load_subscribers())
         try:
-            send_email(subject, html)
-            print("[OK] 이메일 발송 완료")
+            sender = BulkSender()
         except Exception as e:
             print(f"[ERROR] 이메일 발송 실패: {e}")
+            return
+        # 이전 실행에서 일시적으로 실패한 메일부터 다시 보낸 뒤 오늘 호 발송
+        with metrics.timer("stage_seconds", stage="send"):
+            deliveries = sender.retry_pending() + sender.send_editions(editions)
+        print(f"[OK] 이메일 {summarize_deliveries(deliveries)}")
+        for d in deliveries:
+            if d.status == FAILED:
+                print(f"[WARN] {d.recipient}: 발송 실패 - {d.code} {d.error}")
+        if storage := get_storage():
+            try:
+                with metrics.timer("stage_seconds", stage="store"):
+                    storage.record_newsletter(subject, html, sections, sent_at=datetime.now().astimezone())
+            except Exception as e:
+                print(f"[WARN] 뉴스레터 기록 저장 실패 - {e}")
+
+def execute(args, runtime=None):
+    """지표 수집을 감싼 한 번의 실행(main과 데몬이 공용)."""
+    app_name = os.getenv("APP_NAME", "LogiNews")
+    today = datetime.strptime(args.replay.replace("-", ""), "%Y%m%d") if args.replay else datetime.now()
+    metrics.reset()
+    try:
+        with metrics.timer("stage_seconds", stage="total"):
+            run(args, app_name, today, runtime)
+    finally:
+        # 실패한 실행도 어느 단계/소스에서 멈췄는지 보이도록 항상 기록
+        # 재생 지표는 out/replay/에만 쓰고 Prometheus textfile(운영 지표)은 건드리지 않음
+        if args.replay:
+            path = metrics.write(today, out_dir=str(Path(METRICS_DIR) / "replay"), textfile=None)
+        else:
+            path = metrics.write(today)
+        if path:
+            print(f"[OK] 실행 지표 저장: {path}")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--preview", action="store_true", help="HTML 파일로 미리보기만 생성")
+    parser.add_argument("--send", action="store_true", help="이메일 발송")
+    parser.add_argument("--replay", metavar="DATE", help="그날(YYYY-MM-DD) 보관한 페이지로 네트워크 없이 재실행")
+    parser.add_argument("--replay-llm", action="store_true", help="재생 중에도 OpenAI 요약 사용(기본은 로컬 요약)")
+    args = parser.parse_args()
+    if args.replay and args.send:
+        parser.error("--replay는 --send와 함께 쓸 수 없습니다")
+    execute(args)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,197 @@
+# app/metrics.py
+"""실행 지표 수집.
+
+단계별 소요 시간, 소스별 수집 지연(백분위), 다운로드 바이트, 캐시 적중률, 페이지당 파싱 시간,
+LLM 지연/토큰 수, 메일 발송 처리량을 한 곳에 모은다. 실행이 끝나면
+- METRICS_DIR/metrics_YYYYMMDD.json : 사람이/스크립트가 읽는 실행 리포트
+- METRICS_TEXTFILE : Prometheus node_exporter textfile collector 형식
+으로 저장한다(METRICS=0이면 기록하지 않음).
+
+    from app.metrics import metrics
+    metrics.inc("fetch_bytes_total", len(body), source="물류신문")
+    with metrics.timer("stage_seconds", stage="render"):
+        ...
+"""
+import json, os, re, threading, time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+METRICS_ENABLED = os.getenv("METRICS", "1") != "0"
+METRICS_DIR = os.getenv("METRICS_DIR", "out")
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "out/loginews.prom")
+METRICS_PREFIX = "loginews_"
+QUANTILES = (0.5, 0.9, 0.99)
+
+# 보고서에 함께 넣는 비율: 이름 → (카운터, 분자 label 값)
+RATIOS = {
+    "http_cache_hit_ratio": ("http_cache_total", "result", ("hit", "revalidated")),
+    "summary_cache_hit_ratio": ("summary_cache_total", "result", ("hit",)),
+    "crawl_state_hit_ratio": ("crawl_state_total", "result", ("hit",)),
+}
+
+Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+def _key(name: str, labels: Dict[str, object]) -> Key:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def _quantile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _prom_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{re.sub(r"[^a-zA-Z0-9_]", "_", k)}="{_escape(v)}"' for k, v in pairs) + "}"
+
+class Metrics:
+    """카운터/게이지/관측값(요약 통계) 저장소. 여러 스레드에서 동시에 기록해도 된다."""
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters: Dict[Key, float] = {}
+            self.gauges: Dict[Key, float] = {}
+            self.observations: Dict[Key, List[float]] = {}
+            self.started_at = time.time()
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        if not self.enabled:
+            return
+        k = _key(name, labels)
+        with self._lock:
+            self.counters[k] = self.counters.get(k, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.gauges[_key(name, labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        k = _key(name, labels)
+        with self._lock:
+            self.observations.setdefault(k, []).append(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """with 블록의 소요 시간(초)을 observe."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - t0, **labels)
+
+    # --- 출력 -----------------------------------------------------------------------
+    def _summaries(self) -> Dict[Key, Dict[str, float]]:
+        with self._lock:
+            items = [(k, sorted(v)) for k, v in self.observations.items()]
+        out = {}
+        for k, vals in items:
+            s = {"count": len(vals), "sum": sum(vals), "max": vals[-1] if vals else 0.0}
+            for q in QUANTILES:
+                s[f"p{int(q * 100)}"] = _quantile(vals, q)
+            out[k] = s
+        return out
+
+    def ratios(self) -> Dict[str, Optional[float]]:
+        with self._lock:
+            counters = dict(self.counters)
+        out = {}
+        for ratio, (name, label, hits) in RATIOS.items():
+            total = hit = 0.0
+            for (n, labels), v in counters.items():
+                if n != name:
+                    continue
+                total += v
+                if dict(labels).get(label) in hits:
+                    hit += v
+            out[ratio] = round(hit / total, 4) if total else None
+        return out
+
+    def report(self) -> Dict:
+        """JSON 리포트용 dict."""
+        def group(entries):
+            out: Dict[str, List[Dict]] = {}
+            for (name, labels), v in sorted(entries, key=lambda e: e[0]):
+                out.setdefault(name, []).append({"labels": dict(labels), **(v if isinstance(v, dict) else {"value": v})})
+            return out
+
+        with self._lock:
+            counters, gauges = list(self.counters.items()), list(self.gauges.items())
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).astimezone().isoformat(timespec="seconds"),
+            "duration_s": round(time.time() - self.started_at, 3),
+            "ratios": self.ratios(),
+            "counters": group(counters),
+            "gauges": group(gauges),
+            "summaries": group(self._summaries().items()),
+        }
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+        typed = set()
+
+        def head(name: str, kind: str):
+            if name not in typed:
+                typed.add(name)
+                lines.append(f"# TYPE {name} {kind}")
+
+        with self._lock:
+            counters, gauges = sorted(self.counters.items()), sorted(self.gauges.items())
+        for (name, labels), v in counters:
+            n = METRICS_PREFIX + name
+            head(n, "counter")
+            lines.append(f"{n}{_prom_labels(labels)} {v:g}")
+        for (name, labels), v in gauges:
+            n = METRICS_PREFIX + name
+            head(n, "gauge")
+            lines.append(f"{n}{_prom_labels(labels)} {v:g}")
+        for (name, labels), s in sorted(self._summaries().items()):
+            n = METRICS_PREFIX + name
+            head(n, "summary")
+            for q in QUANTILES:
+                lines.append(f"{n}{_prom_labels(labels, ('quantile', str(q)))} {s[f'p{int(q * 100)}']:g}")
+            lines.append(f"{n}_sum{_prom_labels(labels)} {s['sum']:g}")
+            lines.append(f"{n}_count{_prom_labels(labels)} {s['count']:g}")
+        for ratio, v in self.ratios().items():
+            if v is not None:
+                n = METRICS_PREFIX + ratio
+                head(n, "gauge")
+                lines.append(f"{n} {v:g}")
+        n = METRICS_PREFIX + "last_run_timestamp_seconds"
+        head(n, "gauge")
+        lines.append(f"{n} {time.time():.0f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, today: Optional[datetime] = None, out_dir: str = METRICS_DIR,
+              textfile: Optional[str] = METRICS_TEXTFILE) -> Optional[Path]:
+        """JSON 리포트와 Prometheus textfile 저장. JSON 경로 반환."""
+        if not self.enabled:
+            return None
+        today = today or datetime.now()
+        path = Path(out_dir) / f"metrics_{today.strftime('%Y%m%d')}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), ensure_ascii=False, indent=2), encoding="utf-8")
+        if textfile:
+            prom = Path(textfile)
+            prom.parent.mkdir(parents=True, exist_ok=True)
+            tmp = prom.with_suffix(prom.suffix + ".tmp")
+            tmp.write_text(self.to_prometheus(), encoding="utf-8")
+            os.replace(tmp, prom)   # collector가 쓰다 만 파일을 읽지 않도록 원자적 교체
+        return path
+
+metrics = Metrics()
@@ -1,55 +1,116 @@
 # app/nlp.py
-import os, re
-from typing import Dict
-from dataclasses import dataclass
+import os, time
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from app.classifier import get_classifier
+from app.keywords import extract_keywords
+from app.metrics import metrics
+from app.summary_cache import get_summary_cache, content_key
 
 USE_OPENAI = bool(os.getenv("OPENAI_API_KEY"))
-if USE_OPENAI:
-    from openai import OpenAI
-    _client = OpenAI()
+_client = None   # 동기 OpenAI 클라이언트(처음 쓸 때 생성 — openai import 비용을 로컬 실행에서 피함)
+
+def _get_client():
+    global _client
+    if _client is None:
+        from openai import OpenAI
+        _client = OpenAI()
+    return _client
 
 @dataclass
 class SummaryResult:
     summary: str
     section: str
+    keywords: List[str] = field(default_factory=list)
 
 ALLOWED_SECTIONS = ["국내 물류", "글로벌 동향", "테크·자동화", "정책·규제", "라스트마일·이커머스"]
 
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+NAIVE_MODEL = "textrank"   # 로컬 요약 결과를 캐시에 저장할 때 쓰는 모델 이름
+PROMPT_VERSION = "1"    # 프롬프트/요약 로직을 바꾸면 올릴 것(이전 캐시 자동 무시)
+
 def naive_summarize(title: str, content: str, max_sent=3) -> str:
-    """아주 간단한 로컬 요약: 문장 단위로 앞부분만 2~3문장 취합."""
-    text = (title.strip() + "。 " + content.strip()).replace("\n", " ")
-    sents = re.split(r"[。.!?！？]\s*", text)
-    sents = [s for s in sents if s]
-    core = " ".join(sents[:max_sent])
-    return (core + " → 현장 적용 포인트: 핵심만 확인하세요.")
+    """로컬 추출 요약(app.summarizer, TF-IDF + TextRank). 여러 건이면 summarize_local로 한 번에."""
+    from app.summarizer import summarize   # numpy는 로컬 요약을 쓸 때만 불러옴
+    return summarize(title, content, max_sent)
 
 def classify_section(title: str, summary: str) -> str:
-    t = (title + " " + summary).lower()
-    if any(k in t for k in ["korea","대한","국내","물류센터","택배","쿠팡","cj","한진"]):
-        return "국내 물류"
-    if any(k in t for k in ["policy","법","관세","정부","규제","fta","보조금"]):
-        return "정책·규제"
-    if any(k in t for k in ["robot","automation","agv","shuttle","wms","ai","vision","테크","자동화","로봇"]):
-        return "테크·자동화"
-    if any(k in t for k in ["라스트마일","배달","배송","이커머스","commerce","last mile"]):
-        return "라스트마일·이커머스"
-    return "글로벌 동향"
-
-def summarize_and_classify(title: str, content: str) -> SummaryResult:
-    if USE_OPENAI:
-        prompt = f"""너는 물류 전문 에디터야. 한국어로 간결하고 친근하게 핵심만 3문장으로 요약해.
-        기사 제목: {title}
-        본문(요약용): {content[:3000]}
-        조건: 1) 과장 금지 2) 숫자는 그대로 3) 마지막 문장은 '업무 인사이트' 1줄로 마무리
-        출력:"""
-        res = _client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role":"system","content":"한국어로 답변해."},
-                      {"role":"user","content":prompt}],
-            temperature=0.2,
-        )
-        summary = res.choices[0].message.content.strip()
+    """config/sections.yaml 규칙으로 섹션 분류(가중치 합이 가장 큰 섹션)."""
+    return get_classifier().classify(title + " " + summary)
+
+def classify_sections(pairs: List[Tuple[str, str]]) -> List[str]:
+    """(제목, 요약) 여러 건을 한 번에 분류."""
+    return get_classifier().classify_batch([t + " " + s for t, s in pairs])
+
+def summarize_local(articles: List[Tuple[str, str]]) -> List[SummaryResult]:
+    """(제목, 본문) 묶음을 로컬 요약 + 분류 + 키워드.
+
+    요약/섹션은 요약 캐시(NAIVE_MODEL)에 있으면 그대로 쓰고, 나머지만 한 묶음으로 요약해(어휘/IDF 공유) 저장한다.
+    키워드는 캐시와 관계없이 묶음 전체에서 추출.
+    """
+    cache = get_summary_cache()
+    results: List[Optional[SummaryResult]] = [None] * len(articles)
+    keys: List[str] = []
+    if cache:
+        keys = [content_key(t, c) for t, c in articles]
+        hits = cache.get_many(keys, PROMPT_VERSION, NAIVE_MODEL)
+        for i, k in enumerate(keys):
+            if (hit := hits.get(k)) is not None:
+                results[i] = SummaryResult(summary=hit[0], section=hit[1])
+    if todo := [i for i, r in enumerate(results) if r is None]:
+        from app.summarizer import summarize_batch
+        batch = [articles[i] for i in todo]
+        summaries = summarize_batch(batch)
+        sections = classify_sections([(t, s) for (t, _), s in zip(batch, summaries)])
+        for i, s, sec in zip(todo, summaries, sections):
+            results[i] = SummaryResult(summary=s, section=sec)
+        if cache:
+            cache.put_many([(keys[i], results[i].summary, results[i].section) for i in todo], PROMPT_VERSION, NAIVE_MODEL)
+    for res, kw in zip(results, extract_keywords(articles)):
+        res.keywords = kw
+    return results
+
+SYSTEM_PROMPT = "한국어로 답변해."
+
+def build_prompt(title: str, content: str) -> str:
+    return f"""너는 물류 전문 에디터야. 한국어로 간결하고 친근하게 핵심만 3문장으로 요약해.
+    기사 제목: {title}
+    본문(요약용): {content[:3000]}
+    조건: 1) 과장 금지 2) 숫자는 그대로 3) 마지막 문장은 '업무 인사이트' 1줄로 마무리
+    출력:"""
+
+def llm_summarize(title: str, content: str) -> str:
+    t0 = time.perf_counter()
+    res = _get_client().chat.completions.create(
+        model=OPENAI_MODEL,
+        messages=[{"role":"system","content":SYSTEM_PROMPT},
+                  {"role":"user","content":build_prompt(title, content)}],
+        temperature=0.2,
+    )
+    metrics.observe("llm_seconds", time.perf_counter() - t0, model=OPENAI_MODEL)
+    metrics.inc("llm_requests_total", model=OPENAI_MODEL, result="ok")
+    if res.usage is not None:
+        metrics.inc("llm_tokens_total", res.usage.prompt_tokens, model=OPENAI_MODEL, kind="prompt")
+        metrics.inc("llm_tokens_total", res.usage.completion_tokens, model=OPENAI_MODEL, kind="completion")
+    return res.choices[0].message.content.strip()
+
+def summarize_and_classify(title: str, content: str, use_openai: Optional[bool] = None) -> SummaryResult:
+    """요약 + 섹션 분류. 같은 기사(정규화한 제목+본문)·프롬프트·모델 조합은 캐시에서 반환.
+
+    use_openai=False면 키가 있어도 로컬 요약을 사용(벤치마크 비교용).
+    """
+    use_openai = USE_OPENAI if use_openai is None else (use_openai and USE_OPENAI)
+    model = OPENAI_MODEL if use_openai else NAIVE_MODEL
+    cache = get_summary_cache()
+    key = content_key(title, content) if cache else None
+    if cache and (hit := cache.get(key, PROMPT_VERSION, model)):
+        return SummaryResult(summary=hit[0], section=hit[1])
+    if use_openai:
+        summary = llm_summarize(title, content)
     else:
         summary = naive_summarize(title, content)
     section = classify_section(title, summary)
+    if cache:
+        cache.put(key, PROMPT_VERSION, model, summary, section)
     return SummaryResult(summary=summary, section=section)
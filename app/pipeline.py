@@ -0,0 +1,295 @@
+# app/pipeline.py
+"""스트리밍 파이프라인: fetch → parse → dedup → enrich → rank(sink).
+
+각 단계는 asyncio 작업이고 단계 사이는 크기가 정해진 큐(PIPELINE_QUEUE_SIZE)로
+연결된다. 가장 느린 소스의 수집이 끝나기 전에도 먼저 파싱된 기사부터 중복 제거와
+요약이 진행되고, 큐가 차면 앞 단계가 기다리므로 메모리 사용량이 일정하게 유지된다.
+요약이 끝난 기사는 본문(content)을 떼어내고 정렬 단계로 넘긴다.
+로컬 요약은 작업자 하나가 큰 묶음(PIPELINE_LOCAL_BATCH)으로 처리해 묶음 전체가 어휘/IDF를 공유하고,
+ENRICH_TOP_ONLY=1이면 로컬 요약으로 정렬한 뒤 실릴 기사만 LLM으로 다시 요약한다.
+DATABASE_URL이 설정돼 있으면 정렬 단계에서 기사/요약을 STORAGE_CHUNK개씩 묶어 저장한 뒤 본문을 뗀다.
+요약이 끝난 기사(제목/요약/키워드)는 실행이 끝날 때 검색 색인(app.search_index)에 세그먼트 하나로 추가한다.
+"""
+import asyncio, contextlib, os, time
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.article import Article
+from app.async_crawler import AsyncCrawler
+from app.crawl_state import get_crawl_state
+from app.crawler import (
+    parse_rss, parse_list_page, parse_article_detail_timed, get_parse_pool, list_fields, merge_detail, detail_selectors,
+)
+from app.dedup import StreamingDedup
+from app.enrich import Enricher, ENRICH_TOP_ONLY
+from app.metrics import metrics
+from app.nlp import SummaryResult, summarize_local
+from app.rank import RankEngine, preselect
+from app.search_index import SearchIndex, get_search_index
+from app.storage import Storage, get_storage, STORAGE_CHUNK
+
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+PIPELINE_PARSE_WORKERS = int(os.getenv("PIPELINE_PARSE_WORKERS", "2"))
+PIPELINE_ENRICH_WORKERS = int(os.getenv("PIPELINE_ENRICH_WORKERS", "8"))
+PIPELINE_ENRICH_BATCH = int(os.getenv("PIPELINE_ENRICH_BATCH", "8"))  # 요약 단계에서 한 번에 묶는 기사 수
+PIPELINE_LOCAL_BATCH = int(os.getenv("PIPELINE_LOCAL_BATCH", "512"))  # 로컬 요약 묶음 크기
+
+_DONE = None  # 단계 종료 표시
+
+async def _close(q: asyncio.Queue, consumers: int):
+    for _ in range(consumers):
+        await q.put(_DONE)
+
+class Pipeline:
+    def __init__(self, sources: List[Dict[str, Any]], queue_size: int = PIPELINE_QUEUE_SIZE,
+                 parse_workers: int = PIPELINE_PARSE_WORKERS, enrich_workers: int = PIPELINE_ENRICH_WORKERS,
+                 enrich_batch: int = PIPELINE_ENRICH_BATCH, enricher: Optional[Enricher] = None,
+                 ranker: Optional[RankEngine] = None, storage: Optional[Storage] = None,
+                 top_only: bool = ENRICH_TOP_ONLY, crawler: Optional[AsyncCrawler] = None,
+                 index: Optional[SearchIndex] = None):
+        self.sources = sources
+        self.queue_size = queue_size
+        self.parse_workers = max(1, parse_workers)
+        self.enrich_workers = max(1, enrich_workers)
+        self.enrich_batch = max(1, enrich_batch)
+        self.enricher = enricher or Enricher()
+        self.final_enricher: Optional[Enricher] = None
+        if top_only and self.enricher.use_openai:
+            self.final_enricher, self.enricher = self.enricher, Enricher(use_openai=False)
+        if not self.enricher.use_openai:
+            # 로컬 요약은 CPU 작업이라 작업자 하나가 큰 묶음으로 처리
+            self.enrich_workers, self.enrich_batch = 1, max(self.enrich_batch, PIPELINE_LOCAL_BATCH)
+        self.dedup = StreamingDedup()
+        self.ranker = ranker or RankEngine.from_config()
+        self.storage = storage if storage is not None else get_storage()
+        self.index = index if index is not None else get_search_index()
+        self.crawler = crawler   # 이미 열린 크롤러(데몬이 커넥션 풀을 유지)를 주면 닫지 않고 그대로 사용
+
+    # --- fetch: 목록/RSS/상세 페이지 다운로드 -------------------------------------
+    async def _fetch_detail(self, crawler: AsyncCrawler, it: Article, cfg: Dict[str, Any],
+                            out: asyncio.Queue, max_bytes: Optional[int] = None):
+        state = get_crawl_state()
+        if state and (known := state.lookup(it["url"])) is not None:
+            merge_detail(it, known)
+            await out.put(("item", it))
+            return
+        try:
+            html = await crawler.fetch_html(it["url"], it["source_name"], detail_selectors(cfg), max_bytes)
+        except Exception as e:
+            print(f"[WARN] {it['url']}: 상세 수집 실패 - {e}")
+            return
+        await out.put(("detail", it, cfg, html))
+
+    async def _fetch_source(self, crawler: AsyncCrawler, src: Dict[str, Any], out: asyncio.Queue):
+        try:
+            if src.get("method") == "rss" and src.get("rss_url"):
+                body, _ = await crawler.fetch(src["rss_url"], src["name"], max_bytes=src.get("max_bytes"))
+                await out.put(("rss", src, body))
+            elif src.get("method") == "html" and src.get("list_url"):
+                html = await crawler.fetch_html(src["list_url"], src["name"], [src["item_selector"]], src.get("max_bytes"))
+                lst = parse_list_page(html, src["base_url"], src["item_selector"], src["title_selector"],
+                                      src["link_selector"], list_fields(src), src["name"])
+                cfg = src.get("detail", {})
+                # 상세 페이지는 날짜 기준/사전 순위를 통과한 후보만 받음
+                lst = preselect(lst, self.ranker, src.get("detail_top_k"), src.get("max_age_hours"), src["name"])
+                await asyncio.gather(*(self._fetch_detail(crawler, it, cfg, out, src.get("max_bytes")) for it in lst))
+        except Exception as e:
+            print(f"[WARN] {src.get('name')}: 수집 실패 - {e}")
+            metrics.inc("source_errors_total", source=src.get("name"))
+
+    # --- parse: RSS/상세 HTML → Article -----------------------------------------
+    async def _parse_worker(self, inq: asyncio.Queue, out: asyncio.Queue):
+        loop = asyncio.get_running_loop()
+        pool = get_parse_pool()
+        while (msg := await inq.get()) is not _DONE:
+            try:
+                await self._parse_one(msg, out, loop, pool)
+            except Exception as e:
+                # 작업자가 죽으면 수집 단계가 가득 찬 큐에서 멈추므로 기록만 하고 다음 메시지로
+                name = msg[1]["name"] if msg[0] == "rss" else msg[1].source_name
+                print(f"[WARN] {name}: 파싱 실패 - {e!r}")
+                metrics.inc("parse_errors_total", source=name)
+
+    async def _parse_one(self, msg: tuple, out: asyncio.Queue, loop: asyncio.AbstractEventLoop, pool):
+        kind = msg[0]
+        if kind == "item":
+            await out.put(msg[1])
+        elif kind == "rss":
+            _, src, body = msg
+            for it in await asyncio.to_thread(parse_rss, body, src["name"]):
+                await out.put(it)
+        elif kind == "detail":
+            _, it, cfg, html = msg
+            try:
+                if pool is not None:
+                    d, secs = await loop.run_in_executor(pool, parse_article_detail_timed, html, cfg, it.source_name)
+                else:
+                    d, secs = await asyncio.to_thread(parse_article_detail_timed, html, cfg, it.source_name)
+            except Exception as e:
+                print(f"[WARN] {it.url}: 파싱 실패 - {e}")
+                metrics.inc("parse_errors_total", source=it.source_name)
+                return
+            metrics.observe("parse_seconds", secs, kind="detail")
+            if state := get_crawl_state():
+                state.record(it.url, d)
+            merge_detail(it, d)
+            await out.put(it)
+
+    # --- dedup: 정규화 URL + SimHash(묶음별 조회수 → 본문 길이가 가장 나은 기사가 대표) ---
+    async def _dedup_stage(self, inq: asyncio.Queue, out: asyncio.Queue):
+        # 다음 단계로는 (묶음 표식, 기사)를 보냄. 더 나은 기사가 나중에 오면 정렬 단계에서 이전 대표를 교체
+        while (it := await inq.get()) is not _DONE:
+            if (tag := self.dedup.offer(it)) is None:
+                metrics.inc("dedup_dropped_total", source=it.source_name)
+            else:
+                await out.put((tag, it))
+        await _close(out, self.enrich_workers)
+
+    # --- enrich: 요약/섹션(작은 묶음 단위로 Enricher에 전달) -------------------------
+    async def _enrich_worker(self, inq: asyncio.Queue, out: asyncio.Queue):
+        done = False
+        while not done:
+            batch = []
+            it = await inq.get()
+            while it is not _DONE:
+                batch.append(it)
+                # LLM은 지연을 줄이려 큐가 비면 바로 보내고, 로컬 요약은 묶음이 찰 때까지 모음
+                if len(batch) >= self.enrich_batch or (inq.empty() and self.enricher.use_openai):
+                    break
+                it = await inq.get()
+            done = it is _DONE
+            if not batch:
+                continue
+            results = await self._summarize([(b.title.strip(), (b.content or "").strip()) for _, b in batch])
+            if results is None:
+                continue
+            for (tag, b), res in zip(batch, results):
+                b.summary = res.summary
+                b.section = res.section
+                b.keywords = res.keywords
+                # 정렬용 타임스탬프
+                b.published_at_ts = int(b.published_at.timestamp()) if b.published_at else 0
+                if self.storage is None and self.final_enricher is None:
+                    b.release_content()  # 요약 후에는 본문이 필요 없음(저장/LLM 재요약 시에는 그 후 제거)
+                await out.put((tag, b))
+
+    async def _summarize(self, articles: List[Tuple[str, str]]) -> Optional[List[SummaryResult]]:
+        """묶음 요약. 예상 못 한 오류면 로컬 요약으로 대체하고, 그것도 실패하면 None(묶음을 버리고 계속)."""
+        try:
+            return await self.enricher.enrich(articles)
+        except Exception as e:
+            print(f"[WARN] 요약 실패({len(articles)}건) - {e!r}")
+            metrics.inc("enrich_errors_total")
+        if self.enricher.use_openai:
+            try:
+                results = await asyncio.to_thread(summarize_local, articles)
+                self.enricher.fallbacks += len(articles)
+                return results
+            except Exception as e:
+                print(f"[WARN] 로컬 요약도 실패({len(articles)}건) - {e!r}")
+        return None
+
+    # --- rank sink: 섹션별 상위 N개만 유지(+ 묶음 저장) ---------------------------------
+    async def _flush(self, buf: List[Article]):
+        try:
+            await asyncio.to_thread(self.storage.save_articles, buf)
+        except Exception as e:
+            print(f"[WARN] 기사 저장 실패({len(buf)}건) - {e}")
+        if self.final_enricher is None:
+            for it in buf:
+                it.release_content()
+        buf.clear()
+
+    async def _refine(self, sections: List[Dict[str, Any]]):
+        """ENRICH_TOP_ONLY: 실릴 기사만 LLM으로 다시 요약(섹션/순서는 로컬 요약 기준 그대로)."""
+        picked = [it for sec in sections for it in sec["items"]]
+        results = await self.final_enricher.enrich(
+            [(it.title.strip(), (it.content or "").strip()) for it in picked]
+        )
+        for it, res in zip(picked, results):
+            it.summary = res.summary
+            it.release_content()
+        if self.storage is not None and picked:
+            try:
+                await asyncio.to_thread(self.storage.upsert_enrich, picked)
+            except Exception as e:
+                print(f"[WARN] 요약 저장 실패({len(picked)}건) - {e}")
+
+    async def _rank_sink(self, inq: asyncio.Queue):
+        buf: List[Article] = []
+        while (msg := await inq.get()) is not _DONE:
+            tag, it = msg
+            if not self.dedup.is_current(tag):
+                continue   # 요약 중에 같은 묶음의 더 나은 기사가 들어옴(dedup_replaced_total로 집계됨)
+            self.ranker.add(it, group=tag[0])
+            if self.index is not None:
+                self.index.add(it)
+            if self.storage is not None:
+                buf.append(it)
+                if len(buf) >= STORAGE_CHUNK:
+                    await self._flush(buf)
+        if buf:
+            await self._flush(buf)
+
+    async def run(self) -> List[Dict[str, Any]]:
+        """파이프라인 실행. render_newsletter가 받는 섹션 리스트를 반환.
+
+        단계는 겹쳐 실행되므로 stage_seconds{stage=...}는 실행 시작부터 그 단계가 끝날 때까지의 시간이다.
+        """
+        size = self.queue_size
+        fetch_q, parse_q, enrich_q, rank_q = (asyncio.Queue(size) for _ in range(4))
+        t0 = time.perf_counter()
+
+        def done(stage: str):
+            metrics.observe("stage_seconds", time.perf_counter() - t0, stage=stage)
+
+        async with (contextlib.nullcontext(self.crawler) if self.crawler else AsyncCrawler()) as crawler:
+            parsers = [asyncio.create_task(self._parse_worker(fetch_q, parse_q)) for _ in range(self.parse_workers)]
+            deduper = asyncio.create_task(self._dedup_stage(parse_q, enrich_q))
+            enrichers = [asyncio.create_task(self._enrich_worker(enrich_q, rank_q)) for _ in range(self.enrich_workers)]
+            sink = asyncio.create_task(self._rank_sink(rank_q))
+
+            async def drive():
+                await asyncio.gather(*(self._fetch_source(crawler, s, fetch_q) for s in self.sources))
+                done("fetch")
+                await _close(fetch_q, self.parse_workers)
+                await asyncio.gather(*parsers)
+                done("parse")
+                await _close(parse_q, 1)
+                await deduper
+                done("dedup")
+                await asyncio.gather(*enrichers)
+                done("enrich")
+                await _close(rank_q, 1)
+                await sink
+                done("rank")
+
+            # 한 단계가 예외로 끝나면 앞 단계는 가득 찬 큐에서 영원히 기다리므로, 모두 함께 기다리다
+            # 처음 실패한 작업의 예외로 나머지를 취소하고 실행을 실패로 끝냄
+            tasks = [asyncio.create_task(drive()), *parsers, deduper, *enrichers, sink]
+            try:
+                await asyncio.gather(*tasks)
+            except BaseException:
+                for t in tasks:
+                    t.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        if state := get_crawl_state():
+            state.prune()
+        sections = self.ranker.sections()
+        if self.final_enricher is not None:
+            with metrics.timer("stage_seconds", stage="refine"):
+                await self._refine(sections)
+        if self.index is not None:
+            try:
+                await asyncio.to_thread(self.index.commit)
+            except Exception as e:
+                print(f"[WARN] 검색 색인 갱신 실패 - {e}")
+        if fallbacks := self.enricher.fallbacks + (self.final_enricher.fallbacks if self.final_enricher else 0):
+            print(f"[WARN] 마감/오류로 로컬 요약으로 대체: {fallbacks}건")
+        return sections
+
+def run_pipeline(sources: List[Dict[str, Any]], runtime=None, **kwargs) -> List[Dict[str, Any]]:
+    """동기 코드(main)에서 호출하는 진입점. runtime(app.daemon.Runtime)을 주면 그 이벤트 루프와 크롤러를 재사용."""
+    if runtime is not None:
+        return runtime.submit(Pipeline(sources, crawler=runtime.crawler, **kwargs).run())
+    return asyncio.run(Pipeline(sources, **kwargs).run())
@@ -0,0 +1,229 @@
+# app/politeness.py
+"""호스트별 예의(politeness) 스케줄러.
+
+- robots.txt를 호스트마다 한 번 받아 디스크에 캐시(ROBOTS_TTL)하고, 막힌 URL은 요청하지 않음
+- robots.txt의 Crawl-delay(없으면 CRAWL_MIN_DELAY)만큼 같은 호스트 요청 시작 간격을 둠
+- 호스트별 동시 요청 수를 AIMD로 조절: 응답이 빠르면 조금씩(+1/창 크기) 늘리고,
+  429/503·시간 초과·지연 급증(최소 지연의 CRAWL_LATENCY_FACTOR배 초과)이면 절반으로 줄임
+- 429/503의 Retry-After(초 또는 HTTP 날짜)만큼 그 호스트 요청을 멈춤
+
+같은 호스트를 쓰는 소스(예: 물류신문 RSS/HTML)는 하나의 호스트 상태를 공유한다.
+"""
+import asyncio, json, os, threading, time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from app.metrics import metrics
+
+CRAWL_RESPECT_ROBOTS = os.getenv("CRAWL_RESPECT_ROBOTS", "1") != "0"
+ROBOTS_CACHE_PATH = os.getenv("ROBOTS_CACHE_PATH", ".cache/robots.json")
+ROBOTS_TTL = float(os.getenv("ROBOTS_TTL", str(24 * 3600)))
+ROBOTS_ERROR_TTL = 3600          # robots.txt를 못 받았을 때(5xx/연결 오류) 결과 유지 시간
+ROBOTS_AGENT = "LogiNewsBot"
+CRAWL_MIN_DELAY = float(os.getenv("CRAWL_MIN_DELAY", "0"))          # Crawl-delay가 없을 때 요청 간격(초)
+CRAWL_PER_HOST_START = float(os.getenv("CRAWL_PER_HOST_START", "2"))  # 호스트별 시작 동시 요청 수
+CRAWL_LATENCY_FACTOR = float(os.getenv("CRAWL_LATENCY_FACTOR", "3"))
+CRAWL_MAX_RETRY_AFTER = float(os.getenv("CRAWL_MAX_RETRY_AFTER", "120"))  # 이보다 길게 기다리라면 포기
+CRAWL_THROTTLE_BACKOFF = 5.0     # Retry-After 없이 429/503을 받았을 때 멈추는 시간(초)
+THROTTLE_STATUSES = (429, 503)
+
+class RobotsDisallowed(Exception):
+    """robots.txt가 막은 URL."""
+
+class HostThrottled(Exception):
+    """호스트가 CRAWL_MAX_RETRY_AFTER보다 오래 기다리라고 한 경우."""
+
+def host_of(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc.lower()}"
+
+def retry_after_seconds(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 기다릴 초."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, at - (now if now is not None else time.time()))
+
+class RobotsCache:
+    """호스트 → robots.txt 원문/상태 디스크 캐시(JSON 하나)."""
+
+    def __init__(self, path: str = ROBOTS_CACHE_PATH, ttl: float = ROBOTS_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._parsers: Dict[str, RobotFileParser] = {}
+        try:
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._data = {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self._data, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def parser(self, host: str) -> Optional[RobotFileParser]:
+        """캐시가 신선하면 파서, 아니면 None(다시 받아야 함)."""
+        with self._lock:
+            entry = self._data.get(host)
+            ttl = self.ttl if entry and entry["status"] < 500 else ROBOTS_ERROR_TTL
+            if not entry or time.time() - entry["fetched_at"] > ttl:
+                return None
+            rp = self._parsers.get(host)
+            if rp is None:
+                rp = self._parsers[host] = self._build(entry["status"], entry["body"])
+            return rp
+
+    def store(self, host: str, status: int, body: str) -> RobotFileParser:
+        rp = self._build(status, body)
+        with self._lock:
+            self._data[host] = {"status": status, "body": body, "fetched_at": time.time()}
+            self._parsers[host] = rp
+            self._save()
+        return rp
+
+    @staticmethod
+    def _build(status: int, body: str) -> RobotFileParser:
+        # RFC 9309: 4xx면 제한 없음, 5xx/연결 오류면 전부 금지로 본다
+        rp = RobotFileParser()
+        if status >= 500:
+            rp.disallow_all = True
+        elif status >= 400:
+            rp.allow_all = True
+        rp.parse(body.splitlines() if status < 400 else [])
+        return rp
+
+@dataclass
+class HostState:
+    """호스트 하나의 동시성 창(AIMD), 요청 간격, 일시 정지 상태."""
+    host: str
+    limit: float = CRAWL_PER_HOST_START
+    max_limit: float = 4
+    delay: float = CRAWL_MIN_DELAY
+    active: int = 0
+    next_start: float = 0.0
+    blocked_until: float = 0.0
+    min_latency: Optional[float] = None
+    last_decrease: float = 0.0
+    robots_applied: bool = False
+    cond: asyncio.Condition = field(default_factory=asyncio.Condition)
+
+    def _wait_time(self, now: float) -> float:
+        return max(self.blocked_until - now, self.next_start - now, 0.0)
+
+    async def acquire(self):
+        async with self.cond:
+            while True:
+                now = time.monotonic()
+                if self.blocked_until - now > CRAWL_MAX_RETRY_AFTER:
+                    raise HostThrottled(f"{self.host}: {self.blocked_until - now:.0f}초 동안 요청 중단 요청")
+                if self.active < max(1, int(self.limit)):
+                    wait = self._wait_time(now)
+                    if wait <= 0:
+                        self.active += 1
+                        self.next_start = now + self.delay
+                        return
+                    try:
+                        await asyncio.wait_for(self.cond.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await self.cond.wait()
+
+    def _decrease(self, now: float, window: float):
+        # 동시에 진행 중이던 요청들이 같은 신호를 여러 번 내므로 창 하나(≈지연 시간)에 한 번만 줄임
+        if now - self.last_decrease >= window:
+            self.limit = max(1.0, self.limit / 2)
+            self.last_decrease = now
+
+    async def release(self, status: Optional[int], latency: Optional[float], retry_after: Optional[float] = None):
+        """응답 결과로 창 크기 조절. status None은 연결 오류/시간 초과."""
+        async with self.cond:
+            self.active -= 1
+            now = time.monotonic()
+            window = latency or self.min_latency or 1.0
+            if status in THROTTLE_STATUSES or status is None:
+                self._decrease(now, window)
+                if status is not None:
+                    pause = retry_after if retry_after is not None else CRAWL_THROTTLE_BACKOFF
+                    self.blocked_until = max(self.blocked_until, now + pause)
+                metrics.inc("host_throttled_total", host=self.host, status=str(status or "error"))
+            elif latency is not None:
+                if self.min_latency is None or latency < self.min_latency:
+                    self.min_latency = latency
+                if latency > CRAWL_LATENCY_FACTOR * max(self.min_latency, 0.05):
+                    self._decrease(now, window)   # 서버가 느려지기 시작함
+                else:
+                    self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            metrics.set("host_concurrency", self.limit, host=self.host)
+            self.cond.notify_all()
+
+class PolitenessScheduler:
+    """호스트별 HostState와 robots.txt 판단을 묶은 스케줄러(AsyncCrawler가 사용)."""
+
+    def __init__(self, max_per_host: int, respect_robots: bool = CRAWL_RESPECT_ROBOTS,
+                 robots: Optional[RobotsCache] = None, min_delay: float = CRAWL_MIN_DELAY):
+        self.max_per_host = max(1, max_per_host)
+        self.respect_robots = respect_robots
+        self.robots = robots if robots is not None else (RobotsCache() if respect_robots else None)
+        self.min_delay = min_delay
+        self._hosts: Dict[str, HostState] = {}
+        self._robots_locks: Dict[str, asyncio.Lock] = {}
+
+    def host(self, url: str) -> HostState:
+        key = host_of(url)
+        st = self._hosts.get(key)
+        if st is None:
+            st = self._hosts[key] = HostState(
+                host=urlsplit(url).netloc.lower(),
+                limit=min(CRAWL_PER_HOST_START, self.max_per_host),
+                max_limit=self.max_per_host,
+                delay=self.min_delay,
+            )
+        return st
+
+    async def _robots(self, client, url: str) -> Optional[RobotFileParser]:
+        key = host_of(url)
+        lock = self._robots_locks.setdefault(key, asyncio.Lock())
+        async with lock:   # 같은 호스트의 robots.txt는 한 번만 받음
+            rp = self.robots.parser(key)
+            if rp is None:
+                try:
+                    r = await client.get(key + "/robots.txt")
+                    status, body = r.status_code, r.text if r.status_code < 400 else ""
+                except Exception:
+                    status, body = 599, ""
+                if status >= 500:
+                    print(f"[WARN] {key}/robots.txt 확인 실패({status}) - 잠시 이 호스트 수집 보류")
+                rp = self.robots.store(key, status, body)
+            st = self.host(url)
+            if not st.robots_applied:
+                st.robots_applied = True
+                delay = rp.crawl_delay(ROBOTS_AGENT)
+                rate = rp.request_rate(ROBOTS_AGENT)
+                if rate and rate.requests:
+                    delay = max(float(delay or 0), rate.seconds / rate.requests)
+                if delay:
+                    st.delay = max(self.min_delay, float(delay))
+                    st.limit = st.max_limit = 1   # 간격이 정해진 호스트는 한 번에 하나씩
+            return rp
+
+    async def check(self, client, url: str):
+        """robots.txt가 막은 URL이면 RobotsDisallowed."""
+        if not self.respect_robots:
+            return
+        rp = await self._robots(client, url)
+        if not rp.can_fetch(ROBOTS_AGENT, url):
+            metrics.inc("robots_blocked_total", host=urlsplit(url).netloc.lower())
+            raise RobotsDisallowed(f"robots.txt가 금지한 URL: {url}")
@@ -1,11 +1,186 @@
 # app/rank.py
+import heapq, itertools, os, time
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Optional, Tuple
 
-def sort_articles(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+import yaml
+
+from app.article import Article
+from app.metrics import metrics
+
+RANKING_PATH = os.getenv("RANKING_PATH", "config/ranking.yaml")
+DETAIL_TOP_K = int(os.getenv("DETAIL_TOP_K", "0"))                  # 0이면 섹션 수 × top_n × 2, 음수면 제한 없음
+DETAIL_MAX_AGE_HOURS = float(os.getenv("DETAIL_MAX_AGE_HOURS", "48"))  # 0이면 날짜로 거르지 않음
+DEFAULT_SECTION_ORDER = ["국내 물류","글로벌 동향","테크·자동화","정책·규제","라스트마일·이커머스"]
+
+def sort_articles(items: List[Article]) -> List[Article]:
     """조회수 우선, 동률이면 최신순."""
     def key(a):
-        views = a.get("view_count") or 0
-        ts = a.get("published_at_ts") or 0
+        views = a.view_count or 0
+        ts = a.published_at_ts or 0
         return (-views, -ts)
     return sorted(items, key=key)
+
+def group_by_section(items: List[Article]) -> List[Dict[str, Any]]:
+    groups: Dict[str, List[Article]] = {}
+    for it in items:
+        sec = it.section or "기타"
+        groups.setdefault(sec, []).append(it)
+    # 섹션 순서
+    order = DEFAULT_SECTION_ORDER
+    ordered_sections = []
+    for name in order:
+        if name in groups:
+            ordered_sections.append({"name": name, "items": groups[name]})
+    # 기타 섹션 뒤에
+    for name, arr in groups.items():
+        if name not in order:
+            ordered_sections.append({"name": name, "items": arr})
+    return ordered_sections
+
+# --- 섹션별 상위 N개 랭킹 엔진 ----------------------------------------------------
+# 점수 함수: (기사, 엔진) → 비교 가능한 값(클수록 상위). SCORERS에 등록해 config에서 이름으로 선택
+
+Scorer = Callable[[Article, "RankEngine"], Any]
+SCORERS: Dict[str, Scorer] = {}
+
+def register_scorer(name: str):
+    def deco(fn: Scorer) -> Scorer:
+        SCORERS[name] = fn
+        return fn
+    return deco
+
+@register_scorer("views")
+def score_views(a: Article, engine: "RankEngine") -> Tuple[float, float]:
+    """조회수 우선, 동률이면 최신순(sort_articles와 같은 순서)."""
+    return (a.view_count or 0, a.published_at_ts or 0)
+
+@register_scorer("freshness")
+def score_freshness(a: Article, engine: "RankEngine") -> float:
+    return a.published_at_ts or 0
+
+@register_scorer("views_decay")
+def score_views_decay(a: Article, engine: "RankEngine") -> float:
+    """조회수 × 0.5^(경과시간/반감기) × 소스 가중치. 조회수가 없으면 fallback_views 사용."""
+    views = a.view_count
+    if views is None:
+        views = engine.fallback_views
+    ts = a.published_at_ts or 0
+    age_h = max(0.0, (engine.now - ts) / 3600) if ts else engine.half_life_hours * 4
+    decay = 0.5 ** (age_h / engine.half_life_hours) if engine.half_life_hours > 0 else 1.0
+    return views * decay * engine.source_weights.get(a.source_name, 1.0)
+
+class RankEngine:
+    """한 번 훑으면서 섹션별로 크기 N인 힙만 유지하는 랭킹 엔진.
+
+    add()로 기사를 하나씩 넣고 sections()로 render_newsletter가 받는
+    [{"name": 섹션, "items": [...]}] 형태를 얻는다. add(group=...)에 중복 묶음 번호를 주면
+    같은 묶음의 이전 기사를 빼고 새 기사로 바꾼다(나중에 더 나은 대표가 온 경우).
+    """
+
+    def __init__(self, top_n: int = 5, section_order: Optional[List[str]] = None, scorer: str = "views_decay",
+                 source_weights: Optional[Dict[str, float]] = None, half_life_hours: float = 24,
+                 fallback_views: float = 100, now: Optional[float] = None):
+        if scorer not in SCORERS:
+            raise ValueError(f"알 수 없는 scorer: {scorer} (가능: {', '.join(SCORERS)})")
+        self.top_n = top_n
+        self.section_order = section_order or DEFAULT_SECTION_ORDER
+        self.scorer = SCORERS[scorer]
+        self.source_weights = source_weights or {}
+        self.half_life_hours = half_life_hours
+        self.fallback_views = fallback_views
+        self.now = now if now is not None else time.time()
+        self._heaps: Dict[str, List[Tuple[Any, int, Article, Any]]] = {}
+        self._groups: Dict[Any, Tuple[Any, int, Article, Any]] = {}   # 묶음 번호 → 힙에 있는 항목
+        self._seq = itertools.count()
+        self.seen = 0
+
+    @classmethod
+    def from_config(cls, path: str = RANKING_PATH, **overrides) -> "RankEngine":
+        cfg: Dict[str, Any] = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                cfg = yaml.safe_load(f) or {}
+        if os.getenv("TOP_N_PER_SECTION"):
+            cfg["top_n"] = int(os.getenv("TOP_N_PER_SECTION"))
+        cfg.update(overrides)
+        return cls(
+            top_n=int(cfg.get("top_n", 5)),
+            section_order=cfg.get("section_order"),
+            scorer=cfg.get("scorer", "views_decay"),
+            source_weights={k: float(v) for k, v in (cfg.get("source_weights") or {}).items()},
+            half_life_hours=float(cfg.get("half_life_hours", 24)),
+            fallback_views=float(cfg.get("fallback_views", 100)),
+            now=cfg.get("now"),
+        )
+
+    def add(self, item: Article, group: Any = None):
+        # 점수가 같으면 먼저 들어온 기사가 위(=힙에서 나중에 밀려남)
+        if group is not None and (old := self._groups.pop(group, None)) is not None:
+            # 이전 대표가 아직 힙에 있으면 뺌. 빈 자리는 이미 밀려난 기사로 채우지 않음(교체는 드묾)
+            heap = self._heaps[old[2].section or "기타"]
+            heap.remove(old)
+            heapq.heapify(heap)
+            self.seen -= 1
+        self.seen += 1
+        entry = (self.scorer(item, self), -next(self._seq), item, group)
+        heap = self._heaps.setdefault(item.section or "기타", [])
+        if self.top_n <= 0 or len(heap) < self.top_n:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            evicted = heapq.heapreplace(heap, entry)
+            if evicted[3] is not None:
+                self._groups.pop(evicted[3], None)
+        else:
+            return
+        if group is not None:
+            self._groups[group] = entry
+
+    def extend(self, items: List[Article]):
+        for it in items:
+            self.add(it)
+
+    def sections(self) -> List[Dict[str, Any]]:
+        names = [n for n in self.section_order if self._heaps.get(n)]
+        names += [n for n in self._heaps if n not in self.section_order and self._heaps[n]]
+        metrics.set("rank_candidates", self.seen)
+        for n in names:
+            metrics.set("rank_selected", len(self._heaps[n]), section=n)
+        return [
+            {"name": n, "items": [e[2] for e in sorted(self._heaps[n], key=lambda e: e[:2], reverse=True)]}
+            for n in names
+        ]
+
+def preselect(items: List[Article], engine: RankEngine, top_k: Optional[int] = None,
+              max_age_hours: Optional[float] = None, source: Optional[str] = None) -> List[Article]:
+    """상세 페이지를 받기 전에 목록 단계 필드(조회수/날짜)로 후보를 줄임.
+
+    max_age_hours보다 오래된 기사는 빼고, 남은 기사 중 엔진 점수 상위 top_k개만 목록 순서대로 반환한다.
+    날짜/조회수가 없는 필드는 점수 함수의 기본값(fallback_views 등)으로 계산하므로
+    목록 필드가 없는 소스는 목록 앞쪽(보통 최신) top_k개가 남는다.
+    """
+    if top_k is None:
+        top_k = DETAIL_TOP_K or max(1, engine.top_n) * len(engine.section_order) * 2
+    if engine.top_n <= 0:
+        top_k = -1   # 섹션별 전부를 싣는 설정이면 미리 자르지 않음
+    max_age = DETAIL_MAX_AGE_HOURS if max_age_hours is None else max_age_hours
+    scored = []
+    for i, it in enumerate(items):
+        ts = it.published_at.timestamp() if it.published_at else 0
+        if max_age > 0 and ts and engine.now - ts > max_age * 3600:
+            metrics.inc("detail_skipped_total", source=source or it.source_name, reason="too_old")
+            continue
+        it.published_at_ts = int(ts)   # 요약 단계에서 다시 채우는 값과 같음
+        scored.append((engine.scorer(it, engine), -i, it))
+    if 0 <= top_k < len(scored):
+        metrics.inc("detail_skipped_total", len(scored) - top_k, source=source or items[0].source_name,
+                    reason="below_top_k")
+        keep = heapq.nlargest(top_k, scored, key=lambda e: e[:2])
+        scored = sorted(keep, key=lambda e: -e[1])
+    return [e[2] for e in scored]
+
+def rank_sections(items: List[Article], **overrides) -> List[Dict[str, Any]]:
+    """config/ranking.yaml 설정으로 섹션별 상위 N개를 골라 섹션 리스트로 반환."""
+    engine = RankEngine.from_config(**overrides)
+    engine.extend(items)
+    return engine.sections()
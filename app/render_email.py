@@ -1,14 +1,100 @@
 # app/render_email.py
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import os
 from datetime import datetime
-from typing import Dict, List
-
-def render_newsletter(app_name: str, sections: List[Dict], today: datetime) -> (str, str):
-    env = Environment(
-        loader=FileSystemLoader("templates"),
-        autoescape=select_autoescape(["html"]),
-    )
-    template = env.get_template("newsletter.html")
-    subject = f"[{app_name}] 오늘의 물류 브리핑 ({today.strftime('%m/%d')})"
-    html = template.render(subject=subject, app_name=app_name, sections=sections)
-    return html, subject
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from app.metrics import metrics
+
+if TYPE_CHECKING:
+    from jinja2 import Template
+
+TEMPLATES_DIR = os.getenv("TEMPLATES_DIR", "templates")
+JINJA_CACHE_DIR = os.getenv("JINJA_CACHE_DIR", ".cache/jinja")
+NEWSLETTER_TEMPLATE = "newsletter.html"
+
+def filter_sections(sections: List[Dict], include: Optional[Iterable[str]] = None,
+                    top_n: Optional[int] = None) -> List[Dict]:
+    """섹션 목록에서 include에 있는 섹션만, 섹션마다 상위 top_n개만 남긴 사본."""
+    allowed = set(include) if include is not None else None
+    out = []
+    for sec in sections:
+        if allowed is not None and sec["name"] not in allowed:
+            continue
+        items = sec["items"][:top_n] if top_n else sec["items"]
+        if items:
+            out.append({"name": sec["name"], "items": items})
+    return out
+
+class Renderer:
+    """Jinja2 환경/컴파일된 템플릿을 재사용하는 렌더러.
+
+    컴파일 결과는 FileSystemBytecodeCache(JINJA_CACHE_DIR)에 저장돼
+    다음 실행에서도 템플릿을 다시 컴파일하지 않는다.
+    """
+
+    def __init__(self, templates_dir: str = TEMPLATES_DIR, cache_dir: Optional[str] = JINJA_CACHE_DIR):
+        from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
+        bytecode_cache = None
+        if cache_dir:
+            Path(cache_dir).mkdir(parents=True, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(cache_dir)
+        self.env = Environment(
+            loader=FileSystemLoader(templates_dir),
+            autoescape=select_autoescape(["html"]),
+            bytecode_cache=bytecode_cache,
+        )
+        self._templates: Dict[str, "Template"] = {}
+
+    def template(self, name: str = NEWSLETTER_TEMPLATE) -> "Template":
+        tpl = self._templates.get(name)
+        if tpl is None:
+            tpl = self._templates[name] = self.env.get_template(name)
+        return tpl
+
+    def precompile(self):
+        """templates 폴더의 템플릿을 미리 컴파일(시작 시 1회)."""
+        for name in self.env.list_templates(extensions=["html"]):
+            self.template(name)
+
+    @staticmethod
+    def subject(app_name: str, today: datetime) -> str:
+        return f"[{app_name}] 오늘의 물류 브리핑 ({today.strftime('%m/%d')})"
+
+    def render(self, app_name: str, sections: List[Dict], today: datetime, **extra) -> Tuple[str, str]:
+        subject = self.subject(app_name, today)
+        with metrics.timer("render_seconds"):
+            html = self.template().render(subject=subject, app_name=app_name, sections=sections, **extra)
+        metrics.inc("render_bytes_total", len(html))
+        return html, subject
+
+    def stream(self, out: IO[str], app_name: str, sections: List[Dict], today: datetime, **extra) -> str:
+        """전체 문자열을 만들지 않고 generate() 조각을 out에 바로 쓴다. 제목 반환."""
+        subject = self.subject(app_name, today)
+        for chunk in self.template().generate(subject=subject, app_name=app_name, sections=sections, **extra):
+            out.write(chunk)
+        return subject
+
+    def render_variants(self, app_name: str, sections: List[Dict], today: datetime,
+                        variants: Iterable[Dict[str, Any]]) -> Iterator[Tuple[Dict[str, Any], str]]:
+        """컴파일된 템플릿 하나로 여러 변형(인사말, 섹션 필터, 섹션별 개수)을 렌더.
+
+        variant 키: greeting, sections(포함할 섹션 이름들, 없으면 전체), top_n
+        """
+        for v in variants:
+            secs = filter_sections(sections, v.get("sections"), v.get("top_n"))
+            html, _ = self.render(app_name, secs, today, greeting=v.get("greeting"))
+            yield v, html
+
+_renderer: Optional[Renderer] = None
+
+def get_renderer() -> Renderer:
+    """공용 렌더러(처음 호출 시 템플릿 미리 컴파일)."""
+    global _renderer
+    if _renderer is None:
+        _renderer = Renderer()
+        _renderer.precompile()
+    return _renderer
+
+def render_newsletter(app_name: str, sections: List[Dict], today: datetime, greeting: Optional[str] = None) -> (str, str):
+    return get_renderer().render(app_name, sections, today, greeting=greeting)
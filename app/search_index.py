@@ -0,0 +1,403 @@
+# app/search_index.py
+"""지난 기사 검색용 로컬 역색인.
+
+제목·키워드·요약(본문은 넣지 않음)을 app.summarizer.tokenize(한글 글자 2-gram + 영문/숫자 단어)로
+색인한다. 저장은 SQLite 한 파일(SEARCH_INDEX_PATH):
+- docs     : 기사 한 건당 한 행(doc_id는 계속 증가). 같은 URL을 다시 색인하면 새 doc_id로 바꾸고
+             옛 doc_id는 deleted에 적어 검색에서 뺀다
+- postings : (단어, 세그먼트) → 압축 포스팅 목록. doc_id 차이값(uint32)과 BM25 가중치(uint16, ×1000)를
+             이어 붙여 zlib으로 압축. 가중치는 색인 시점의 평균 문서 길이로 미리 계산(제목 ×3, 키워드 ×2)
+실행마다 새 기사를 세그먼트 하나로 추가하고, 세그먼트가 SEARCH_MAX_SEGMENTS개를 넘으면
+가장 오래된(큰) 세그먼트를 뺀 나머지를 하나로 합친다. 합친 크기가 첫 세그먼트보다 커지면 전부 합친다.
+
+검색은 질의 단어별로 포스팅을 풀어 doc_id 크기의 점수 배열에 더하고(bincount), 질의 단어의
+SEARCH_MIN_MATCH 비율 이상을 포함한 기사만 점수순으로 돌려준다.
+
+    python -m app.search_index search "풀필먼트 로봇" --since 2025-07-01 [--section 테크·자동화] [-k 20]
+    python -m app.search_index stats|optimize
+    python -m app.search_index import        # DATABASE_URL에 저장된 기사로 색인 채우기
+끄려면 SEARCH_INDEX=0. 재생 모드(--replay)에서는 색인을 갱신하지 않는다.
+"""
+import argparse, json, math, os, sqlite3, sys, threading, time, zlib
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.archive import get_replay
+from app.dates import KST
+from app.metrics import metrics
+from app.summarizer import tokenize
+
+SEARCH_INDEX_ENABLED = os.getenv("SEARCH_INDEX", "1") != "0"
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "index/search.sqlite")
+SEARCH_MAX_SEGMENTS = int(os.getenv("SEARCH_MAX_SEGMENTS", "16"))
+SEARCH_MIN_MATCH = float(os.getenv("SEARCH_MIN_MATCH", "0.6"))   # 질의 단어 중 이 비율 이상 포함해야 결과
+FIELD_WEIGHTS = (("title", 3), ("keywords", 2), ("summary", 1))
+BM25_K1 = 1.2
+BM25_B = 0.75
+IMPACT_SCALE = 1000
+
+_SCHEMA = """
+create table if not exists docs (
+  doc_id integer primary key autoincrement,
+  url text unique not null,
+  title text not null,
+  summary text,
+  keywords text,
+  section text,
+  source text,
+  published_at text,
+  length integer not null,
+  indexed_at real not null
+);
+create index if not exists docs_published on docs (published_at);
+create table if not exists postings (
+  term text not null,
+  seg integer not null,
+  n integer not null,
+  data blob not null,
+  primary key (term, seg)
+) without rowid;
+create table if not exists segments (seg integer primary key, docs integer not null, created_at real not null);
+create table if not exists deleted (doc_id integer primary key);
+create table if not exists meta (key text primary key, value real not null);
+"""
+
+def _encode(ids: np.ndarray, impacts: np.ndarray) -> bytes:
+    deltas = np.diff(ids, prepend=0).astype(np.uint32)
+    return zlib.compress(deltas.tobytes() + impacts.astype(np.uint16).tobytes())
+
+def _decode(n: int, data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+    raw = zlib.decompress(data)
+    ids = np.cumsum(np.frombuffer(raw, np.uint32, n), dtype=np.int64)
+    return ids, np.frombuffer(raw, np.uint16, n, offset=4 * n)
+
+def _query_groups(query: str) -> List[List[str]]:
+    """질의 → 단어별 색인어 묶음(중복 단어 제거)."""
+    groups, seen = [], set()
+    for word in query.split():
+        terms = list(dict.fromkeys(tokenize(word)))
+        key = tuple(terms)
+        if terms and key not in seen:
+            seen.add(key)
+            groups.append(terms)
+    return groups
+
+def _ranked_chunks(ids: np.ndarray, scores: np.ndarray, step: int) -> Iterable[List[int]]:
+    """점수 내림차순 doc_id를 step개씩. 첫 묶음은 부분 정렬로만 구함(보통 여기서 끝남)."""
+    if len(ids) > step:
+        top = np.argpartition(-scores, step - 1)[:step]
+        top = top[np.lexsort((ids[top], -scores[top]))]
+        yield ids[top].tolist()
+        rest = np.ones(len(ids), dtype=bool)
+        rest[top] = False
+        ids, scores = ids[rest], scores[rest]
+    order = np.lexsort((ids, -scores))
+    for i in range(0, len(order), step):
+        yield ids[order[i:i + step]].tolist()
+
+@dataclass
+class Hit:
+    score: float
+    url: str
+    title: str
+    summary: str
+    keywords: List[str]
+    section: str
+    source: Optional[str]
+    published_at: Optional[str]
+
+class SearchIndex:
+    def __init__(self, path: str = SEARCH_INDEX_PATH, max_segments: int = SEARCH_MAX_SEGMENTS):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_segments = max(2, max_segments)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._pending: List[Dict[str, Any]] = []
+
+    # --- 색인 ------------------------------------------------------------------
+    def _meta(self, key: str, default: float = 0.0) -> float:
+        row = self._db.execute("select value from meta where key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def add(self, item: Dict[str, Any]):
+        """이번 실행의 색인 대상에 추가(commit 때 기록). 요약이 나중에 바뀌어도 commit 시점 값을 쓴다."""
+        if item.get("url"):
+            self._pending.append(item)
+
+    def commit(self) -> int:
+        """add()로 모은 기사를 새 세그먼트 하나로 기록. 기록한 기사 수."""
+        items, self._pending = list({it["url"]: it for it in self._pending}.values()), []
+        if not items:
+            return 0
+        with metrics.timer("stage_seconds", stage="index"):
+            n = self.add_documents(items)
+        metrics.inc("search_index_docs_total", n)
+        return n
+
+    def add_documents(self, items: Sequence[Dict[str, Any]]) -> int:
+        tfs: List[Dict[str, int]] = []
+        for it in items:
+            tf: Dict[str, int] = defaultdict(int)
+            for field, weight in FIELD_WEIGHTS:
+                value = it.get(field) or ""
+                if isinstance(value, (list, tuple)):
+                    value = " ".join(value)
+                for t in tokenize(value):
+                    tf[t] += weight
+            tfs.append(tf)
+        with self._lock, self._db:
+            # 다시 색인하는 URL은 옛 doc_id를 지우고 문서 수/길이 합계에서도 뺌
+            old = {}
+            for it in items:
+                if row := self._db.execute("select doc_id, length from docs where url = ?", (it["url"],)).fetchone():
+                    old[it["url"]] = row
+            n_docs = self._meta("n_docs") + len({it["url"] for it in items}) - len(old)
+            total_len = (self._meta("total_len") - sum(n for _, n in old.values())
+                         + sum(sum(tf.values()) for tf in tfs))
+            avgdl = total_len / n_docs if n_docs else 1.0
+            postings: Dict[str, Tuple[List[int], List[int]]] = defaultdict(lambda: ([], []))
+            for it, tf in zip(items, tfs):
+                if row := self._db.execute("select doc_id from docs where url = ?", (it["url"],)).fetchone():
+                    self._db.execute("delete from docs where doc_id = ?", row)
+                    self._db.execute("insert or ignore into deleted values (?)", row)
+                published = it.get("published_at")
+                length = sum(tf.values())
+                cur = self._db.execute(
+                    "insert into docs (url, title, summary, keywords, section, source, published_at, length,"
+                    " indexed_at) values (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (it["url"], (it.get("title") or "").strip(), it.get("summary") or "",
+                     json.dumps(it.get("keywords") or [], ensure_ascii=False), it.get("section") or "",
+                     it.get("source_name"),
+                     published.astimezone(KST).isoformat() if isinstance(published, datetime) else published,
+                     length, time.time()))
+                doc_id = cur.lastrowid
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * length / avgdl)
+                for t, f in tf.items():
+                    ids, impacts = postings[t]
+                    ids.append(doc_id)
+                    impacts.append(min(65535, round(f * (BM25_K1 + 1) / (f + norm) * IMPACT_SCALE)))
+            seg = (self._db.execute("select max(seg) from segments").fetchone()[0] or 0) + 1
+            self._db.executemany("insert into postings values (?, ?, ?, ?)", [
+                (t, seg, len(ids), _encode(np.asarray(ids), np.asarray(impacts)))
+                for t, (ids, impacts) in postings.items()
+            ])
+            self._db.execute("insert into segments values (?, ?, ?)", (seg, len(items), time.time()))
+            self._db.executemany("insert or replace into meta values (?, ?)",
+                                 [("n_docs", n_docs), ("total_len", total_len)])
+        self._maybe_merge()
+        return len(items)
+
+    # --- 세그먼트 합치기 ------------------------------------------------------------
+    def _maybe_merge(self):
+        with self._lock:
+            segs = self._db.execute("select seg, docs from segments order by seg").fetchall()
+        if len(segs) <= self.max_segments:
+            return
+        tail = segs[1:]
+        # 뒤쪽을 합친 크기가 첫 세그먼트보다 크면 전부 합침(세그먼트 크기가 기하급수로 자라 합치는 비용이 분산됨)
+        self.merge([s for s, _ in (segs if sum(d for _, d in tail) >= segs[0][1] else tail)])
+
+    def optimize(self):
+        """모든 세그먼트를 하나로 합치고 지운 기사를 포스팅에서 제거."""
+        self.merge([s for s, in self._db.execute("select seg from segments")])
+
+    def merge(self, segs: List[int]):
+        if len(segs) < 2 and not self._db.execute("select 1 from deleted limit 1").fetchone():
+            return
+        with metrics.timer("stage_seconds", stage="index_merge"), self._lock, self._db:
+            total = self._db.execute("select count(*) from segments").fetchone()[0]
+            deleted = np.array([d for d, in self._db.execute("select doc_id from deleted")], dtype=np.int64)
+            marks = ",".join("?" * len(segs))
+            rows = self._db.execute(
+                f"select term, n, data from postings where seg in ({marks}) order by term, seg", segs)
+            target = min(segs)
+            out, term, parts = [], None, []
+
+            def flush():
+                ids = np.concatenate([p[0] for p in parts])
+                impacts = np.concatenate([p[1] for p in parts])
+                if len(deleted):
+                    keep = ~np.isin(ids, deleted)
+                    ids, impacts = ids[keep], impacts[keep]
+                if len(ids):
+                    out.append((term, target, len(ids), _encode(ids, impacts)))
+
+            for t, n, data in rows:
+                if t != term and parts:
+                    flush()
+                    parts = []
+                term = t
+                parts.append(_decode(n, data))
+            if parts:
+                flush()
+            self._db.execute(f"delete from postings where seg in ({marks})", segs)
+            self._db.executemany("insert into postings values (?, ?, ?, ?)", out)
+            docs = self._db.execute(f"select sum(docs) from segments where seg in ({marks})", segs).fetchone()[0]
+            self._db.execute(f"delete from segments where seg in ({marks})", segs)
+            self._db.execute("insert into segments values (?, ?, ?)", (target, docs, time.time()))
+            if len(segs) == total:
+                self._db.execute("delete from deleted")   # 모든 포스팅에서 지웠으므로
+        print(f"[OK] 검색 색인 세그먼트 {len(segs)}개 합침")
+
+    # --- 검색 ------------------------------------------------------------------
+    def search(self, query: str, k: int = 20, since: Optional[str] = None, until: Optional[str] = None,
+               section: Optional[str] = None, min_match: float = SEARCH_MIN_MATCH) -> List[Hit]:
+        """질의와 관련도 높은 기사 k건. since/until은 발행일(YYYY-MM-DD, until 포함)."""
+        groups = _query_groups(query)
+        if not groups:
+            return []
+        terms = sorted({t for g in groups for t in g})
+        with self._lock:
+            n_docs = max(1.0, self._meta("n_docs"))
+            deleted = np.array([d for d, in self._db.execute("select doc_id from deleted")], dtype=np.int64)
+            rows = self._db.execute(
+                "select term, n, data from postings where term in (%s)" % ",".join("?" * len(terms)), terms
+            ).fetchall()
+        lists: Dict[str, List[Tuple[np.ndarray, np.ndarray]]] = defaultdict(list)
+        for t, n, data in rows:
+            lists[t].append(_decode(n, data))
+        postings = {t: (np.concatenate([p[0] for p in ps]), np.concatenate([p[1] for p in ps]))
+                    for t, ps in lists.items()}
+        if not postings:
+            return []
+        size = int(max(ids.max() for ids, _ in postings.values())) + 1
+        if len(deleted):
+            # 지운 기사는 점수뿐 아니라 문서 빈도(idf)에서도 빼야 다시 색인한 단어의 점수가 낮아지지 않음
+            live = np.ones(size, dtype=bool)
+            live[deleted[deleted < size]] = False
+            for t, (ids, impacts) in list(postings.items()):
+                keep = live[ids]
+                postings[t] = (ids[keep], impacts[keep])
+        scores = np.zeros(size)
+        matched = np.zeros(size, dtype=np.int32)   # 포함한 질의 단어 수
+        for g in groups:
+            hits = np.zeros(size, dtype=np.int32)
+            for t in g:
+                if t not in postings or not len(postings[t][0]):
+                    continue
+                ids, impacts = postings[t]
+                idf = math.log(1 + (n_docs - len(ids) + 0.5) / (len(ids) + 0.5))
+                scores += np.bincount(ids, weights=impacts * (idf / IMPACT_SCALE / len(g)), minlength=size)
+                hits += np.bincount(ids, minlength=size).astype(bool)
+            matched += hits >= len(g)
+        need = max(1, math.ceil(min_match * len(groups)))
+        cand = np.flatnonzero(matched >= need)
+        if not len(cand):
+            return []
+        final = scores[cand] * (matched[cand] / len(groups))
+        scores[cand] = final
+
+        # 점수순으로 조금씩 꺼내 날짜/섹션 조건을 SQL로 확인
+        where, params = [], []
+        if since:
+            where.append("published_at >= ?"); params.append(since)
+        if until:
+            where.append("published_at < ?"); params.append(until + "~")   # 그날 끝까지 포함
+        if section:
+            where.append("section = ?"); params.append(section)
+        cond = "".join(f" and {w}" for w in where)
+        hits_out: List[Hit] = []
+        step = max(k * 4, 200)
+        for chunk in _ranked_chunks(cand, final, step):
+            with self._lock:
+                found = {r[0]: r for r in self._db.execute(
+                    "select doc_id, url, title, summary, keywords, section, source, published_at from docs "
+                    "where doc_id in (%s)%s" % (",".join("?" * len(chunk)), cond), chunk + params)}
+            for d in chunk:
+                if (r := found.get(d)) is not None:
+                    hits_out.append(Hit(float(scores[d]), r[1], r[2], r[3] or "", json.loads(r[4] or "[]"),
+                                        r[5] or "", r[6], r[7]))
+                    if len(hits_out) >= k:
+                        return hits_out
+        return hits_out
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "docs": int(self._meta("n_docs")),
+                "terms": self._db.execute("select count(distinct term) from postings").fetchone()[0],
+                "segments": self._db.execute("select count(*) from segments").fetchone()[0],
+                "deleted": self._db.execute("select count(*) from deleted").fetchone()[0],
+                "postings_mb": round((self._db.execute("select coalesce(sum(length(data)), 0) from postings")
+                                      .fetchone()[0]) / 1024 / 1024, 2),
+            }
+
+    def close(self):
+        self._db.close()
+
+_index: Optional[SearchIndex] = None
+
+def get_search_index() -> Optional[SearchIndex]:
+    """공용 검색 색인(SEARCH_INDEX=0이거나 재생 중이면 None)."""
+    global _index
+    if not SEARCH_INDEX_ENABLED or get_replay() is not None:
+        return None
+    if _index is None:
+        _index = SearchIndex()
+    return _index
+
+def _print_hits(hits: List[Hit], elapsed: float):
+    for i, h in enumerate(hits, 1):
+        date = (h.published_at or "")[:10] or "----------"
+        print(f"{i:>3}. {h.score:6.2f}  {date}  [{h.section}] {h.title}")
+        print(f"       {h.url}")
+        if h.keywords:
+            print(f"       #{' #'.join(h.keywords)}")
+    print(f"[OK] {len(hits)}건 ({elapsed * 1000:.1f}ms)", file=sys.stderr)
+
+def main():
+    from dotenv import load_dotenv
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="지난 기사 검색 색인")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_search = sub.add_parser("search", help="검색")
+    p_search.add_argument("query")
+    p_search.add_argument("-k", type=int, default=20, help="결과 수")
+    p_search.add_argument("--since", help="발행일 시작(YYYY-MM-DD)")
+    p_search.add_argument("--until", help="발행일 끝(YYYY-MM-DD, 포함)")
+    p_search.add_argument("--section")
+    p_search.add_argument("--json", action="store_true", help="JSON으로 출력")
+    sub.add_parser("stats", help="색인 크기")
+    sub.add_parser("optimize", help="세그먼트 전부 합치기")
+    sub.add_parser("import", help="DATABASE_URL 저장소의 기사/요약으로 색인 채우기")
+    args = parser.parse_args()
+
+    index = SearchIndex()
+    if args.cmd == "search":
+        t0 = time.perf_counter()
+        hits = index.search(args.query, args.k, args.since, args.until, args.section)
+        elapsed = time.perf_counter() - t0
+        if args.json:
+            print(json.dumps([h.__dict__ for h in hits], ensure_ascii=False, indent=2))
+        else:
+            _print_hits(hits, elapsed)
+    elif args.cmd == "stats":
+        print(json.dumps(index.stats(), ensure_ascii=False))
+    elif args.cmd == "optimize":
+        index.optimize()
+    elif args.cmd == "import":
+        from app.storage import get_storage
+        storage = get_storage()
+        if storage is None:
+            print("[ERROR] DATABASE_URL이 설정되지 않았습니다.")
+            sys.exit(1)
+        total = 0
+        batch: List[Dict[str, Any]] = []
+        for it in storage.iter_enriched():
+            batch.append(it)
+            if len(batch) >= 5000:
+                total += index.add_documents(batch)
+                batch = []
+        if batch:
+            total += index.add_documents(batch)
+        print(f"[OK] {total}건 색인")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+# app/storage.py
+"""기사/요약/뉴스레터 저장(sql/schema.sql의 articles, article_enrich, newsletters, newsletter_items).
+
+행 단위 insert 대신 STORAGE_CHUNK개씩 묶어 `INSERT ... ON CONFLICT (url) DO UPDATE`로
+한 트랜잭션에 넣는다. 같은 URL을 다시 수집해도 기존 행이 갱신되고 id는 유지된다.
+
+백엔드(DATABASE_URL):
+- postgres://, postgresql:// : Postgres(Supabase 포함). 임시 테이블에 COPY로 적재한 뒤
+  한 번의 INSERT ... SELECT ... ON CONFLICT로 반영. psycopg 3 필요, 스키마는 sql/schema.sql
+- sqlite:///경로 : SQLite(로컬 시험용). 스키마를 자동 생성
+- 미설정 : 저장하지 않음
+재생 모드(--replay)에서는 설정과 관계없이 저장하지 않는다(보관한 페이지를 다시 처리한 결과가 실제 기록을 덮지 않도록).
+"""
+import json, os, sqlite3, threading, uuid
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from app.archive import get_replay
+
+DATABASE_URL = os.getenv("DATABASE_URL", "")
+STORAGE_CHUNK = int(os.getenv("STORAGE_CHUNK", "500"))
+
+ARTICLE_COLUMNS = ("url", "title", "published_at", "content", "view_count", "rank_hint", "thumbnail_url")
+ENRICH_COLUMNS = ("url", "summary_kr", "keywords", "section")
+
+def _chunks(rows: Sequence, size: int) -> Iterable[Sequence]:
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+def _unique_by_url(rows: Iterable[Tuple]) -> List[Tuple]:
+    """같은 URL이 여러 번 있으면 마지막 행만(한 문장에서 같은 행을 두 번 갱신할 수 없음)."""
+    return list({r[0]: r for r in rows}.values())
+
+def article_row(it: Dict[str, Any]) -> Tuple:
+    return (
+        it["url"],
+        (it.get("title") or "").strip(),
+        it.get("published_at"),
+        it.get("content") or None,
+        it.get("view_count"),
+        it.get("rank_hint"),
+        it.get("thumbnail_url"),
+    )
+
+def enrich_row(it: Dict[str, Any]) -> Tuple:
+    return (it["url"], it.get("summary") or "", it.get("keywords"), it.get("section") or "")
+
+class Storage(ABC):
+    """백엔드 공통 부분: 행 변환, URL 중복 정리, 청크 분할."""
+
+    def __init__(self, chunk_size: int = STORAGE_CHUNK):
+        self.chunk_size = max(1, chunk_size)
+
+    def upsert_articles(self, items: Iterable[Dict[str, Any]]) -> Dict[str, str]:
+        """기사 저장(본문이 없는 행은 기존 본문을 유지). url → article id."""
+        rows = _unique_by_url(article_row(it) for it in items if it.get("url"))
+        ids: Dict[str, str] = {}
+        for chunk in _chunks(rows, self.chunk_size):
+            ids.update(self._upsert_articles(chunk))
+        return ids
+
+    def upsert_enrich(self, items: Iterable[Dict[str, Any]]) -> int:
+        """요약/섹션 저장. 기사 행이 먼저 있어야 한다(없는 URL은 건너뜀)."""
+        rows = _unique_by_url(enrich_row(it) for it in items if it.get("url") and it.get("summary"))
+        return sum(self._upsert_enrich(chunk) for chunk in _chunks(rows, self.chunk_size))
+
+    def save_articles(self, items: List[Dict[str, Any]]) -> Dict[str, str]:
+        """기사와 요약을 함께 저장."""
+        ids = self.upsert_articles(items)
+        self.upsert_enrich(items)
+        return ids
+
+    def record_newsletter(self, subject: str, html: str, sections: List[Dict[str, Any]],
+                          sent_at: Optional[datetime] = None) -> str:
+        """발행한 뉴스레터와 섹션/순서별 수록 기사 저장. newsletter id 반환."""
+        items = [it for sec in sections for it in sec["items"]]
+        ids = self.save_articles(items)
+        newsletter_id = str(uuid.uuid4())
+        members, seen = [], set()
+        for sec in sections:
+            for ord_, it in enumerate(sec["items"]):
+                aid = ids.get(it.get("url"))
+                if aid and aid not in seen:
+                    seen.add(aid)
+                    members.append((newsletter_id, aid, sec["name"], ord_))
+        self._insert_newsletter(newsletter_id, sent_at, subject, html, len(members))
+        for chunk in _chunks(members, self.chunk_size):
+            self._upsert_members(chunk)
+        return newsletter_id
+
+    def iter_enriched(self) -> Iterator[Dict[str, Any]]:
+        """요약이 있는 기사 전부(url, title, published_at, summary, keywords, section). 검색 색인 채우기용."""
+        for url, title, published_at, summary, keywords, section in self._select_enriched():
+            yield {"url": url, "title": title, "published_at": published_at, "summary": summary,
+                   "keywords": keywords, "section": section}
+
+    # --- 백엔드 구현 ---------------------------------------------------------------
+    @abstractmethod
+    def _upsert_articles(self, rows: Sequence[Tuple]) -> Dict[str, str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _select_enriched(self) -> Iterable[Tuple]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _upsert_enrich(self, rows: Sequence[Tuple]) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _insert_newsletter(self, newsletter_id: str, sent_at, subject: str, html: str, count: int):
+        raise NotImplementedError
+
+    @abstractmethod
+    def _upsert_members(self, rows: Sequence[Tuple]):
+        raise NotImplementedError
+
+    def close(self):
+        """연결을 쓰는 백엔드만 재정의."""
+
+_SQLITE_SCHEMA = """
+create table if not exists articles (
+  id text primary key,
+  source_id text,
+  url text unique not null,
+  title text not null,
+  author text,
+  published_at text,
+  raw_html text,
+  content text,
+  view_count integer,
+  rank_hint integer,
+  thumbnail_url text,
+  fetched_at text default current_timestamp
+);
+create table if not exists article_enrich (
+  article_id text primary key references articles(id) on delete cascade,
+  summary_kr text not null,
+  keywords text,
+  section text not null,
+  lang text default 'ko',
+  created_at text default current_timestamp
+);
+create table if not exists newsletters (
+  id text primary key,
+  sent_at text,
+  subject text,
+  html text,
+  item_count integer
+);
+create table if not exists newsletter_items (
+  newsletter_id text references newsletters(id),
+  article_id text references articles(id),
+  section text,
+  ord integer,
+  primary key (newsletter_id, article_id)
+);
+"""
+
+class SQLiteStorage(Storage):
+    """로컬 시험용 SQLite 백엔드(ON CONFLICT ... DO UPDATE는 SQLite 3.24+)."""
+
+    def __init__(self, path: str, chunk_size: int = STORAGE_CHUNK):
+        super().__init__(chunk_size)
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript(_SQLITE_SCHEMA)
+
+    @staticmethod
+    def _ts(v):
+        return v.isoformat() if isinstance(v, datetime) else v
+
+    def _upsert_articles(self, rows):
+        params = [(str(uuid.uuid4()), r[0], r[1], self._ts(r[2]), *r[3:]) for r in rows]
+        with self._lock, self._db:
+            self._db.executemany("""
+                insert into articles (id, url, title, published_at, content, view_count, rank_hint, thumbnail_url)
+                values (?, ?, ?, ?, ?, ?, ?, ?)
+                on conflict (url) do update set
+                  title = excluded.title,
+                  published_at = coalesce(excluded.published_at, articles.published_at),
+                  content = coalesce(excluded.content, articles.content),
+                  view_count = coalesce(excluded.view_count, articles.view_count),
+                  rank_hint = coalesce(excluded.rank_hint, articles.rank_hint),
+                  thumbnail_url = coalesce(excluded.thumbnail_url, articles.thumbnail_url),
+                  fetched_at = current_timestamp""", params)
+            found = self._db.execute(
+                "select url, id from articles where url in (%s)" % ",".join("?" * len(rows)),
+                [r[0] for r in rows],
+            ).fetchall()
+        return dict(found)
+
+    def _upsert_enrich(self, rows):
+        params = [(summary, json.dumps(kw, ensure_ascii=False) if kw is not None else None, section, url)
+                  for url, summary, kw, section in rows]
+        with self._lock, self._db:
+            cur = self._db.executemany("""
+                insert into article_enrich (article_id, summary_kr, keywords, section)
+                select id, ?, ?, ? from articles where url = ?
+                on conflict (article_id) do update set
+                  summary_kr = excluded.summary_kr,
+                  keywords = coalesce(excluded.keywords, article_enrich.keywords),
+                  section = excluded.section""", params)
+        return cur.rowcount
+
+    def _select_enriched(self):
+        with self._lock:
+            rows = self._db.execute("""
+                select a.url, a.title, a.published_at, e.summary_kr, e.keywords, e.section
+                from articles a join article_enrich e on e.article_id = a.id
+                order by a.fetched_at""").fetchall()
+        for url, title, published_at, summary, keywords, section in rows:
+            yield url, title, published_at, summary, json.loads(keywords) if keywords else None, section
+
+    def _insert_newsletter(self, newsletter_id, sent_at, subject, html, count):
+        with self._lock, self._db:
+            self._db.execute("insert into newsletters values (?, ?, ?, ?, ?)",
+                             (newsletter_id, self._ts(sent_at), subject, html, count))
+
+    def _upsert_members(self, rows):
+        with self._lock, self._db:
+            self._db.executemany("""
+                insert into newsletter_items values (?, ?, ?, ?)
+                on conflict (newsletter_id, article_id) do update set
+                  section = excluded.section, ord = excluded.ord""", rows)
+
+    def close(self):
+        self._db.close()
+
+class PostgresStorage(Storage):
+    """Postgres 백엔드. 청크마다 임시 테이블에 COPY 후 INSERT ... SELECT ... ON CONFLICT 한 번."""
+
+    def __init__(self, dsn: str, chunk_size: int = STORAGE_CHUNK):
+        super().__init__(chunk_size)
+        try:
+            import psycopg
+        except ImportError as e:
+            raise RuntimeError("Postgres 저장에는 psycopg가 필요합니다(pip install psycopg[binary]).") from e
+        self._lock = threading.Lock()
+        self._conn = psycopg.connect(dsn)
+
+    def _copy(self, cur, table: str, columns: Sequence[str], rows: Sequence[Tuple]):
+        with cur.copy(f"copy {table} ({', '.join(columns)}) from stdin") as cp:
+            for r in rows:
+                cp.write_row(r)
+
+    def _upsert_articles(self, rows):
+        with self._lock, self._conn.transaction(), self._conn.cursor() as cur:
+            cur.execute("""
+                create temp table if not exists _articles_in (
+                  url text, title text, published_at timestamptz, content text,
+                  view_count int, rank_hint int, thumbnail_url text
+                ) on commit delete rows""")
+            self._copy(cur, "_articles_in", ARTICLE_COLUMNS, rows)
+            cur.execute("""
+                insert into articles as a (url, title, published_at, content, view_count, rank_hint, thumbnail_url)
+                select url, title, published_at, content, view_count, rank_hint, thumbnail_url from _articles_in
+                on conflict (url) do update set
+                  title = excluded.title,
+                  published_at = coalesce(excluded.published_at, a.published_at),
+                  content = coalesce(excluded.content, a.content),
+                  view_count = coalesce(excluded.view_count, a.view_count),
+                  rank_hint = coalesce(excluded.rank_hint, a.rank_hint),
+                  thumbnail_url = coalesce(excluded.thumbnail_url, a.thumbnail_url),
+                  fetched_at = now()
+                returning url, id""")
+            return {url: str(aid) for url, aid in cur.fetchall()}
+
+    def _upsert_enrich(self, rows):
+        with self._lock, self._conn.transaction(), self._conn.cursor() as cur:
+            cur.execute("""
+                create temp table if not exists _enrich_in (
+                  url text, summary_kr text, keywords text[], section text
+                ) on commit delete rows""")
+            self._copy(cur, "_enrich_in", ENRICH_COLUMNS, rows)
+            cur.execute("""
+                insert into article_enrich as e (article_id, summary_kr, keywords, section)
+                select a.id, i.summary_kr, i.keywords, i.section
+                from _enrich_in i join articles a on a.url = i.url
+                on conflict (article_id) do update set
+                  summary_kr = excluded.summary_kr,
+                  keywords = coalesce(excluded.keywords, e.keywords),
+                  section = excluded.section""")
+            return cur.rowcount
+
+    def _select_enriched(self):
+        # 서버 측 커서로 나눠 받음(수십만 건도 메모리에 한꺼번에 올리지 않음)
+        with self._lock, self._conn.transaction(), self._conn.cursor(name="loginews_enriched") as cur:
+            cur.execute("""
+                select a.url, a.title, a.published_at, e.summary_kr, e.keywords, e.section
+                from articles a join article_enrich e on e.article_id = a.id
+                order by a.fetched_at""")
+            yield from cur
+
+    def _insert_newsletter(self, newsletter_id, sent_at, subject, html, count):
+        with self._lock, self._conn.transaction(), self._conn.cursor() as cur:
+            cur.execute("insert into newsletters (id, sent_at, subject, html, item_count) values (%s, %s, %s, %s, %s)",
+                        (newsletter_id, sent_at, subject, html, count))
+
+    def _upsert_members(self, rows):
+        with self._lock, self._conn.transaction(), self._conn.cursor() as cur:
+            cur.executemany("""
+                insert into newsletter_items (newsletter_id, article_id, section, ord)
+                values (%s, %s, %s, %s)
+                on conflict (newsletter_id, article_id) do update set
+                  section = excluded.section, ord = excluded.ord""", rows)
+
+    def close(self):
+        self._conn.close()
+
+def open_storage(url: str = DATABASE_URL, chunk_size: int = STORAGE_CHUNK) -> Optional[Storage]:
+    """DATABASE_URL 형식에 맞는 백엔드. 비어 있으면 None."""
+    if not url:
+        return None
+    if url.startswith(("postgres://", "postgresql://")):
+        return PostgresStorage(url, chunk_size)
+    if url.startswith("sqlite:///"):
+        return SQLiteStorage(url[len("sqlite:///"):], chunk_size)
+    raise ValueError(f"지원하지 않는 DATABASE_URL: {url}")
+
+_storage: Optional[Storage] = None
+
+def get_storage() -> Optional[Storage]:
+    """공용 저장소(DATABASE_URL 미설정이거나 재생 중이면 None). .env를 읽은 뒤 처음 호출 시 연결."""
+    global _storage
+    if get_replay() is not None:
+        return None   # 재생은 네트워크/DB 없이, 저장된 LLM 요약을 로컬 요약으로 덮지 않음
+    if _storage is None:
+        _storage = open_storage(os.getenv("DATABASE_URL", DATABASE_URL))
+    return _storage
@@ -0,0 +1,97 @@
+# app/subscribers.py
+"""구독자별 섹션 설정과 개인화 뉴스레터 팬아웃.
+
+수집/요약은 실행당 한 번만 하고, 구독 설정(섹션 필터, 섹션별 개수)이 같은
+구독자끼리 묶어 본문을 한 번만 렌더한다. 서로 다른 설정 조합은 프로세스 풀에서
+병렬로 렌더한다.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+
+from app.render_email import Renderer, get_renderer, filter_sections
+
+SUBSCRIBERS_PATH = os.getenv("SUBSCRIBERS_PATH", "config/subscribers.yaml")
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+RENDER_POOL_MIN = 8   # 서로 다른 본문이 이보다 적으면 프로세스 풀 없이 렌더
+
+PrefKey = Tuple[Optional[Tuple[str, ...]], Optional[int]]
+
+@dataclass
+class Subscriber:
+    email: str
+    sections: Optional[List[str]] = None   # None이면 전체 섹션
+    top_n: Optional[int] = None            # None이면 섹션별 전체
+
+    def preference_key(self) -> PrefKey:
+        return (tuple(sorted(self.sections)) if self.sections else None, self.top_n)
+
+@dataclass
+class Edition:
+    """같은 본문을 받는 구독자 묶음."""
+    key: PrefKey
+    subject: str
+    html: str
+    recipients: List[str] = field(default_factory=list)
+
+def load_subscribers(path: str = SUBSCRIBERS_PATH) -> List[Subscriber]:
+    """구독자 파일을 읽는다. 파일이 없으면 TO_EMAILS를 전체 섹션 구독자로 사용."""
+    if not os.path.exists(path):
+        emails = [e.strip() for e in os.getenv("TO_EMAILS", "").split(",") if e.strip()]
+        return [Subscriber(email=e) for e in emails]
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(f) or {}
+    subs = []
+    for row in data.get("subscribers", []):
+        if not row.get("email"):
+            continue
+        top_n = row.get("top_n")
+        subs.append(Subscriber(
+            email=row["email"].strip(),
+            sections=list(row["sections"]) if row.get("sections") else None,
+            top_n=int(top_n) if top_n else None,
+        ))
+    return subs
+
+def group_by_preference(subs: List[Subscriber]) -> Dict[PrefKey, List[str]]:
+    groups: Dict[PrefKey, List[str]] = {}
+    for s in subs:
+        groups.setdefault(s.preference_key(), []).append(s.email)
+    return groups
+
+# --- 렌더 워커(프로세스마다 섹션 데이터를 한 번만 받음) --------------------------------
+_worker_ctx: Tuple = ()
+
+def _init_worker(app_name: str, sections: List[Dict], today: datetime):
+    global _worker_ctx
+    _worker_ctx = (app_name, sections, today)
+
+def _render_keys(keys: List[PrefKey]) -> List[Tuple[PrefKey, str]]:
+    """설정 조합 묶음을 컴파일된 템플릿 하나로 렌더(render_variants)."""
+    app_name, sections, today = _worker_ctx
+    variants = [{"key": k, "sections": k[0], "top_n": k[1]} for k in keys]
+    return [(v["key"], html) for v, html in get_renderer().render_variants(app_name, sections, today, variants)]
+
+def build_editions(app_name: str, sections: List[Dict], today: datetime,
+                   subs: List[Subscriber], workers: int = RENDER_WORKERS) -> List[Edition]:
+    """구독 설정 조합마다 본문을 한 번씩 렌더해 Edition 목록으로 반환.
+
+    섹션 필터 결과 보낼 기사가 하나도 없는 조합은 제외한다.
+    """
+    groups = group_by_preference(subs)
+    keys = [k for k in groups if filter_sections(sections, k[0], k[1])]
+    if workers > 1 and len(keys) >= RENDER_POOL_MIN:
+        size = max(1, len(keys) // (workers * 4))
+        chunks = [keys[i:i + size] for i in range(0, len(keys), size)]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(app_name, sections, today)) as pool:
+            rendered = [r for part in pool.map(_render_keys, chunks) for r in part]
+    else:
+        _init_worker(app_name, sections, today)
+        rendered = _render_keys(keys)
+    subject = Renderer.subject(app_name, today)
+    return [Edition(key=k, subject=subject, html=html, recipients=groups[k]) for k, html in rendered]
@@ -0,0 +1,142 @@
+# app/summarizer.py
+"""로컬 추출 요약(TF-IDF + TextRank).
+
+하루치 기사 묶음 전체에서 어휘와 IDF를 한 번에 만들고, 기사마다 문장 TF-IDF 벡터의
+코사인 유사도 그래프로 TextRank 중심성을 구한다. 유사도 행렬은 문장 수 상한(SUMMARY_MAX_SENTENCES)
+크기로 채워 한 배열에 쌓고, 거듭제곱 반복은 모든 기사를 한꺼번에 계산한다.
+최종 점수 = 중심성 + 제목과의 유사도 + 앞 문장 가중치, 상위 문장을 원래 순서로 이어 붙인다.
+
+한국어는 띄어쓰기 단위에 조사/어미가 붙으므로 한글 어절은 글자 2-gram으로,
+영문/숫자는 단어로 색인한다.
+"""
+import os, re
+from collections import defaultdict
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+SUMMARY_SENTENCES = int(os.getenv("SUMMARY_SENTENCES", "3"))
+SUMMARY_MAX_SENTENCES = 40     # 기사당 후보 문장 수 상한(앞에서부터)
+SUMMARY_MAX_CHARS = 300        # 이보다 긴 문장은 잘라서 색인/출력
+MIN_SENTENCE_CHARS = 6         # 이보다 짧은 조각은 앞 문장에 붙임
+DAMPING = 0.85
+ITERATIONS = 30
+TITLE_WEIGHT = 0.5
+LEAD_WEIGHT = 0.3
+REDUNDANCY = 0.8               # 이미 고른 문장과 이보다 비슷하면 건너뜀
+
+# 종결 부호(+닫는 따옴표/괄호) 뒤 공백에서 자름. 3.5% 같은 소수점, 'U.S.'처럼 대문자 한 글자 약어는 자르지 않음
+_SENT_END = re.compile(r"(?<![A-Z]\.)(?<=[.!?。！？…])[\"'”’)\]]*\s+|\n+")
+_HANGUL_BIGRAM = re.compile(r"(?=([가-힣]{2}))")          # 겹치는 글자 2-gram(어절 경계는 넘지 않음)
+_WORD = re.compile(r"[a-z][a-z0-9]+|\d+(?:[.,]\d+)*")
+_BYLINE = re.compile(r"^\s*[\[(（【][^\])）】]{1,30}[\])）】]\s*")   # [물류신문 홍길동 기자] 같은 머리말
+
+def split_sentences(text: str) -> List[str]:
+    """한국어/영어 혼합 문장 분리."""
+    text = _BYLINE.sub("", text.replace("\r", " ")).strip()
+    out: List[str] = []
+    for part in _SENT_END.split(text):
+        part = " ".join(part.split())
+        if not part:
+            continue
+        if out and (len(part) < MIN_SENTENCE_CHARS or len(out[-1]) < MIN_SENTENCE_CHARS):
+            out[-1] = out[-1] + " " + part
+        else:
+            out.append(part)
+    return out
+
+def tokenize(text: str) -> List[str]:
+    """한글은 어절 안의 글자 2-gram, 영문은 두 글자 이상 단어, 숫자는 그대로."""
+    text = text.lower()
+    return _HANGUL_BIGRAM.findall(text) + _WORD.findall(text)
+
+def _clip(s: str) -> str:
+    return s if len(s) <= SUMMARY_MAX_CHARS else s[:SUMMARY_MAX_CHARS].rstrip() + "…"
+
+def summarize_batch(docs: Sequence[Tuple[str, str]], max_sent: int = SUMMARY_SENTENCES) -> List[str]:
+    """(제목, 본문) 여러 건을 한 번에 요약. 결과 순서는 입력 순서와 같다."""
+    n_docs = len(docs)
+    if n_docs == 0:
+        return []
+    M = SUMMARY_MAX_SENTENCES
+    sents: List[List[str]] = []
+    vocab: Dict[str, int] = defaultdict()
+    vocab.default_factory = vocab.__len__   # 처음 보는 단어에 다음 번호 부여
+    term_id = vocab.__getitem__
+    rows: List[int] = []       # 문장 번호(전체 기준). 제목은 기사마다 마지막 행에 따로 둠
+    cols: List[int] = []
+    doc_of_row: List[int] = []
+    for d, (title, content) in enumerate(docs):
+        ss = [_clip(s) for s in split_sentences(content or "")[:M]] or [_clip((title or "").strip())]
+        sents.append(ss)
+        for text in ss + [title or ""]:
+            terms = tokenize(text)
+            rows.extend([len(doc_of_row)] * len(terms))
+            cols.extend(map(term_id, terms))
+            doc_of_row.append(d)
+
+    n_rows, n_terms = len(doc_of_row), max(1, len(vocab))
+    rows_a = np.asarray(rows, dtype=np.int64)
+    cols_a = np.asarray(cols, dtype=np.int64)
+    doc_a = np.asarray(doc_of_row, dtype=np.int64)
+
+    # (행, 단어) 빈도 → 희소 좌표 형태로 합침
+    flat = rows_a * n_terms + cols_a
+    keys, tf = np.unique(flat, return_counts=True)
+    r_idx, c_idx = keys // n_terms, keys % n_terms
+    # 기사 단위 DF와 묶음 전체 공통 IDF
+    doc_term = np.unique(doc_a[r_idx] * n_terms + c_idx)
+    df = np.bincount(doc_term % n_terms, minlength=n_terms)
+    idf = np.log((1 + n_docs) / (1 + df)) + 1.0
+    w = (1.0 + np.log(tf)) * idf[c_idx]
+    norms = np.sqrt(np.bincount(r_idx, weights=w * w, minlength=n_rows))
+    w = w / np.where(norms[r_idx] > 0, norms[r_idx], 1.0)
+
+    # 기사별 (문장 + 제목) 블록을 촘촘한 행렬로 펼쳐 유사도 계산
+    counts = np.array([len(s) for s in sents])
+    sim = np.zeros((n_docs, M, M))
+    title_sim = np.zeros((n_docs, M))
+    row_start = np.concatenate(([0], np.cumsum(counts + 1)[:-1]))
+    entry_start = np.searchsorted(r_idx, row_start)
+    entry_end = np.searchsorted(r_idx, row_start + counts + 1)
+    for d in range(n_docs):
+        lo, hi = entry_start[d], entry_end[d]
+        if lo == hi:
+            continue
+        local_terms, local_c = np.unique(c_idx[lo:hi], return_inverse=True)
+        X = np.zeros((counts[d] + 1, len(local_terms)))
+        X[r_idx[lo:hi] - row_start[d], local_c] = w[lo:hi]
+        S = X @ X.T
+        k = counts[d]
+        sim[d, :k, :k] = S[:k, :k]
+        title_sim[d, :k] = S[:k, k]
+
+    # TextRank: 자기 자신 제외, 행 정규화 후 모든 기사 동시에 거듭제곱 반복
+    idx = np.arange(M)
+    sim[:, idx, idx] = 0.0
+    mask = idx[None, :] < counts[:, None]                  # (기사, 문장) 유효 위치
+    out_deg = sim.sum(axis=2, keepdims=True)
+    trans = np.divide(sim, out_deg, out=np.zeros_like(sim), where=out_deg > 0)
+    n = np.maximum(counts, 1)[:, None]
+    rank = np.where(mask, 1.0 / n, 0.0)
+    for _ in range(ITERATIONS):
+        rank = np.where(mask, (1 - DAMPING) / n + DAMPING * np.matmul(rank[:, None, :], trans)[:, 0, :], 0.0)
+    lead = LEAD_WEIGHT / (1.0 + idx)[None, :]
+    score = rank * n + TITLE_WEIGHT * title_sim + lead
+    score = np.where(mask, score, -np.inf)
+
+    order = np.argsort(-score, axis=1, kind="stable")
+    out = []
+    for d, ss in enumerate(sents):
+        picked: List[int] = []
+        for i in order[d, :len(ss)]:
+            # 거의 같은 문장(인용 반복 등)은 하나만
+            if all(sim[d, i, j] < REDUNDANCY for j in picked):
+                picked.append(int(i))
+                if len(picked) >= max_sent:
+                    break
+        out.append(" ".join(ss[i] for i in sorted(picked)))
+    return out
+
+def summarize(title: str, content: str, max_sent: int = SUMMARY_SENTENCES) -> str:
+    return summarize_batch([(title, content)], max_sent)[0]
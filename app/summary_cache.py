@@ -0,0 +1,170 @@
+# app/summary_cache.py
+"""요약/섹션 분류 결과 캐시(SQLite, 내용 주소 기반).
+
+키는 정규화한 제목+본문의 해시, 프롬프트 버전, 모델 이름으로 만든다.
+URL이 달라도 같은 기사(재전송/중복 게재)면 같은 키가 되어 API 호출을 건너뛴다.
+항목 수 상한을 넘으면 가장 오래 쓰지 않은 항목부터 지운다(LRU).
+
+무효화:
+    python -m app.summary_cache clear                 # 전체 삭제
+    python -m app.summary_cache clear --model gpt-4o-mini
+    python -m app.summary_cache clear --prompt-version 1
+    python -m app.summary_cache stats
+"""
+import argparse, hashlib, os, re, sqlite3, threading, time, unicodedata
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.metrics import metrics
+
+SUMMARY_CACHE_ENABLED = os.getenv("SUMMARY_CACHE", "1") != "0"
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", ".cache/summary_cache.sqlite")
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "50000"))
+
+_WS = re.compile(r"\s+")
+
+def _normalize(s: str) -> str:
+    return _WS.sub(" ", unicodedata.normalize("NFC", s or "")).strip().lower()
+
+def content_key(title: str, content: str) -> str:
+    """정규화한 제목+본문의 해시(모델/프롬프트와 무관한 기사 식별자)."""
+    return hashlib.sha256((_normalize(title) + "\n" + _normalize(content)).encode("utf-8")).hexdigest()
+
+class SummaryCache:
+    def __init__(self, path: str = SUMMARY_CACHE_PATH, max_entries: int = SUMMARY_CACHE_MAX_ENTRIES):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            create table if not exists summaries (
+              content_key text not null,
+              prompt_version text not null,
+              model text not null,
+              summary text not null,
+              section text not null,
+              created_at real not null,
+              accessed_at real not null,
+              primary key (content_key, prompt_version, model)
+            )""")
+        self._db.execute("create index if not exists summaries_accessed on summaries (accessed_at)")
+        self._db.commit()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, prompt_version: str, model: str) -> Optional[Tuple[str, str]]:
+        """(summary, section) 또는 None."""
+        with self._lock:
+            row = self._db.execute(
+                "select summary, section from summaries where content_key = ? and prompt_version = ? and model = ?",
+                (key, prompt_version, model),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                metrics.inc("summary_cache_total", result="miss")
+                return None
+            self.hits += 1
+            metrics.inc("summary_cache_total", result="hit")
+            self._db.execute(
+                "update summaries set accessed_at = ? where content_key = ? and prompt_version = ? and model = ?",
+                (time.time(), key, prompt_version, model),
+            )
+            self._db.commit()
+        return row[0], row[1]
+
+    def put(self, key: str, prompt_version: str, model: str, summary: str, section: str):
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "insert or replace into summaries values (?, ?, ?, ?, ?, ?, ?)",
+                (key, prompt_version, model, summary, section, now, now),
+            )
+            self._evict()
+            self._db.commit()
+
+    def get_many(self, keys: Sequence[str], prompt_version: str, model: str) -> Dict[str, Tuple[str, str]]:
+        """여러 기사를 한 번에 조회(로컬 요약 묶음용). 키 → (summary, section), 없는 키는 빠짐."""
+        found: Dict[str, Tuple[str, str]] = {}
+        uniq = list(dict.fromkeys(keys))
+        with self._lock:
+            for i in range(0, len(uniq), 500):
+                chunk = uniq[i:i + 500]
+                found.update((k, (s, sec)) for k, s, sec in self._db.execute(
+                    "select content_key, summary, section from summaries where prompt_version = ? and model = ? "
+                    "and content_key in (%s)" % ",".join("?" * len(chunk)), [prompt_version, model, *chunk]))
+            now = time.time()
+            self._db.executemany(
+                "update summaries set accessed_at = ? where content_key = ? and prompt_version = ? and model = ?",
+                [(now, k, prompt_version, model) for k in found])
+            self._db.commit()
+        hits = sum(k in found for k in keys)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        metrics.inc("summary_cache_total", hits, result="hit")
+        metrics.inc("summary_cache_total", len(keys) - hits, result="miss")
+        return found
+
+    def put_many(self, rows: Sequence[Tuple[str, str, str]], prompt_version: str, model: str):
+        """(키, summary, section) 여러 건을 한 트랜잭션으로 저장."""
+        now = time.time()
+        with self._lock:
+            self._db.executemany(
+                "insert or replace into summaries values (?, ?, ?, ?, ?, ?, ?)",
+                [(k, prompt_version, model, s, sec, now, now) for k, s, sec in rows])
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        count = self._db.execute("select count(*) from summaries").fetchone()[0]
+        if count > self.max_entries:
+            self._db.execute(
+                "delete from summaries where rowid in (select rowid from summaries order by accessed_at limit ?)",
+                (count - self.max_entries,),
+            )
+
+    def clear(self, model: Optional[str] = None, prompt_version: Optional[str] = None) -> int:
+        """조건에 맞는 항목 삭제(조건이 없으면 전체). 삭제 건수 반환."""
+        where, params = [], []
+        if model:
+            where.append("model = ?"); params.append(model)
+        if prompt_version:
+            where.append("prompt_version = ?"); params.append(prompt_version)
+        sql = "delete from summaries" + (" where " + " and ".join(where) if where else "")
+        with self._lock:
+            cur = self._db.execute(sql, params)
+            self._db.commit()
+        return cur.rowcount
+
+    def stats(self):
+        return self._db.execute(
+            "select model, prompt_version, count(*) from summaries group by model, prompt_version order by model"
+        ).fetchall()
+
+_cache: Optional[SummaryCache] = None
+
+def get_summary_cache() -> Optional[SummaryCache]:
+    """공용 요약 캐시(SUMMARY_CACHE=0이면 None)."""
+    global _cache
+    if SUMMARY_CACHE_ENABLED and _cache is None:
+        _cache = SummaryCache()
+    return _cache
+
+def main():
+    parser = argparse.ArgumentParser(description="요약 캐시 관리")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_clear = sub.add_parser("clear", help="캐시 무효화")
+    p_clear.add_argument("--model", help="이 모델의 항목만 삭제")
+    p_clear.add_argument("--prompt-version", help="이 프롬프트 버전의 항목만 삭제")
+    sub.add_parser("stats", help="모델/프롬프트 버전별 항목 수")
+    args = parser.parse_args()
+
+    cache = SummaryCache()
+    if args.cmd == "clear":
+        n = cache.clear(model=args.model, prompt_version=args.prompt_version)
+        print(f"[OK] 요약 캐시 {n}건 삭제")
+    else:
+        for model, version, count in cache.stats():
+            print(f"{model}\tv{version}\t{count}")
+
+if __name__ == "__main__":
+    main()
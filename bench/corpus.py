@@ -0,0 +1,141 @@
+# bench/corpus.py
+"""벤치마크 입력 데이터.
+
+- fixtures/ : 물류신문(config/sources.yaml의 기본 소스) 구조를 그대로 따른 RSS/목록/상세 페이지 스냅샷
+- synthetic_* : 같은 구조를 원하는 크기(최대 1만 건 이상)로 늘린 합성 데이터(seed 고정)
+"""
+import random
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from app.article import Article
+from app.dates import KST
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASE_URL = "https://www.klnews.co.kr"
+
+# config/sources.yaml의 물류신문(HTML) 셀렉터와 동일
+LIST_SELECTORS = (".list-type .list-item", ".tit", "a")
+LIST_FIELDS = {"view_selector": ".hit", "date_selector": ".date", "teaser_selector": ".list-summary"}
+DETAIL_CFG = {"content_selector": "div.article-body p", "date_selector": "div.info time",
+              "date_attr": "datetime", "view_selector": "span.hit"}
+
+_SUBJECTS = ["CJ대한통운", "쿠팡", "한진", "해양수산부", "관세청", "부산항", "국토교통부", "Amazon", "Maersk", "DHL"]
+_ACTIONS = ["풀필먼트 센터 추가 가동", "물류로봇 500대 도입", "스마트 항만 예산 확대", "전자상거래 통관 간소화",
+            "라스트마일 배송 권역 확장", "콜드체인 투자 발표", "AI 수요예측 솔루션 도입", "해상 운임 3주 연속 하락",
+            "화물차 안전운임제 개편", "친환경 전기 화물차 전환"]
+_SENTENCES = [
+    "업계에 따르면 이번 조치로 처리 능력이 하루 평균 {n}만 상자 늘어날 것으로 보인다.",
+    "회사 관계자는 \"고객 수요가 빠르게 늘고 있어 선제적으로 대응했다\"고 말했다.",
+    "전문가들은 물류센터 자동화와 인력 운영 효율화가 동시에 이뤄져야 한다고 지적했다.",
+    "정부는 관련 법안과 규제 개선 방안을 연내 마련할 계획이다.",
+    "글로벌 공급망 불확실성이 커지면서 재고 전략을 바꾸는 기업이 늘고 있다!",
+    "택배 물동량은 전년 대비 {n}% 증가했다.",
+    "Supply chain visibility remains a top priority for shippers.",
+]
+_DATE_FORMATS = [
+    lambda d: d.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+    lambda d: d.isoformat(),
+    lambda d: d.strftime("%Y.%m.%d %H:%M"),
+    lambda d: f"입력 {d:%Y-%m-%d %H:%M}",
+    lambda d: f"{d.year}년 {d.month}월 {d.day}일 {'오후' if d.hour >= 12 else '오전'} {d.hour % 12 or 12}:{d.minute:02d}",
+]
+
+def fixture(name: str) -> str:
+    return (FIXTURES / name).read_text(encoding="utf-8")
+
+def _rng(seed: int) -> random.Random:
+    return random.Random(seed)
+
+def _title(r: random.Random, i: int) -> str:
+    return f"{r.choice(_SUBJECTS)}, {r.choice(_ACTIONS)} ({i})"
+
+def _paragraphs(r: random.Random, k: int) -> List[str]:
+    return [" ".join(r.choice(_SENTENCES).format(n=r.randint(2, 40)) for _ in range(3)) for _ in range(k)]
+
+def synthetic_dates(n: int, seed: int = 1) -> List[str]:
+    """여러 형식이 섞인 날짜 문자열 n개(중복 포함 — 실제 피드처럼 같은 시각이 반복됨)."""
+    r = _rng(seed)
+    start = datetime(2025, 10, 20, tzinfo=KST)
+    return [r.choice(_DATE_FORMATS)(start - timedelta(minutes=r.randint(0, 60 * 24 * 3))) for _ in range(n)]
+
+def synthetic_rss(n: int, seed: int = 1) -> bytes:
+    r = _rng(seed)
+    items = []
+    for i, d in enumerate(synthetic_dates(n, seed)):
+        items.append(
+            f"<item><title><![CDATA[{_title(r, i)}]]></title>"
+            f"<link>{BASE_URL}/news/articleView.html?idxno={400000 + i}</link>"
+            f"<description><![CDATA[{' '.join(_paragraphs(r, 1))}]]></description>"
+            f"<pubDate>{_DATE_FORMATS[0](datetime(2025, 10, 20, tzinfo=KST) - timedelta(minutes=i))}</pubDate></item>"
+        )
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>bench</title>'
+            + "".join(items) + "</channel></rss>").encode("utf-8")
+
+def synthetic_list_page(n: int, seed: int = 1) -> str:
+    """카드 n개짜리 목록 페이지(물류신문 목록 구조 + 메뉴/사이드바 잡음)."""
+    r = _rng(seed)
+    cards = "".join(
+        f'<li class="list-item"><div class="list-titles"><a href="/news/articleView.html?idxno={400000 + i}">'
+        f'<strong class="tit">{_title(r, i)}</strong></a></div>'
+        f'<p class="list-summary">{_paragraphs(r, 1)[0][:80]}</p>'
+        f'<div class="list-dated"><span class="date">2025.10.20 09:{i % 60:02d}</span> | <span class="hit">{r.randint(10, 9000)}</span></div></li>'
+        for i in range(n)
+    )
+    noise = "".join(f'<div class="item"><a href="/news/articleView.html?idxno={i}">많이 본 기사 {i}</a></div>' for i in range(n // 4 + 10))
+    return (f'<html><head><meta charset="utf-8"><title>bench</title></head><body><header><nav>{noise}</nav></header>'
+            f'<ul class="list-type">{cards}</ul><aside>{noise}</aside></body></html>')
+
+def synthetic_detail_pages(n: int, seed: int = 1) -> List[str]:
+    r = _rng(seed)
+    pages = []
+    for i, d in enumerate(synthetic_dates(n, seed)):
+        paras = "".join(f"<p>{p}</p>" for p in _paragraphs(r, r.randint(4, 12)))
+        side = "".join(f"<div><a href='#'>관련 기사 {k}</a><p>{p}</p></div>" for k, p in enumerate(_paragraphs(r, 6)))
+        pages.append(
+            f"<html><head><title>{_title(r, i)}</title></head><body><header><nav>{side}</nav></header>"
+            f'<article><div class="info"><time datetime="{d}">{d}</time> <span class="hit">조회수 {r.randint(10, 9000):,}</span></div>'
+            f'<div class="article-body">{paras}</div></article><aside>{side}</aside></body></html>'
+        )
+    return pages
+
+def synthetic_articles(n: int, seed: int = 1) -> List[Article]:
+    """요약/분류/정렬/렌더 벤치용 기사(파이프라인 enrich 단계 이후 모양)."""
+    r = _rng(seed)
+    now = datetime(2025, 10, 20, 9, tzinfo=KST)
+    sections = ["국내 물류", "글로벌 동향", "테크·자동화", "정책·규제", "라스트마일·이커머스"]
+    out = []
+    for i in range(n):
+        published = now - timedelta(minutes=r.randint(0, 60 * 48))
+        content = " ".join(_paragraphs(r, r.randint(2, 8)))
+        out.append(Article(
+            title=_title(r, i),
+            url=f"{BASE_URL}/news/articleView.html?idxno={400000 + i}",
+            content=content,
+            summary=content[:200],
+            section=r.choice(sections),
+            source_name=r.choice(["물류신문", "K-Logistics RSS", "카고뉴스"]),
+            view_count=r.choice([None, r.randint(10, 9000)]),
+            published_at=published,
+            published_at_ts=int(published.timestamp()),
+        ))
+    return out
+
+def offline_site(n: int, host: str, seed: int = 1) -> Tuple[Dict[str, bytes], List[Dict[str, Any]]]:
+    """전체 실행(main) 벤치용 가짜 사이트: 경로 → 응답 본문, 그리고 sources 설정.
+
+    RSS 소스 하나와 HTML 목록+상세 소스 하나로 구성되며 host(로컬 서버 주소)에서 제공된다.
+    """
+    pages: Dict[str, bytes] = {"/rss.xml": synthetic_rss(n, seed)}
+    pages["/list.html"] = synthetic_list_page(n, seed).encode("utf-8")
+    for i, html in enumerate(synthetic_detail_pages(n, seed + 1)):
+        pages[f"/news/articleView.html?idxno={400000 + i}"] = html.encode("utf-8")
+    sources = [
+        {"name": "bench RSS", "base_url": host, "method": "rss", "rss_url": f"{host}/rss.xml"},
+        {"name": "bench HTML", "base_url": host, "method": "html", "list_url": f"{host}/list.html",
+         "item_selector": LIST_SELECTORS[0], "title_selector": LIST_SELECTORS[1], "link_selector": LIST_SELECTORS[2],
+         **LIST_FIELDS, "max_age_hours": 0,   # 합성 날짜는 고정이라 날짜 기준은 끔(사전 순위 top-K만 적용)
+         "detail": dict(DETAIL_CFG)},
+    ]
+    return pages, sources
@@ -0,0 +1,343 @@
+# bench/run.py
+"""성능 벤치마크.
+
+    python -m bench.run                         # 실행 후 bench/results.json 저장, 기준값과 비교
+    python -m bench.run --size 10000            # 합성 데이터 1만 건
+    python -m bench.run --only parse_date,render_newsletter
+    python -m bench.run --save-baseline         # 현재 결과를 bench/baseline.json으로 저장
+
+각 항목은 repeat번 실행해 중앙값(median_s)을 기록하고, 기준값보다
+임계치(기본 --threshold 0.3 = 30%, baseline.json의 thresholds로 항목별 지정) 이상 느려지면
+회귀로 보고 종료 코드 1을 반환한다. 기준값은 같은 머신에서 만든 것끼리 비교해야 의미가 있다.
+
+외부 네트워크/API/DB를 쓰지 않도록 캐시·상태 저장·OpenAI·DB 설정을 끈 상태로 실행한다.
+"""
+import os
+
+# app 모듈은 import 시점에 환경변수를 읽으므로 가장 먼저 설정
+for _k, _v in {"HTTP_CACHE": "0", "CRAWL_STATE": "0", "SUMMARY_CACHE": "0",
+               "OPENAI_API_KEY": "", "DATABASE_URL": "", "ARCHIVE": "0",
+               "SEARCH_INDEX": "0"}.items():
+    os.environ[_k] = _v
+
+import argparse, contextlib, json, platform, re, shutil, statistics, subprocess, sys, tempfile, threading, time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import yaml
+
+from app import archive, dates
+from app.crawler import parse_rss, parse_list_page, parse_article_detail, _parse_date
+from app.nlp import naive_summarize, classify_section
+from app.summarizer import summarize_batch
+from app.rank import sort_articles, group_by_section
+from app.render_email import render_newsletter
+from bench import corpus
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_OUT = ROOT / "bench" / "results.json"
+DEFAULT_BASELINE = ROOT / "bench" / "baseline.json"
+FIXTURE_LOOPS = 50   # 스냅샷 한 페이지는 너무 빨라서 여러 번 반복해 잼
+
+def measure(fn: Callable[[], Any], repeat: int, items: int,
+            setup: Optional[Callable[[], None]] = None) -> Dict[str, float]:
+    if setup:
+        setup()
+    fn()  # 첫 호출(지연 import, 컴파일 등)은 측정에서 제외
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    median = statistics.median(times)
+    return {
+        "items": items,
+        "repeat": repeat,
+        "best_s": round(min(times), 6),
+        "median_s": round(median, 6),
+        "per_item_us": round(median / max(1, items) * 1e6, 3),
+    }
+
+def _clear_date_caches():
+    dates._parse_cached.cache_clear()
+    dates._learned.clear()
+
+# --- 전체 실행(main) -------------------------------------------------------------
+class _SiteHandler(BaseHTTPRequestHandler):
+    pages: Dict[str, bytes] = {}
+
+    def do_GET(self):
+        body = self.pages.get(self.path)
+        if body is None:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        ctype = "application/rss+xml" if self.path.endswith(".xml") else "text/html"
+        self.send_header("Content-Type", f"{ctype}; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+@contextlib.contextmanager
+def offline_workspace(n: int, host: Optional[str] = None):
+    """로컬 HTTP 서버 + 임시 작업 디렉터리(config/templates)에서 main을 실행할 준비.
+
+    host를 주면 소스 설정이 그 주소를 가리킨다(재생 벤치처럼 서버를 쓰지 않을 때).
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SiteHandler)
+    host = host or f"http://127.0.0.1:{server.server_address[1]}"
+    pages, sources = corpus.offline_site(n, host)
+    handler = type("Handler", (_SiteHandler,), {"pages": pages})
+    server.RequestHandlerClass = handler
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    work = Path(tempfile.mkdtemp(prefix="loginews-bench-"))
+    cwd = os.getcwd()
+    try:
+        (work / "config").mkdir()
+        for name in ("sections.yaml", "ranking.yaml"):
+            shutil.copy(ROOT / "config" / name, work / "config" / name)
+        with open(work / "config" / "sources.yaml", "w", encoding="utf-8") as f:
+            yaml.safe_dump({"sources": sources}, f, allow_unicode=True)
+        (work / "templates").symlink_to(ROOT / "templates")
+        os.chdir(work)
+        yield
+    finally:
+        os.chdir(cwd)
+        server.shutdown()
+        shutil.rmtree(work, ignore_errors=True)
+
+def run_main_offline(*extra: str):
+    from app import main as main_mod
+    argv = sys.argv
+    sys.argv = ["app.main", "--preview", *extra]
+    try:
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            main_mod.main()
+    finally:
+        sys.argv = argv
+
+def archive_site(n: int) -> str:
+    """가짜 사이트 페이지를 작업 디렉터리의 보관소에 기록하고 재생할 날짜 반환."""
+    pages, _ = corpus.offline_site(n, "http://bench.invalid")
+    writer = archive.ArchiveWriter(root="archive", codec="gzip")
+    for path, body in pages.items():
+        writer.append("http://bench.invalid" + path, 200, body, "utf-8")
+    writer.close()
+    return writer._day
+
+def run_main_replay(day: str):
+    try:
+        run_main_offline("--replay", day)
+    finally:
+        archive.stop_replay()
+
+def _newsletter_links(out_dir: str) -> List[str]:
+    html = max(Path(out_dir).glob("newsletter_*.html"), key=lambda p: p.stat().st_mtime).read_text(encoding="utf-8")
+    return re.findall(r'href="([^"]+)"', html)
+
+def archive_live_runs() -> str:
+    """수집 상태와 보관소를 켜고 이틀 연속 실제 수집을 흉내 낸 뒤 둘째 날(재생할 날짜) 반환.
+
+    둘째 날은 상세 페이지 대부분을 수집 상태가 답하므로 보관소에 페이지가 거의 없다.
+    재생한 뉴스레터가 둘째 날 실제 실행과 같은 기사를 담는지 확인한다.
+    """
+    from app import crawl_state
+    saved = (archive.ARCHIVE_ENABLED, crawl_state.CRAWL_STATE_ENABLED)
+    archive.ARCHIVE_ENABLED = crawl_state.CRAWL_STATE_ENABLED = True
+    try:
+        for root in ("archive-prev", "archive"):
+            archive._writer = archive.ArchiveWriter(root=root, codec="gzip")
+            run_main_offline()
+            archive._writer.close()
+        day = archive._writer._day
+    finally:
+        archive.ARCHIVE_ENABLED, crawl_state.CRAWL_STATE_ENABLED = saved
+        archive._writer = crawl_state._state = None
+    live = _newsletter_links("out")
+    run_main_replay(day)
+    replayed = _newsletter_links("out/replay")
+    if not live or replayed != live:
+        raise RuntimeError(f"재생 결과가 실제 실행과 다름: 실제 {len(live)}건 중 {len(set(live) - set(replayed))}건 누락")
+    return day
+
+# --- 항목 정의 -------------------------------------------------------------------
+def benchmarks(size: int, main_size: int) -> Dict[str, Callable[[int], Dict[str, float]]]:
+    """이름 → (repeat → 결과). 입력 데이터는 해당 항목을 실행할 때 만든다."""
+    item_sel, title_sel, link_sel = corpus.LIST_SELECTORS
+
+    def rss_fixture(repeat):
+        body = corpus.fixture("klnews_rss.xml").encode("utf-8")
+        return measure(lambda: [parse_rss(body, "bench") for _ in range(FIXTURE_LOOPS)], repeat, FIXTURE_LOOPS)
+
+    def list_fixture(repeat):
+        html = corpus.fixture("klnews_list.html")
+        return measure(lambda: [parse_list_page(html, corpus.BASE_URL, item_sel, title_sel, link_sel)
+                                for _ in range(FIXTURE_LOOPS)], repeat, FIXTURE_LOOPS)
+
+    def list_synthetic(repeat):
+        html = corpus.synthetic_list_page(size)
+        return measure(lambda: parse_list_page(html, corpus.BASE_URL, item_sel, title_sel, link_sel), repeat, size)
+
+    def detail_fixture(repeat):
+        html = corpus.fixture("klnews_detail.html")
+        return measure(lambda: [parse_article_detail(html, corpus.DETAIL_CFG) for _ in range(FIXTURE_LOOPS)],
+                       repeat, FIXTURE_LOOPS)
+
+    def detail_synthetic(repeat):
+        pages = corpus.synthetic_detail_pages(min(size, 1000))
+        return measure(lambda: [parse_article_detail(p, corpus.DETAIL_CFG, "bench") for p in pages],
+                       repeat, len(pages), setup=_clear_date_caches)
+
+    def parse_date(repeat):
+        values = corpus.synthetic_dates(size)
+        return measure(lambda: [_parse_date(v, "bench") for v in values], repeat, size, setup=_clear_date_caches)
+
+    def summarize(repeat):
+        arts = corpus.synthetic_articles(size)
+        return measure(lambda: [naive_summarize(a["title"], a["content"]) for a in arts], repeat, size)
+
+    def summarize_day(repeat):
+        # 하루치 묶음을 한 번에(어휘/IDF 공유) — 파이프라인의 로컬 요약 경로
+        docs = [(a["title"], a["content"]) for a in corpus.synthetic_articles(size)]
+        return measure(lambda: summarize_batch(docs), repeat, size)
+
+    def classify(repeat):
+        arts = corpus.synthetic_articles(size)
+        return measure(lambda: [classify_section(a["title"], a["summary"]) for a in arts], repeat, size)
+
+    def sort_group(repeat):
+        arts = corpus.synthetic_articles(size)
+        return measure(lambda: group_by_section(sort_articles(arts)), repeat, size)
+
+    def render(repeat):
+        sections = group_by_section(sort_articles(corpus.synthetic_articles(size)))
+        today = datetime(2025, 10, 20)
+        return measure(lambda: render_newsletter("LogiNews", sections, today), repeat, size)
+
+    def main_offline(repeat):
+        with offline_workspace(main_size):
+            return measure(run_main_offline, min(repeat, 3), main_size * 2)
+
+    def main_replay(repeat):
+        # 같은 사이트를 보관소에서 재생(네트워크 없이 파싱~렌더 전체)
+        with offline_workspace(main_size, host="http://bench.invalid"):
+            day = archive_site(main_size)
+            return measure(lambda: run_main_replay(day), min(repeat, 3), main_size * 2)
+
+    def main_replay_state(repeat):
+        # 수집 상태가 답해 상세 페이지를 받지 않은 날을 재생(보관된 상세 필드 사용)
+        with offline_workspace(main_size):
+            day = archive_live_runs()
+            return measure(lambda: run_main_replay(day), min(repeat, 3), main_size * 2)
+
+    return {
+        "parse_rss.fixture": rss_fixture,
+        "parse_list_page.fixture": list_fixture,
+        "parse_list_page.synthetic": list_synthetic,
+        "parse_article_detail.fixture": detail_fixture,
+        "parse_article_detail.synthetic": detail_synthetic,
+        "parse_date": parse_date,
+        "summarize.single": summarize,
+        "summarize.batch": summarize_day,
+        "classify_section": classify,
+        "sort_and_group": sort_group,
+        "render_newsletter": render,
+        "main.offline": main_offline,
+        "main.replay": main_replay,
+        "main.replay.crawl_state": main_replay_state,
+    }
+
+# --- 기준값 비교 -----------------------------------------------------------------
+def compare(results: Dict[str, Dict], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """기준값 대비 느려진 항목 목록(표는 바로 출력)."""
+    base = baseline.get("results", {})
+    limits = baseline.get("thresholds", {})
+    regressions = []
+    print(f"{'benchmark':32} {'median_s':>10} {'baseline':>10} {'ratio':>7}")
+    for name, r in results.items():
+        b = base.get(name)
+        if not b:
+            print(f"{name:32} {r['median_s']:>10.4f} {'-':>10} {'-':>7}")
+            continue
+        ratio = r["median_s"] / b["median_s"] if b["median_s"] else float("inf")
+        limit = limits.get(name, threshold)
+        flag = ""
+        if ratio > 1 + limit:
+            flag = f"  REGRESSION(>{limit:.0%})"
+            regressions.append(name)
+        print(f"{name:32} {r['median_s']:>10.4f} {b['median_s']:>10.4f} {ratio:>7.2f}{flag}")
+    return regressions
+
+def _git_rev() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="LogiNews 성능 벤치마크")
+    parser.add_argument("--size", type=int, default=2000, help="합성 기사 수(기본 2000, 최대 1만 건 이상 가능)")
+    parser.add_argument("--main-size", type=int, default=100, help="전체 실행 벤치의 소스별 기사 수")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", help="쉼표로 구분한 항목 이름(접두사 허용)")
+    parser.add_argument("--out", default=str(DEFAULT_OUT))
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--threshold", type=float, default=0.3, help="허용 감속 비율(기본 0.3)")
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준값으로 저장")
+    args = parser.parse_args()
+
+    selected = benchmarks(args.size, args.main_size)
+    if args.only:
+        prefixes = [p.strip() for p in args.only.split(",") if p.strip()]
+        selected = {k: v for k, v in selected.items() if any(k.startswith(p) for p in prefixes)}
+
+    results = {}
+    for name, fn in selected.items():
+        print(f"[..] {name}", file=sys.stderr)
+        results[name] = fn(args.repeat)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().astimezone().isoformat(timespec="seconds"),
+            "git": _git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "size": args.size,
+            "main_size": args.main_size,
+        },
+        "results": results,
+    }
+    Path(args.out).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"[OK] 결과 저장: {args.out}")
+
+    baseline_path = Path(args.baseline)
+    if args.save_baseline:
+        old = json.loads(baseline_path.read_text(encoding="utf-8")) if baseline_path.exists() else {}
+        report["thresholds"] = old.get("thresholds", {})
+        baseline_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[OK] 기준값 저장: {baseline_path}")
+        return
+    if not baseline_path.exists():
+        print("[WARN] 기준값 파일이 없어 비교를 건너뜀(--save-baseline으로 생성)")
+        return
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    if baseline.get("meta", {}).get("size") != args.size:
+        print(f"[WARN] 기준값의 size({baseline.get('meta', {}).get('size')})와 현재 size({args.size})가 다름")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"[ERROR] 성능 회귀: {', '.join(regressions)}")
+        sys.exit(1)
+    print("[OK] 회귀 없음")
+
+if __name__ == "__main__":
+    main()